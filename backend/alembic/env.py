@@ -24,6 +24,11 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = models.Base.metadata
 
+# The app builds missing tables with Base.metadata.create_all at startup, so a
+# database may already have the full current schema before its first upgrade.
+# Migrations therefore only add the columns, indexes and tables that are
+# missing, and skip tables that do not exist yet.
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -0,0 +1,68 @@
+"""Add match and round completion counters
+
+Revision ID: 0001_completion_counters
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_completion_counters'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+COUNTERS = {
+    "matches": ["total_boards", "completed_boards"],
+    "rounds": ["total_matches", "completed_matches"],
+}
+BACKFILL = {
+    "matches": """
+        UPDATE matches SET
+            total_boards = (SELECT COUNT(*) FROM games WHERE games.match_id = matches.id),
+            completed_boards = (SELECT COUNT(*) FROM games
+                                WHERE games.match_id = matches.id AND games.is_completed = 1)
+    """,
+    "rounds": """
+        UPDATE rounds SET
+            total_matches = (SELECT COUNT(*) FROM matches WHERE matches.round_id = rounds.id),
+            completed_matches = (SELECT COUNT(*) FROM matches
+                                 WHERE matches.round_id = rounds.id AND matches.is_completed = 1)
+    """,
+}
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    for table, columns in COUNTERS.items():
+        existing = _columns(table)
+        if existing is None:
+            continue
+        missing = [c for c in columns if c not in existing]
+        if not missing:
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            for column in missing:
+                batch_op.add_column(sa.Column(column, sa.Integer(), nullable=True, server_default="0"))
+        op.execute(BACKFILL[table])
+
+
+def downgrade() -> None:
+    for table, columns in reversed(list(COUNTERS.items())):
+        present = [c for c in columns if c in (_columns(table) or ())]
+        if not present:
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            for column in reversed(present):
+                batch_op.drop_column(column)
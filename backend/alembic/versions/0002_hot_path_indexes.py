@@ -0,0 +1,39 @@
+"""Add indexes for the hot lookup paths
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_completion_counters
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_path_indexes'
+down_revision = '0001_completion_counters'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_games_match_board", "games", ["match_id", "board_number"]),
+    ("ix_matches_round_id", "matches", ["round_id"]),
+    ("ix_matches_tournament_round", "matches", ["tournament_id", "round_number"]),
+    ("ix_players_team_position", "players", ["team_id", "position"]),
+    ("ix_teams_tournament_id", "teams", ["tournament_id"]),
+    ("ix_tournaments_created_at", "tournaments", ["created_at"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector.has_table(table):
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        if inspector.has_table(table):
+            op.drop_index(name, table_name=table, if_exists=True)
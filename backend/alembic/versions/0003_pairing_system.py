@@ -0,0 +1,39 @@
+"""Add tournament pairing system
+
+Revision ID: 0003_pairing_system
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_pairing_system'
+down_revision = '0002_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    columns = _columns("tournaments")
+    if columns is None or "pairing_system" in columns:
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.add_column(sa.Column("pairing_system", sa.String(20), nullable=True, server_default="round_robin"))
+
+
+def downgrade() -> None:
+    if "pairing_system" not in (_columns("tournaments") or ()):
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.drop_column("pairing_system")
@@ -0,0 +1,40 @@
+"""Add tournament round schedule descriptor
+
+Revision ID: 0004_round_schedule
+Revises: 0003_pairing_system
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_round_schedule'
+down_revision = '0003_pairing_system'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # Existing tournaments keep a NULL schedule: all of their rounds were written up front.
+    columns = _columns("tournaments")
+    if columns is None or "schedule" in columns:
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.add_column(sa.Column("schedule", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    if "schedule" not in (_columns("tournaments") or ()):
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.drop_column("schedule")
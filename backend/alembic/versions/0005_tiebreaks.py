@@ -0,0 +1,40 @@
+"""Add configurable tournament tiebreaks
+
+Revision ID: 0005_tiebreaks
+Revises: 0004_round_schedule
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_tiebreaks'
+down_revision = '0004_round_schedule'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # NULL keeps the previous order: match points, board points, Sonneborn-Berger.
+    columns = _columns("tournaments")
+    if columns is None or "tiebreaks" in columns:
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.add_column(sa.Column("tiebreaks", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    if "tiebreaks" not in (_columns("tournaments") or ()):
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.drop_column("tiebreaks")
@@ -0,0 +1,50 @@
+"""Index games by player and backfill player stats
+
+Revision ID: 0006_player_game_history
+Revises: 0005_tiebreaks
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_player_game_history'
+down_revision = '0005_tiebreaks'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_games_white_player_id", "games", ["white_player_id"]),
+    ("ix_games_black_player_id", "games", ["black_player_id"]),
+]
+
+# Player stat columns were never written before; derive them from completed games
+_SCORE = "CASE WHEN g.white_player_id = players.id THEN g.white_score ELSE g.black_score END"
+_GAMES = "FROM games g WHERE (g.white_player_id = players.id OR g.black_player_id = players.id) AND g.is_completed = 1"
+BACKFILL = f"""
+UPDATE players SET
+    games_played = (SELECT COUNT(*) {_GAMES}),
+    wins = (SELECT COALESCE(SUM(CASE WHEN {_SCORE} = 1.0 THEN 1 ELSE 0 END), 0) {_GAMES}),
+    draws = (SELECT COALESCE(SUM(CASE WHEN {_SCORE} = 0.5 THEN 1 ELSE 0 END), 0) {_GAMES}),
+    losses = (SELECT COALESCE(SUM(CASE WHEN {_SCORE} = 0.0 THEN 1 ELSE 0 END), 0) {_GAMES}),
+    points = (SELECT COALESCE(SUM({_SCORE}), 0) {_GAMES})
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("games"):
+        return
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    if inspector.has_table("players"):
+        op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("games"):
+        return
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,73 @@
+"""Add rating engine columns and rating history
+
+Revision ID: 0007_ratings
+Revises: 0006_player_game_history
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_ratings'
+down_revision = '0006_player_game_history'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("tournaments"):
+        return
+    if "rating_system" not in _columns("tournaments"):
+        with op.batch_alter_table("tournaments") as batch_op:
+            batch_op.add_column(sa.Column("rating_system", sa.String(10), nullable=True, server_default="elo"))
+    players = _columns("players")
+    missing = [c for c in ("rating_deviation", "rating_volatility") if players is not None and c not in players]
+    if missing:
+        with op.batch_alter_table("players") as batch_op:
+            for column in missing:
+                batch_op.add_column(sa.Column(column, sa.Float(), nullable=True))
+    if not inspector.has_table("rating_history"):
+        op.create_table(
+            "rating_history",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("player_id", sa.Integer(), sa.ForeignKey("players.id"), nullable=False),
+            sa.Column("tournament_id", sa.Integer(), sa.ForeignKey("tournaments.id"), nullable=False),
+            sa.Column("round_id", sa.Integer(), sa.ForeignKey("rounds.id"), nullable=False),
+            sa.Column("round_number", sa.Integer(), nullable=False),
+            sa.Column("system", sa.String(10), nullable=False),
+            sa.Column("rating_before", sa.Float(), nullable=False),
+            sa.Column("rating_after", sa.Float(), nullable=False),
+            sa.Column("deviation", sa.Float()),
+            sa.Column("volatility", sa.Float()),
+            sa.Column("games", sa.Integer()),
+            sa.Column("score", sa.Float()),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_rating_history_id", "rating_history", ["id"])
+        op.create_index("ix_rating_history_tournament_id", "rating_history", ["tournament_id"])
+        op.create_index("ix_rating_history_player_round", "rating_history", ["player_id", "round_number"])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("rating_history"):
+        op.drop_table("rating_history")
+    present = [c for c in ("rating_volatility", "rating_deviation") if c in (_columns("players") or ())]
+    if present:
+        with op.batch_alter_table("players") as batch_op:
+            for column in present:
+                batch_op.drop_column(column)
+    if "rating_system" in (_columns("tournaments") or ()):
+        with op.batch_alter_table("tournaments") as batch_op:
+            batch_op.drop_column("rating_system")
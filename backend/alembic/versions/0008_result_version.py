@@ -0,0 +1,39 @@
+"""Add tournament result version for the read cache
+
+Revision ID: 0008_result_version
+Revises: 0007_ratings
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_result_version'
+down_revision = '0007_ratings'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str):
+    """Column names of a table, or None when the table does not exist."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    columns = _columns("tournaments")
+    if columns is None or "result_version" in columns:
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.add_column(sa.Column("result_version", sa.Integer(), nullable=True, server_default="0"))
+
+
+def downgrade() -> None:
+    if "result_version" not in (_columns("tournaments") or ()):
+        return
+    with op.batch_alter_table("tournaments") as batch_op:
+        batch_op.drop_column("result_version")
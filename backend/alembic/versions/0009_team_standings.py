@@ -0,0 +1,57 @@
+"""Rebuild team standings columns from completed matches
+
+Revision ID: 0009_team_standings
+Revises: 0008_result_version
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_team_standings'
+down_revision = '0008_result_version'
+branch_labels = None
+depends_on = None
+
+# Standings columns used to be recomputed on every GET /standings and are now
+# updated by deltas, so stale stored values must be rebuilt once before that.
+_MATCHES = ("FROM matches m WHERE (m.white_team_id = teams.id OR m.black_team_id = teams.id) "
+            "AND m.is_completed = 1 AND m.result IN ('white_win', 'black_win', 'draw')")
+_WON = "(m.white_team_id = teams.id AND m.result = 'white_win' OR m.black_team_id = teams.id AND m.result = 'black_win')"
+_OUTCOMES = f"""
+UPDATE teams SET
+    matches_played = (SELECT COUNT(*) {_MATCHES}),
+    wins = (SELECT COALESCE(SUM(CASE WHEN {_WON} THEN 1 ELSE 0 END), 0) {_MATCHES}),
+    draws = (SELECT COALESCE(SUM(CASE WHEN m.result = 'draw' THEN 1 ELSE 0 END), 0) {_MATCHES}),
+    losses = (SELECT COALESCE(SUM(CASE WHEN {_WON} OR m.result = 'draw' THEN 0 ELSE 1 END), 0) {_MATCHES}),
+    match_points = (SELECT COALESCE(SUM(CASE WHEN {_WON} THEN 2.0 WHEN m.result = 'draw' THEN 1.0 ELSE 0.0 END), 0)
+                    {_MATCHES}),
+    game_points = (SELECT COALESCE(SUM(CASE WHEN m.white_team_id = teams.id THEN m.white_score
+                                            ELSE m.black_score END), 0) {_MATCHES})
+"""
+# Needs every opponent's final match points, so it runs after the update above
+_SONNEBORN_BERGER = f"""
+UPDATE teams SET
+    sonneborn_berger = (
+        SELECT COALESCE(SUM(
+            CASE WHEN {_WON} THEN 1.0 WHEN m.result = 'draw' THEN 0.5 ELSE 0.0 END
+            * (SELECT o.match_points FROM teams o
+               WHERE o.id = CASE WHEN m.white_team_id = teams.id THEN m.black_team_id ELSE m.white_team_id END)
+        ), 0) {_MATCHES}
+    )
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not (inspector.has_table("teams") and inspector.has_table("matches")):
+        return
+    op.execute(_OUTCOMES)
+    op.execute(_SONNEBORN_BERGER)
+
+
+def downgrade() -> None:
+    # Data only: the rebuilt values are also correct for the older code
+    pass
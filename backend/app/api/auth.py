@@ -1,9 +1,13 @@
 # backend/app/api/auth.py
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from fastapi.security import HTTPAuthorizationCredentials
 from app.auth_utils import (
+    bearer_scheme,
     get_current_user,
     create_token,
+    token_cache,
+    verify_token,
 )
 
 import os
@@ -27,6 +31,13 @@ def login(login_request: LoginRequest):
     return {"token": token}
 
 @router.post("/verify")
-def verify_token(current_user: dict = Depends(get_current_user)):
+def verify(current_user: dict = Depends(get_current_user)):
     return {"user": current_user["user"], "status": "valid"}
 
+@router.post("/logout")
+def logout(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    """Revoke the token the request was made with until it expires."""
+    payload = verify_token(credentials.credentials)
+    token_cache.revoke(credentials.credentials, payload.get("exp"))
+    return {"status": "logged out"}
+
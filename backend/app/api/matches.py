@@ -1,20 +1,40 @@
 ### backend/app/api/matches.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
 from ..schemas import GameSimpleResultUpdate
-from ..models import Game, Match , Round , Player
-from ..database import get_db
+from ..models import Game, Match , Round , Player, Team
+from ..database import get_db, get_read_db, get_async_db
 from ..schemas import MatchResponse , GameSimpleResultUpdate , MatchRescheduleRequest ,SwapPlayersRequest
+from ..schemas import MatchResultsUpdate, RoundResultsUpdate, BatchResultsResponse, BoardResultOutcome
 from ..auth_utils import get_current_user
 from .. import crud
+from .. import tournament_logic
+from ..cache import bump_version
+from ..events import event_broker
 
 router = APIRouter(prefix="/api/matches", tags=["matches"])
 
 @router.get("/{round_id}", response_model=List[MatchResponse])
-def get_matches(round_id: int, db: Session = Depends(get_db)):
-    """Get all matches for a round."""
-    return crud.get_matches(db, round_id=round_id)
+async def get_matches(
+    round_id: int,
+    response: Response,
+    include_players: bool = False,
+    cursor: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the matches of a round. With ``limit`` the page is cut after that many
+    matches and ``X-Next-Cursor`` holds the value to pass as ``cursor`` next.
+    """
+    matches = await db.run_sync(crud.get_matches, round_id=round_id, include_players=include_players,
+                                after_id=cursor, limit=limit + 1 if limit else None)
+    if limit and len(matches) > limit:
+        matches = matches[:limit]
+        response.headers["X-Next-Cursor"] = str(matches[-1].id)
+    return matches
 
 @router.post("/{match_id}/board/{board_number}/result")
 def submit_board_result(
@@ -26,56 +46,152 @@ def submit_board_result(
 ):
     game = (
         db.query(Game)
+        .options(joinedload(Game.match))
         .filter(Game.match_id == match_id, Game.board_number == board_number)
         .first()
     )
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    # 🧮 Convert result string to scores
-    if update.result == "white_win":
-        game.white_score = 1.0
-        game.black_score = 0.0
-    elif update.result == "black_win":
-        game.white_score = 0.0
-        game.black_score = 1.0
-    else:  # draw
-        game.white_score = 0.5
-        game.black_score = 0.5
-    game.result = update.result
-    game.is_completed = True
+    tournament_id = game.match.tournament_id
+    was_completed = game.match.is_completed
+    changed = tournament_logic.record_board_results(db, game.match, [(game, update.result)])
+    events = _result_events(db, [(game.match, [game], was_completed)], {t.id: t for t in changed})
+    bump_version(db, tournament_id)
     db.commit()
 
-    # 🎯 Check match status
-    match = db.query(Match).filter(Match.id == match_id).first()
-    if not match:
-        raise HTTPException(status_code=404, detail="Match not found")
-    match.white_score = sum(g.white_score for g in match.games)
-    match.black_score = sum(g.black_score for g in match.games)
-    if all(g.is_completed for g in match.games):
-        if match.white_score > match.black_score:
-            match.result = "white_win"
-        elif match.black_score > match.white_score:
-            match.result = "black_win"
+    event_broker.publish(tournament_id, events)
+    return {"message": f"Game result '{update.result}' submitted successfully"}
+
+def _result_events(
+    db: Session,
+    applied: List[Tuple[Match, List[Game], bool]],
+    changed: Dict[int, Team],
+) -> List[Tuple[str, dict]]:
+    """
+    Live-update deltas for results applied in this transaction: one event per
+    board and per match, completed rounds, and the changed standings rows.
+    Built before commit so nothing has to be reloaded.
+    """
+    events: List[Tuple[str, dict]] = []
+    for match, games, was_completed in applied:
+        events += [("board", {
+            "match_id": match.id, "game_id": g.id, "board_number": g.board_number,
+            "result": g.result, "white_score": g.white_score, "black_score": g.black_score,
+        }) for g in games]
+        events.append(("match", {
+            "match_id": match.id, "round_id": match.round_id, "result": match.result,
+            "white_score": match.white_score, "black_score": match.black_score,
+            "completed_boards": match.completed_boards, "total_boards": match.total_boards,
+            "is_completed": match.is_completed,
+        }))
+        if match.is_completed and not was_completed:
+            rnd = db.get(Round, match.round_id)
+            if rnd.is_completed:
+                events.append(("round", {"round_id": rnd.id, "round_number": rnd.round_number, "is_completed": True}))
+    if changed:
+        events.append(("standings", {
+            "rows": [tournament_logic.standings_entry(t).model_dump() for t in changed.values()]
+        }))
+    return events
+
+def _submit_results(db: Session, entries: List[Tuple[int, int, str]]) -> BatchResultsResponse:
+    """
+    Validate every (match_id, board_number, result) entry, then apply them all
+    in one transaction with match/round bookkeeping run once per match.
+    """
+    seen = set()
+    for match_id, board_number, _ in entries:
+        if (match_id, board_number) in seen:
+            raise HTTPException(status_code=400, detail=f"Board {board_number} of match {match_id} submitted twice")
+        seen.add((match_id, board_number))
+
+    match_ids = {match_id for match_id, _, _ in entries}
+    games = (
+        db.query(Game)
+        .options(joinedload(Game.match))
+        .filter(Game.match_id.in_(match_ids))
+        .all()
+    )
+    by_board = {(g.match_id, g.board_number): g for g in games}
+    missing = [
+        {"match_id": match_id, "board_number": board_number, "error": "Game not found"}
+        for match_id, board_number, _ in entries if (match_id, board_number) not in by_board
+    ]
+    if missing:
+        raise HTTPException(status_code=404, detail=missing)
+
+    outcomes: List[BoardResultOutcome] = []
+    per_match: Dict[int, List[Tuple[Game, str]]] = {}
+    for match_id, board_number, result in entries:
+        game = by_board[(match_id, board_number)]
+        if game.is_completed and game.result == result:
+            status = "unchanged"
         else:
-            match.result = "draw"
+            status = "updated" if game.is_completed else "recorded"
+            per_match.setdefault(match_id, []).append((game, result))
+        outcomes.append(BoardResultOutcome(
+            match_id=match_id, board_number=board_number, game_id=game.id, result=result, status=status
+        ))
 
-        match.is_completed = True
+    matches = {g.match_id: g.match for g in games}
+    tournament_ids = {m.tournament_id for m in matches.values()}
+    # Everything the standings bookkeeping of a completed match reads (its round,
+    # its teams, the opponents' other matches), loaded once for the whole batch.
+    # Holding the rows keeps them in the session for db.get to find.
+    by_team, loaded = {}, []
+    if per_match:
+        by_team = tournament_logic.matches_by_team(db, tournament_ids)
+        loaded += db.query(Team).filter(Team.tournament_id.in_(tournament_ids)).all()
+        loaded += db.query(Round).filter(Round.id.in_({m.round_id for m in matches.values()})).all()
+    applied: Dict[int, List[Tuple[Match, List[Game], bool]]] = {}
+    changed: Dict[int, Dict[int, Team]] = {}
+    player_deltas: Dict[int, Dict[str, float]] = {}
+    for match_id, results in per_match.items():
+        match = matches[match_id]
+        was_completed = match.is_completed
+        teams = tournament_logic.record_board_results(db, match, results, player_deltas, by_team)
+        applied.setdefault(match.tournament_id, []).append((match, [g for g, _ in results], was_completed))
+        changed.setdefault(match.tournament_id, {}).update((t.id, t) for t in teams)
+    tournament_logic.apply_player_stats(db, player_deltas)
+    completed = sorted(m.id for m in matches.values() if m.id in per_match and m.is_completed)
+    events = {tid: _result_events(db, applied[tid], changed.get(tid, {})) for tid in applied}
+    for tournament_id in tournament_ids:
+        bump_version(db, tournament_id)
     db.commit()
-    round_matches = db.query(Match).filter(Match.round_id == match.round_id).all()
-    if all(m.is_completed for m in round_matches):
-        match.round.is_completed = True
-        db.commit()
-        completed = db.query(Round).filter(
-            Round.tournament_id == match.tournament_id,
-            Round.is_completed == True
-        ).count()
-        tournament = crud.get_tournament(db, match.tournament_id)
-        if tournament:
-            tournament.current_round = completed + 1
-            db.commit()
 
-    return {"message": f"Game result '{update.result}' submitted successfully"}
+    for tournament_id, tournament_events in events.items():
+        event_broker.publish(tournament_id, tournament_events)
+    return BatchResultsResponse(outcomes=outcomes, completed_match_ids=completed)
+
+@router.post("/{match_id}/results", response_model=BatchResultsResponse)
+def submit_match_results(
+    match_id: int,
+    payload: MatchResultsUpdate,
+    db: Session = Depends(get_db),
+    _: dict = Depends(get_current_user)
+):
+    """Submit several board results of one match at once."""
+    entries = [(match_id, r.board_number, r.result) for r in payload.results]
+    return _submit_results(db, entries)
+
+@router.post("/rounds/{round_id}/results", response_model=BatchResultsResponse)
+def submit_round_results(
+    round_id: int,
+    payload: RoundResultsUpdate,
+    db: Session = Depends(get_db),
+    _: dict = Depends(get_current_user)
+):
+    """Submit board results for any matches of one round at once."""
+    match_ids = {r.match_id for r in payload.results}
+    in_round = {
+        m.id for m in db.query(Match.id).filter(Match.round_id == round_id, Match.id.in_(match_ids))
+    }
+    foreign = sorted(match_ids - in_round)
+    if foreign:
+        raise HTTPException(status_code=400, detail=f"Matches {foreign} are not part of round {round_id}")
+    entries = [(r.match_id, r.board_number, r.result) for r in payload.results]
+    return _submit_results(db, entries)
 
 @router.post("/rounds/{round_number}/reschedule")
 def reschedule_round(
@@ -98,7 +214,7 @@ def reschedule_round(
 @router.get("/{match_id}/available-swaps")
 def get_available_swaps(
     match_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: dict = Depends(get_current_user)
 ):
     match = db.query(Match).filter(Match.id == match_id).first()
@@ -158,6 +274,12 @@ def swap_players(
             raise HTTPException(status_code=400, detail="Invalid black player for this match")
         game.black_player_id = player.id
 
-
+    tournament_id = match.tournament_id
+    swap = {
+        "match_id": match.id, "game_id": game.id, "board_number": game.board_number,
+        "white_player_id": game.white_player_id, "black_player_id": game.black_player_id,
+    }
+    bump_version(db, tournament_id)
     db.commit()
+    event_broker.publish(tournament_id, [("swap", swap)])
     return {"message": "Players swapped successfully"}
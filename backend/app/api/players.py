@@ -1,24 +1,29 @@
 ### backend/app/api/players.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
 
-from ..database import get_db
-from ..schemas import PlayerResponse, PlayerCreate, PlayerUpdate, BestPlayersResponse
+from ..database import get_db, get_read_db, get_async_db
+from ..schemas import PlayerResponse, PlayerCreate, PlayerUpdate, BestPlayersResponse, PlayerGamesResponse
+from ..schemas import RatingHistoryEntry, RosterImportResponse
 from ..auth_utils import get_current_user
 from .. import crud
+from ..cache import bump_version
+from ..roster_import import RosterImport, RowParser
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
 @router.get("/", response_model=List[PlayerResponse])
-def list_players(team_id: Optional[int] = None, tournament_id: Optional[int] = None,
-                 db: Session = Depends(get_db)):
+async def list_players(team_id: Optional[int] = None, tournament_id: Optional[int] = None,
+                       db: AsyncSession = Depends(get_async_db)):
     """Get all players, optionally filtered."""
-    return crud.get_players(db, team_id=team_id, tournament_id=tournament_id)
+    return await db.run_sync(crud.get_players, team_id=team_id, tournament_id=tournament_id)
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-def get_player(player_id: int, db: Session = Depends(get_db)):
-    player = crud.get_player(db, player_id)
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    player = await db.run_sync(crud.get_player, player_id)
     if not player:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
     return player
@@ -35,8 +40,59 @@ def create_player(player: PlayerCreate, db: Session = Depends(get_db), _: dict =
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Player name already exists in this team")
     if not player.position:
         player.position = len(team.players) + 1
+    bump_version(db, team.tournament_id)
     return crud.create_player(db, player)
 
+@router.post("/import", response_model=RosterImportResponse)
+async def import_roster(
+    request: Request,
+    tournament_id: int,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+    _: dict = Depends(get_current_user)
+):
+    """
+    Add teams and players from a CSV or NDJSON file sent as the request body
+    (admin only). Valid rows are inserted together; the others are reported
+    by line. ``dry_run`` only validates.
+
+    The body is read and parsed before the database is touched: the write
+    session takes the write lock on its first query and holds it until the
+    commit, so the roster is loaded, checked and saved in one short step.
+    """
+    content_type = request.headers.get("content-type", "")
+    parser = RowParser(format or ("ndjson" if "json" in content_type else "csv" if "csv" in content_type else None))
+    rows = []
+    try:
+        async for chunk in request.stream():
+            rows.extend(parser.feed(chunk))
+        rows.extend(parser.feed(b"", final=True))
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+
+    def run():
+        session = read_db if dry_run else db
+        tour = crud.get_tournament(session, tournament_id)
+        if not tour:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+        if tour.status == "completed":
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Cannot add players to completed tournament")
+        roster = RosterImport(session, tournament_id)
+        for line, row in rows:
+            roster.add(line, row)
+        if dry_run:
+            counts = {"teams_created": sum(t is None for t in roster.teams.values()), "players_created": len(roster.players)}
+        else:
+            counts = roster.save(db)
+            if roster.players:
+                bump_version(db, tournament_id)
+            db.commit()
+        return RosterImportResponse(**counts, errors=roster.errors)
+
+    return await run_in_threadpool(run)
+
 @router.put("/{player_id}", response_model=PlayerResponse)
 def update_player(player_id: int, upd: PlayerUpdate, db: Session = Depends(get_db), _: dict = Depends(get_current_user)):
     """Update player details (admin only)."""
@@ -52,6 +108,7 @@ def update_player(player_id: int, upd: PlayerUpdate, db: Session = Depends(get_d
         size = len(p.team.players)
         if not (1 <= upd.position <= size):
             raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Position must be between 1 and {size}")
+    bump_version(db, p.team.tournament_id)
     return crud.update_player(db, player_id, upd)
 
 @router.delete("/{player_id}")
@@ -64,40 +121,62 @@ def delete_player(player_id: int, db: Session = Depends(get_db), _: dict = Depen
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Cannot delete player from completed tournament")
     if len(p.team.players) <= 4:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Team must have at least 4 players")
-    team_id, old_pos = p.team_id, p.position
+    team_id, old_pos, tournament_id = p.team_id, p.position, p.team.tournament_id
     success = crud.delete_player(db, player_id)
     if not success:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
+    bump_version(db, tournament_id)
     crud.adjust_player_positions_after_deletion(db, team_id, old_pos)
     return {"message": "Player deleted successfully"}
 
-@router.get("/{player_id}/games")
-def get_player_games(player_id: int, db: Session = Depends(get_db)):
-    """Get all games played by a player."""
-    p = crud.get_player(db, player_id)
-    if not p:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
-    return {
-        "player_id": player_id,
-        "player_name": p.name,
-        "team_name": p.team.name,
-        "games": crud.get_player_games(db, player_id)
-    }
+@router.get("/{player_id}/games", response_model=PlayerGamesResponse)
+async def get_player_games(
+    player_id: int,
+    response: Response,
+    cursor: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the games played by a player, oldest first. With ``limit`` the page is
+    cut after that many games and ``X-Next-Cursor`` holds the next ``cursor``.
+    """
+    def load(session: Session):
+        p = crud.get_player(session, player_id)
+        if not p:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
+        games = crud.get_player_games(session, player_id, after_id=cursor, limit=limit + 1 if limit else None)
+        if limit and len(games) > limit:
+            games = games[:limit]
+            response.headers["X-Next-Cursor"] = str(games[-1].game_id)
+        return PlayerGamesResponse(player_id=player_id, player_name=p.name, team_name=p.team.name, games=games)
+    return await db.run_sync(load)
+
+@router.get("/{player_id}/rating-history", response_model=List[RatingHistoryEntry])
+async def get_rating_history(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Rating before and after every rated round, oldest first."""
+    def load(session: Session):
+        if not crud.get_player(session, player_id):
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
+        return crud.get_rating_history(session, player_id)
+    return await db.run_sync(load)
 
 @router.get("/{player_id}/statistics")
-def get_player_statistics(player_id: int, db: Session = Depends(get_db)):
+async def get_player_statistics(player_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get detailed statistics for a player."""
-    p = crud.get_player(db, player_id)
+    p = await db.run_sync(crud.get_player, player_id)
     if not p:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Player not found")
+    team = await db.run_sync(crud.get_team, p.team_id)
     total = p.wins + p.draws + p.losses
     win_pct = ((p.wins + 0.5 * p.draws) / total * 100) if total else 0
     perf = p.rating + ((p.wins + 0.5 * p.draws) / total - 0.5) * 400 if total else p.rating
     return {
         "player_id": player_id,
         "name": p.name,
-        "team_name": p.team.name,
+        "team_name": team.name,
         "rating": p.rating,
+        "rating_deviation": p.rating_deviation,
         "position": p.position,
         "games_played": total,
         "wins": p.wins,
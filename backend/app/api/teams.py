@@ -1,23 +1,25 @@
 ### backend/app/api/teams.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..auth_utils import get_current_user
 from ..schemas import TeamResponse, TeamCreate, TeamUpdate
 from .. import crud
+from ..cache import bump_version
 
 router = APIRouter(prefix="/api/teams", tags=["teams"])
 
 @router.get("/", response_model=List[TeamResponse])
-def list_teams(tournament_id: Optional[int] = None, db: Session = Depends(get_db)):
+async def list_teams(tournament_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
     """Get all teams, optionally filtered by tournament."""
-    return crud.get_teams(db, tournament_id)
+    return await db.run_sync(crud.get_teams, tournament_id)
 
 @router.get("/{team_id}", response_model=TeamResponse)
-def get_team(team_id: int, db: Session = Depends(get_db)):
-    team = crud.get_team(db, team_id)
+async def get_team(team_id: int, db: AsyncSession = Depends(get_async_db)):
+    team = await db.run_sync(crud.get_team, team_id)
     if not team:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Team not found")
     return team
@@ -25,16 +27,17 @@ def get_team(team_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=TeamResponse)
 def create_team(team: TeamCreate, db: Session = Depends(get_db), admin_user: dict = Depends(get_current_user)):
     """Create a new team (admin only)."""
-    new_team = crud.create_team(db, team)
-    return new_team
+    bump_version(db, team.tournament_id)
+    return crud.create_team(db, team)
 
 @router.put("/{team_id}", response_model=TeamResponse)
 def update_team(team_id: int, team_upd: TeamUpdate, db: Session = Depends(get_db),
                 admin_user: dict = Depends(get_current_user)):
-    updated = crud.update_team(db, team_id, team_upd)
-    if not updated:
+    team = crud.get_team(db, team_id)
+    if not team:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Team not found")
-    return updated
+    bump_version(db, team.tournament_id)
+    return crud.update_team(db, team_id, team_upd)
 
 # @router.delete("/{team_id}")
 # def delete_team(team_id: int, db: Session = Depends(get_db), admin_user: dict = Depends(get_current_user)):
@@ -1,31 +1,36 @@
 ### backend/app/api/tournaments.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..auth_utils import get_current_user
 from ..schemas import TournamentResponse, TournamentCreate, TournamentUpdate, StandingsResponse, BestPlayersResponse
 from .. import crud
-from .. import tournament_logic 
+from .. import ratings, tournament_logic 
+from ..models import Round
+from ..cache import bump_version, cached_response
+from ..events import event_stream
+from ..transfer import TransferError, export_response, import_stream
 router = APIRouter(prefix="/api/tournaments", tags=["tournaments"])
 
 @router.get("/current", response_model=Optional[TournamentResponse])
-def get_current_tournament(db: Session = Depends(get_db)):
+async def get_current_tournament(db: AsyncSession = Depends(get_async_db)):
     """Get the current (latest) tournament."""
-    tour = crud.get_current_tournament(db)
+    tour = await db.run_sync(crud.get_current_tournament)
     return tour
 
 @router.get("/{tournament_id}", response_model=TournamentResponse)
-def get_tournament(tournament_id: int, db: Session = Depends(get_db)):
-    tour = crud.get_tournament(db, tournament_id)
+async def get_tournament(tournament_id: int, db: AsyncSession = Depends(get_async_db)):
+    tour = await db.run_sync(crud.get_tournament, tournament_id)
     if not tour:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
     return tour
 
 @router.get("/", response_model=List[TournamentResponse])
-def list_tournaments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_tournaments(db, skip=skip, limit=limit)
+async def list_tournaments(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_tournaments, skip=skip, limit=limit)
 
 @router.post("/", response_model=TournamentResponse)
 def create_tournament(tournament: TournamentCreate, db: Session = Depends(get_db),
@@ -37,10 +42,11 @@ def create_tournament(tournament: TournamentCreate, db: Session = Depends(get_db
 @router.put("/{tournament_id}", response_model=TournamentResponse)
 def update_tournament(tournament_id: int, tour_upd: TournamentUpdate, db: Session = Depends(get_db),
                       _: dict = Depends(get_current_user)):
-    updated = crud.update_tournament(db, tournament_id, tour_upd)
-    if not updated:
+    tour = crud.get_tournament(db, tournament_id)
+    if not tour:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
-    return updated
+    bump_version(db, tour.id)
+    return crud.update_tournament(db, tour.id, tour_upd)
 
 @router.delete("/{tournament_id}")
 def delete_tournament(tournament_id: int, db: Session = Depends(get_db),
@@ -51,21 +57,129 @@ def delete_tournament(tournament_id: int, db: Session = Depends(get_db),
     return {"message": "Tournament deleted successfully"}
 
 @router.get("/{tournament_id}/standings", response_model=StandingsResponse)
-def get_standings(tournament_id: int, db: Session = Depends(get_db)):
+async def get_standings(tournament_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    def load(session: Session):
+        tour = crud.get_tournament(session, tournament_id)
+        if not tour:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+        return StandingsResponse(standings=tournament_logic.get_standings(session, tournament_id))
+
+    async def build():
+        return await db.run_sync(load)
+    return await cached_response(request, db, tournament_id, "standings", build)
+
+@router.get("/{tournament_id}/events")
+async def tournament_events(tournament_id: int, request: Request,
+                            last_event_id: Optional[str] = Query(None),
+                            last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+                            db: AsyncSession = Depends(get_async_db)):
+    """
+    Server-sent events with live board results, match completions, standings
+    rows and player swaps. Browsers resume with the Last-Event-ID header on
+    reconnect; ``last_event_id`` does the same for the first connection.
+    """
+    tour = await db.run_sync(crud.get_tournament, tournament_id)
+    if not tour:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+    return event_stream(request, tournament_id, last_event_id_header or last_event_id)
+
+@router.get("/{tournament_id}/export")
+async def export_tournament(tournament_id: int,
+                            format: Literal["ndjson", "columnar"] = Query("ndjson"),
+                            gzip: bool = False,
+                            db: AsyncSession = Depends(get_async_db),
+                            _: dict = Depends(get_current_user)):
+    """
+    Stream the whole tournament as JSON lines (admin only): one row per line,
+    or one batch of columns per line with format=columnar; gzip=true compresses it.
+    """
+    tour = await db.run_sync(crud.get_tournament, tournament_id)
+    if not tour:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+    return export_response(tournament_id, format, gzip)
+
+@router.post("/import", response_model=TournamentResponse)
+async def import_tournament(request: Request, db: AsyncSession = Depends(get_async_db),
+                            _: dict = Depends(get_current_user)):
+    """
+    Create a tournament from an export sent as the raw request body, plain or
+    gzip-compressed (admin only).
+    """
+    try:
+        tournament_id, _counts = await import_stream(request.stream())
+    except TransferError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    return await db.run_sync(crud.get_tournament, tournament_id)
+
+@router.post("/{tournament_id}/standings/rebuild", response_model=StandingsResponse)
+def rebuild_standings(tournament_id: int, db: Session = Depends(get_db),
+                      _: dict = Depends(get_current_user)):
+    """Recompute standings from all completed matches (admin only, for repair)."""
     tour = crud.get_tournament(db, tournament_id)
     if not tour:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+    bump_version(db, tournament_id)
     standings = tournament_logic.calculate_standings(db, tournament_id)
     return StandingsResponse(standings=standings)
 
-@router.get("/{tournament_id}/best-players", response_model=BestPlayersResponse)
-def get_best_players(tournament_id: int, db: Session = Depends(get_db)):
+@router.post("/{tournament_id}/ratings/rebuild")
+def rebuild_ratings(tournament_id: int, db: Session = Depends(get_db),
+                    _: dict = Depends(get_current_user)):
+    """Re-rate all completed rounds, e.g. after correcting results (admin only)."""
+    tour = crud.get_tournament(db, tournament_id)
+    if not tour:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+    rounds = ratings.rebuild_ratings(db, tournament_id)
+    bump_version(db, tournament_id)
+    db.commit()
+    return {"message": f"Ratings rebuilt from {rounds} rounds", "rounds": rounds}
+
+@router.post("/{tournament_id}/rounds/open")
+def open_next_round(tournament_id: int, db: Session = Depends(get_db),
+                    _: dict = Depends(get_current_user)):
+    """
+    Materialize the next round ahead of time (admin only). Rounds otherwise
+    open automatically when the previous one is completed.
+    """
     tour = crud.get_tournament(db, tournament_id)
     if not tour:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
-    stats = crud.get_best_players(db, tournament_id)
-    return BestPlayersResponse(
-        tournament_id=tournament_id,
-        tournament_name=tour.name,
-        players=stats
+    last = (
+        db.query(Round)
+        .filter(Round.tournament_id == tournament_id)
+        .order_by(Round.round_number.desc())
+        .first()
     )
+    if tour.pairing_system == "swiss" and last and not last.is_completed:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Swiss rounds can only be paired once the previous round is completed")
+
+    round_id = tournament_logic.open_round(db, tour)
+    if round_id is None:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "All rounds are already open")
+    round_number = (last.round_number if last else 0) + 1
+    bump_version(db, tournament_id)
+    db.commit()
+    return {"message": f"Round {round_number} opened", "round_id": round_id, "round_number": round_number}
+
+@router.get("/{tournament_id}/best-players", response_model=BestPlayersResponse)
+async def get_best_players(tournament_id: int, request: Request,
+                           limit: Optional[int] = Query(None, ge=1),
+                           team_id: Optional[int] = None,
+                           min_games: int = Query(1, ge=1),
+                           db: AsyncSession = Depends(get_async_db)):
+    def load(session: Session):
+        tour = crud.get_tournament(session, tournament_id)
+        if not tour:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Tournament not found")
+        stats = crud.get_best_players(session, tournament_id, limit=limit, team_id=team_id, min_games=min_games)
+        return BestPlayersResponse(
+            tournament_id=tournament_id,
+            tournament_name=tour.name,
+            players=stats
+        )
+
+    async def build():
+        return await db.run_sync(load)
+    key = f"best-players?limit={limit}&team_id={team_id}&min_games={min_games}"
+    return await cached_response(request, db, tournament_id, key, build)
+
@@ -4,9 +4,12 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import jwt
 import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jwt import ExpiredSignatureError, InvalidTokenError
 
 bearer_scheme = HTTPBearer(auto_error=True)
 
@@ -14,6 +17,7 @@ bearer_scheme = HTTPBearer(auto_error=True)
 JWT_SECRET = os.getenv("JWT_SECRET", "supersecretkey")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_MINUTES = 60
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))  # 0 verifies every request
 
 # Basic Auth
 security = HTTPBasic()
@@ -43,16 +47,92 @@ def decode_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+class TokenCache:
+    """
+    Verified tokens, so repeated admin calls with the same token skip the
+    signature check. A bounded LRU; entries are dropped at the token's exp,
+    and tokens without one are never cached. Revoked tokens are remembered
+    until they would have expired anyway.
+
+    Like the result cache this lives in one process: with several workers,
+    a logout only revokes the token in the worker that served it.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}   # token -> exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None or payload.get("exp", 0) <= time.time():
+                if payload is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if not self.max_entries or "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def revoke(self, token: str, exp: Optional[float]) -> None:
+        """Revoke until ``exp``; tokens without one for as long as a new token would last."""
+        with self._lock:
+            self._entries.pop(token, None)
+            now = time.time()
+            self._revoked = {t: e for t, e in self._revoked.items() if e > now}
+            self._revoked[token] = exp if exp is not None else now + JWT_EXPIRY_MINUTES * 60
+
+    def is_revoked(self, token: str) -> bool:
+        return token in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "revoked": len(self._revoked),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+def verify_token(token: str) -> dict:
+    """
+    Payload of a valid token that has not been revoked. The signature is
+    checked once per token and the result cached until exp.
+    """
+    if token_cache.is_revoked(token):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        token_cache.put(token, payload)
+    return payload
+
 # JWT Dependency
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
 ):
-    print(f"credentials received: {credentials}")  
-    token = credentials.credentials
-    try:
-        payload = decode_token(token)
-        return {"user": payload["sub"]}
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return {"user": verify_token(credentials.credentials)["sub"]}
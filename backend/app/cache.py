@@ -0,0 +1,118 @@
+"""
+In-process cache for the tournament read endpoints (standings, best players).
+
+Entries are keyed by tournament and tagged with that tournament's result
+version, the ``tournaments.result_version`` column. Every write path that
+can change what those endpoints return calls ``bump_version`` before it
+commits, so the version changes in the same transaction as the data. Reads
+look the version up first: every worker sees a change as soon as it is
+committed, stale entries are never served, and unchanged polls can be
+answered with 304 from the ETag alone.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import Tournament
+
+
+def bump_version(db: Session, tournament_id: int) -> None:
+    """Invalidate everything cached for a tournament once the caller commits."""
+    db.execute(
+        update(Tournament)
+        .where(Tournament.id == tournament_id)
+        .values(result_version=Tournament.result_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def etag(self, tournament_id: int, key: str, version: Hashable) -> str:
+        digest = hashlib.blake2s(f"{key}|{version}".encode(), digest_size=8).hexdigest()
+        return f'"{tournament_id}-{digest}"'
+
+    def get(self, tournament_id: int, key: str, version: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get((tournament_id, key))
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((tournament_id, key))
+            self.hits += 1
+            return entry[1]
+
+    def put(self, tournament_id: int, key: str, version: Hashable, body: bytes) -> None:
+        with self._lock:
+            self._entries[(tournament_id, key)] = (version, body)
+            self._entries.move_to_end((tournament_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "not_modified": self.not_modified,
+        }
+
+
+result_cache = ResultCache(max_entries=int(os.getenv("RESULT_CACHE_SIZE", "256")))
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def cached_response(request: Request, db: AsyncSession, tournament_id: int, key: str,
+                          build: Callable[[], Awaitable[BaseModel]]) -> Response:
+    """
+    Serve ``await build()`` as JSON through the cache, answering 304 when the
+    client already holds the current version.
+    """
+    row = (await db.execute(
+        select(Tournament.result_version, Tournament.created_at).where(Tournament.id == tournament_id)
+    )).first()
+    if row is None:
+        return await build()  # raises the 404
+    # created_at tells a tournament from a later one that re-uses its id
+    version = (row.created_at, row.result_version)
+    etag = result_cache.etag(tournament_id, key, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        result_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    body = result_cache.get(tournament_id, key, version)
+    if body is None:
+        body = (await build()).model_dump_json().encode()
+        result_cache.put(tournament_id, key, version, body)
+    return Response(content=body, media_type="application/json", headers=headers)
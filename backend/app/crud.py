@@ -1,6 +1,6 @@
 ### backend/app/crud.py
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, aliased, raiseload, selectinload
+from sqlalchemy import and_, case, delete, func, or_, select, update
 from typing import List, Optional
 from fastapi import HTTPException
 from . import models, schemas
@@ -27,7 +27,7 @@ def create_tournament(db: Session, tournament: schemas.TournamentCreate) -> mode
     return create_tournament_structure(db, tournament)
 
 def update_tournament(db: Session, tournament_id: int, tournament_update: schemas.TournamentUpdate) -> Optional[models.Tournament]:
-    tour = get_tournament(db, tournament_id)
+    tour = db.get(models.Tournament, tournament_id)
     if not tour:
         return None
     data = tournament_update.dict(exclude_unset=True)
@@ -38,10 +38,25 @@ def update_tournament(db: Session, tournament_id: int, tournament_update: schema
     return tour
 
 def delete_tournament(db: Session, tournament_id: int) -> bool:
+    """
+    Delete a tournament and everything in it with one bulk DELETE per table,
+    children first, instead of loading each team and match to cascade.
+    """
     tour = get_tournament(db, tournament_id)
     if not tour:
         return False
-    db.delete(tour)
+    Team, Match = models.Team, models.Match
+    teams = select(Team.id).where(Team.tournament_id == tournament_id).scalar_subquery()
+    matches = select(Match.id).where(Match.tournament_id == tournament_id).scalar_subquery()
+    db.execute(delete(models.RatingHistory).where(models.RatingHistory.tournament_id == tournament_id))
+    db.execute(delete(models.Game).where(models.Game.match_id.in_(matches)))
+    db.execute(delete(Match).where(Match.tournament_id == tournament_id))
+    db.execute(delete(models.Round).where(models.Round.tournament_id == tournament_id))
+    # Captains point back at players, so unlink them before the players go
+    db.execute(update(Team).where(Team.tournament_id == tournament_id).values(captain_id=None))
+    db.execute(delete(models.Player).where(models.Player.team_id.in_(teams)))
+    db.execute(delete(Team).where(Team.tournament_id == tournament_id))
+    db.execute(delete(models.Tournament).where(models.Tournament.id == tournament_id))
     db.commit()
     return True
 
@@ -63,7 +78,7 @@ def create_team(db: Session, team: schemas.TeamCreate) -> models.Team:
     return db_team
 
 def update_team(db: Session, team_id: int, team_update: schemas.TeamUpdate) -> Optional[models.Team]:
-    team = get_team(db, team_id)
+    team = db.get(models.Team, team_id)
     if not team:
         return None
     data = team_update.dict(exclude_unset=True)
@@ -90,7 +105,7 @@ def get_players(db: Session, team_id: Optional[int] = None, tournament_id: Optio
     if team_id:
         query = query.filter(models.Player.team_id == team_id)
     if tournament_id:
-        query = query.join(models.Team).filter(models.Team.tournament_id == tournament_id)
+        query = query.join(models.Team, models.Team.id == models.Player.team_id).filter(models.Team.tournament_id == tournament_id)
     return query.all()
 
 def get_player_by_name_in_team(db: Session, name: str, team_id: int) -> Optional[models.Player]:
@@ -138,75 +153,133 @@ def adjust_player_positions_after_deletion(db: Session, team_id: int, deleted_po
 def get_match(db: Session, match_id: int) -> Optional[models.Match]:
     return db.query(models.Match).filter(models.Match.id == match_id).first()
 
-def get_matches(db: Session, round_id: Optional[int] = None, tournament_id: Optional[int] = None) -> List[models.Match]:
-    query = db.query(models.Match)
+def get_matches(db: Session, round_id: Optional[int] = None, tournament_id: Optional[int] = None,
+                include_players: bool = False, after_id: Optional[int] = None,
+                limit: Optional[int] = None) -> List[models.Match]:
+    """
+    Matches ordered by id with their games loaded in one extra SELECT
+    (players too when ``include_players``). Any other relationship access
+    raises instead of lazy loading. ``after_id``/``limit`` page by match id.
+    """
+    games = selectinload(models.Match.games)
+    options = [games, raiseload("*")]
+    if include_players:
+        options += [
+            games.joinedload(models.Game.white_player).raiseload("*"),
+            games.joinedload(models.Game.black_player).raiseload("*"),
+        ]
+    options.append(games.raiseload("*"))
+
+    query = db.query(models.Match).options(*options).order_by(models.Match.id)
     if round_id:
         query = query.filter(models.Match.round_id == round_id)
     if tournament_id:
         query = query.filter(models.Match.tournament_id == tournament_id)
+    if after_id:
+        query = query.filter(models.Match.id > after_id)
+    if limit:
+        query = query.limit(limit)
     return query.all()
 
-def update_player_stats(db: Session, player_id: int, score: float):
-    player = get_player(db, player_id)
-    if not player:
-        return
-    player.games_played += 1
-    player.points += score
-    if score == 1.0:
-        player.wins += 1
-    elif score == 0.5:
-        player.draws += 1
-    else:
-        player.losses += 1
-
-def get_best_players(db: Session, tournament_id: int) -> list[schemas.BestPlayerEntry]:
-    tour = db.query(models.Tournament).filter(models.Tournament.id == tournament_id).first()
-    if not tour:
-        return []
-
-    # 🟢 Initialize schema objects directly
-    player_map: dict[int, schemas.BestPlayerEntry] = {}
-
-    for team in tour.teams:
-        for player in team.players:
-            player_map[player.id] = schemas.BestPlayerEntry(
-                player_id=player.id,
-                player_name=player.name,
-                games_played=0,
-                wins=0,
-                draws=0,
-                losses=0,
-                points=0.0
-            )
-
-    # 🟡 Update stats directly on schema objects
-    for match in tour.matches:
-        for game in match.games:
-            if not game.is_completed:
-                continue
-
-            white = player_map[game.white_player_id]
-            black = player_map[game.black_player_id]
-
-            white.games_played += 1
-            black.games_played += 1
-
-            white.points += game.white_score
-            black.points += game.black_score
-
-            def update_result(score: float, player: schemas.BestPlayerEntry):
-                if score == 1.0:
-                    player.wins += 1
-                elif score == 0.5:
-                    player.draws += 1
-                else:
-                    player.losses += 1
-
-            update_result(game.white_score, white)
-            update_result(game.black_score, black)
-
-    # 🔵 Return only players who actually played
-    return sorted(
-        [p for p in player_map.values() ],
-        key=lambda p: (-p.points, -p.wins)
-    )
\ No newline at end of file
+def player_games_query(db: Session, player_id: int, after_id: Optional[int] = None):
+    """
+    A player's games in id order, one row per game with the match context and
+    the opponent. Each colour is an index range scan on its player column.
+    """
+    Game, Match, Player = models.Game, models.Match, models.Player
+    Opponent = aliased(Player)
+    is_white = Game.white_player_id == player_id
+    query = (
+        db.query(
+            Game.id.label("game_id"), Game.match_id, Match.tournament_id, Match.round_number,
+            Game.board_number,
+            case((is_white, "white"), else_="black").label("color"),
+            Opponent.id.label("opponent_id"), Opponent.name.label("opponent_name"),
+            Game.result, Game.is_completed,
+            case((is_white, Game.white_score), else_=Game.black_score).label("score"),
+        )
+        .join(Match, Match.id == Game.match_id)
+        .join(Opponent, Opponent.id == case((is_white, Game.black_player_id), else_=Game.white_player_id))
+        .filter(or_(is_white, Game.black_player_id == player_id))
+        .order_by(Game.id)
+    )
+    if after_id:
+        query = query.filter(Game.id > after_id)
+    return query
+
+def get_player_games(db: Session, player_id: int, after_id: Optional[int] = None,
+                     limit: Optional[int] = None) -> List[schemas.PlayerGameEntry]:
+    query = player_games_query(db, player_id, after_id)
+    if limit:
+        query = query.limit(limit)
+    return [schemas.PlayerGameEntry(**row._mapping) for row in query]
+
+def get_rating_history(db: Session, player_id: int) -> List[models.RatingHistory]:
+    return (
+        db.query(models.RatingHistory)
+        .filter(models.RatingHistory.player_id == player_id)
+        .order_by(models.RatingHistory.round_number)
+        .all()
+    )
+
+def best_players_query(
+    db: Session,
+    tournament_id: int,
+    limit: Optional[int] = None,
+    team_id: Optional[int] = None,
+    min_games: int = 1,
+):
+    """
+    Single GROUP BY over a tournament's completed games joined to players.
+    """
+    Game, Player, Match = models.Game, models.Player, models.Match
+    score = case((Game.white_player_id == Player.id, Game.white_score), else_=Game.black_score)
+    games_played = func.count(Game.id)
+    wins = func.sum(case((score == 1.0, 1), else_=0))
+    draws = func.sum(case((score == 0.5, 1), else_=0))
+    points = func.sum(score)
+
+    query = (
+        db.query(
+            Player.id, Player.name,
+            games_played.label("games_played"), wins.label("wins"),
+            draws.label("draws"), points.label("points"),
+        )
+        .select_from(Game)
+        .join(Match, Match.id == Game.match_id)
+        .join(Player, or_(Player.id == Game.white_player_id, Player.id == Game.black_player_id))
+        .filter(Match.tournament_id == tournament_id, Game.is_completed == True)
+        .group_by(Player.id, Player.name)
+        .having(games_played >= min_games)
+        .order_by(points.desc(), wins.desc(), Player.id)
+    )
+    if team_id:
+        query = query.filter(Player.team_id == team_id)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+def get_best_players(
+    db: Session,
+    tournament_id: int,
+    limit: Optional[int] = None,
+    team_id: Optional[int] = None,
+    min_games: int = 1,
+) -> list[schemas.BestPlayerEntry]:
+    """
+    Player leaderboard for a tournament, aggregated in one query.
+    Only players with at least ``min_games`` completed games appear.
+    """
+    query = best_players_query(db, tournament_id, limit=limit, team_id=team_id, min_games=min_games)
+    return [
+        schemas.BestPlayerEntry(
+            player_id=row.id,
+            player_name=row.name,
+            games_played=row.games_played,
+            wins=row.wins,
+            draws=row.draws,
+            losses=row.games_played - row.wins - row.draws,
+            points=row.points,
+        )
+        for row in query
+    ]
@@ -1,5 +1,5 @@
-### backend/app/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
@@ -8,12 +8,89 @@ load_dotenv()
 
 raw_url = os.getenv("DATABASE_URL", "sqlite:///./chess_tournament.db")
 DATABASE_URL = raw_url.replace("sqlite+aiosqlite://", "sqlite://", 1)
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1),
+)
+IS_SQLITE = DATABASE_URL.startswith("sqlite://")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite://") else {}
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+# "production" turns on WAL and the tuned pragmas/pool below; "default" keeps driver defaults
+DB_PROFILE = os.getenv("DB_PROFILE", "default").lower()
+PRODUCTION = DB_PROFILE == "production"
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # negative = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+def _pool_args(prefix: str, size: int, overflow: int) -> dict:
+    if not PRODUCTION or ":memory:" in DATABASE_URL:
+        return {}
+    return {
+        "pool_size": int(os.getenv(f"{prefix}_POOL_SIZE", str(size))),
+        "max_overflow": int(os.getenv(f"{prefix}_MAX_OVERFLOW", str(overflow))),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": True,
+    }
+
+def _configure_sqlite(sync_engine, read_only: bool = False, immediate: bool = False):
+    """
+    Apply the profile's pragmas to every new connection of an engine. With
+    ``immediate``, transactions open with BEGIN IMMEDIATE: pysqlite on its own
+    runs SELECTs outside any transaction, so two writers could read the same
+    counter and both write back their own increment.
+    """
+    if not IS_SQLITE:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if PRODUCTION:
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+        if immediate:
+            # Leave BEGIN to the listener below instead of the driver
+            dbapi_connection.isolation_level = None
+
+    if immediate:
+        @event.listens_for(sync_engine, "begin")
+        def begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def is_lock_error(exc: Exception) -> bool:
+    """
+    True for SQLite's "database is locked": another connection held the write
+    lock for longer than the busy timeout. Retrying shortly usually succeeds.
+    """
+    return IS_SQLITE and "locked" in str(getattr(exc, "orig", exc)).lower()
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+# SQLite has a single writer, so the write pool stays small and readers get their own
+engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args, **_pool_args("DB", 4, 4))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
+read_engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args, **_pool_args("DB_READ", 16, 16))
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+
+# Async engine for the read-heavy routes, so they don't queue for threadpool workers
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **_pool_args("DB_READ", 16, 16))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Result posts read counters and standings and write them back changed, so
+# every write transaction holds the lock from its first read, on every profile
+_configure_sqlite(engine, immediate=True)
+_configure_sqlite(read_engine, read_only=True)
+_configure_sqlite(async_engine.sync_engine, read_only=True)
+
 def get_db():
     """
     Dependency to get DB session.
@@ -23,3 +100,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """
+    Dependency to get a read-only DB session for GET routes.
+    Its connections refuse writes and never hold the write lock.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """
+    Dependency to get a read-only async DB session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,152 @@
+"""
+Live tournament updates over server-sent events.
+
+Write endpoints publish compact deltas (board results, match completions,
+changed standings rows, player swaps) after they commit. Each event is
+serialized once into an SSE frame and kept in a per-tournament ring buffer;
+subscribers only copy frames out of that buffer, so one write serves any
+number of open streams. A reconnecting client sends ``Last-Event-ID`` and gets
+every frame it missed, or a ``reset`` event if they are no longer buffered.
+
+The broker lives in this process only, so a subscriber hears only the writes
+its own worker served; run a single worker (as the Docker image does) for
+live updates to be complete.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+def _frame(event_id: str, event: str, data) -> bytes:
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+
+@dataclass
+class _Stream:
+    buffer: Deque[Tuple[int, bytes]]
+    last_seq: int = 0
+    # One shared future per event loop, resolved on the next publish
+    waiters: Dict[asyncio.AbstractEventLoop, asyncio.Future] = field(default_factory=dict)
+    subscribers: int = 0
+
+
+class EventBroker:
+    def __init__(self, buffer_size: int = 1000):
+        self.buffer_size = buffer_size
+        self._streams: Dict[int, _Stream] = {}
+        self._lock = threading.Lock()
+        # Event ids from before a restart cannot be resumed
+        self._epoch = uuid.uuid4().hex[:8]
+        self.published = 0
+
+    def _stream(self, tournament_id: int) -> _Stream:
+        stream = self._streams.get(tournament_id)
+        if stream is None:
+            stream = self._streams[tournament_id] = _Stream(deque(maxlen=self.buffer_size))
+        return stream
+
+    def publish(self, tournament_id: int, events: List[Tuple[str, dict]]) -> None:
+        """Append (event, data) pairs to a tournament's stream; safe from any thread."""
+        if not events:
+            return
+        with self._lock:
+            stream = self._stream(tournament_id)
+            for event, data in events:
+                stream.last_seq += 1
+                stream.buffer.append((stream.last_seq, _frame(f"{self._epoch}:{stream.last_seq}", event, data)))
+            self.published += len(events)
+            waiters, stream.waiters = stream.waiters, {}
+        for loop, future in waiters.items():
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def _since(self, stream: _Stream, last_event_id: Optional[str]) -> Tuple[List[bytes], int]:
+        """Frames after ``last_event_id`` and the sequence number to continue from."""
+        epoch, _, seq = (last_event_id or "").partition(":")
+        if not last_event_id:
+            return [], stream.last_seq
+        first = stream.buffer[0][0] if stream.buffer else stream.last_seq + 1
+        if epoch != self._epoch or not seq.isdigit() or int(seq) > stream.last_seq or int(seq) < first - 1:
+            reset = _frame(f"{self._epoch}:{stream.last_seq}", "reset", {"reason": "missed events"})
+            return [reset], stream.last_seq
+        start = int(seq) - first + 1
+        return [frame for _, frame in itertools.islice(stream.buffer, start, None)], stream.last_seq
+
+    async def wait(self, tournament_id: int, last_seq: int, timeout: float) -> Tuple[List[bytes], int]:
+        """
+        Frames published after ``last_seq``, waiting up to ``timeout`` seconds
+        for the next publish if there are none yet.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stream = self._stream(tournament_id)
+            if stream.last_seq == last_seq:
+                future = stream.waiters.get(loop)
+                if future is None:
+                    future = stream.waiters[loop] = loop.create_future()
+            else:
+                future = None
+        if future is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                pass
+        with self._lock:
+            return self._since(stream, f"{self._epoch}:{last_seq}")
+
+    def resume(self, tournament_id: int, last_event_id: Optional[str]) -> Tuple[List[bytes], int]:
+        """Backlog for a (re)connecting client."""
+        with self._lock:
+            return self._since(self._stream(tournament_id), last_event_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tournaments": len(self._streams),
+                "subscribers": sum(s.subscribers for s in self._streams.values()),
+                "published": self.published,
+            }
+
+    def _subscribed(self, tournament_id: int, delta: int) -> None:
+        with self._lock:
+            self._stream(tournament_id).subscribers += delta
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+event_broker = EventBroker(int(os.getenv("EVENT_BUFFER_SIZE", "1000")))
+
+
+def event_stream(request: Request, tournament_id: int, last_event_id: Optional[str]) -> StreamingResponse:
+    """SSE response replaying missed frames, then following the tournament's stream."""
+    async def frames():
+        event_broker._subscribed(tournament_id, 1)
+        try:
+            backlog, seq = event_broker.resume(tournament_id, last_event_id)
+            yield b"retry: 3000\n\n" + b"".join(backlog)
+            while not await request.is_disconnected():
+                batch, seq = await event_broker.wait(tournament_id, seq, HEARTBEAT_SECONDS)
+                # A comment line keeps proxies from closing an idle stream
+                yield b"".join(batch) if batch else b": keepalive\n\n"
+        finally:
+            event_broker._subscribed(tournament_id, -1)
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
@@ -1,10 +1,16 @@
 ### backend/app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 import os, logging
-from .database import engine, Base
+from sqlalchemy.exc import OperationalError
+from .database import engine, async_engine, Base, is_lock_error
 from .api import tournaments, teams, players, matches,auth
+from .cache import result_cache
+from .events import event_broker
+from .auth_utils import token_cache
+from .metrics import MetricsMiddleware, install_sql_hooks, metrics, render_prometheus
 from dotenv import load_dotenv; load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -27,11 +33,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 if not DEBUG:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=ALLOWED_HOSTS)
 
+# Outermost, so the latency covers the other middleware too
+app.add_middleware(MetricsMiddleware)
+install_sql_hooks()
+
 @app.on_event("startup")
 def on_startup():
     logger.info("🚀 Starting up")
@@ -39,8 +50,25 @@ def on_startup():
     logger.info("✅ Tables ready")
 
 @app.on_event("shutdown")
-def on_shutdown():
+async def on_shutdown():
     logger.info("🛑 Shutting down")
+    await async_engine.dispose()
+
+@app.exception_handler(OperationalError)
+async def database_locked(request: Request, exc: OperationalError):
+    """
+    A write that waited out the busy timeout behind another writer is a
+    transient overload, not a server bug: answer 503 so clients retry.
+    """
+    if not is_lock_error(exc):
+        raise exc
+    metrics.db_lock_errors += 1
+    logger.warning("Database locked: %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 app.include_router(auth.router)
@@ -53,6 +81,26 @@ app.include_router(matches.router)
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/cache/stats")
+def cache_stats():
+    return result_cache.stats()
+
+@app.get("/events/stats")
+def events_stats():
+    return event_broker.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Request, SQL, cache, live-update and token cache metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        render_prometheus({
+            "result_cache": result_cache.stats(),
+            "events": event_broker.stats(),
+            "token_cache": token_cache.stats(),
+        }),
+        media_type="text/plain; version=0.0.4",
+    )
+
 @app.get("/")
 def root():
     return {"message": "Chess Tournament API", "version": API_VERSION}
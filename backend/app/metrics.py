@@ -0,0 +1,244 @@
+"""
+Request and SQL instrumentation, exposed as Prometheus text at /metrics.
+
+An ASGI middleware times every request and labels it with its route template
+(``/api/matches/{match_id}``, not the raw path). Cursor-execute hooks on every
+engine attribute each statement and its duration to the request running it
+through a context variable, which follows the request into the threadpool and
+into async sessions. Requests slower than SLOW_REQUEST_MS are logged with
+their slowest statements.
+
+Like the result cache, the counters live in this process only.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_TOP_STATEMENTS = int(os.getenv("SLOW_REQUEST_TOP_STATEMENTS", "5"))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    """SQL run on behalf of one request."""
+    queries: int = 0
+    sql_seconds: float = 0.0
+    # Slowest statements as a min-heap of (seconds, sql)
+    slowest: List[Tuple[float, str]] = field(default_factory=list)
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.sql_seconds += seconds
+        if len(self.slowest) < SLOW_REQUEST_TOP_STATEMENTS:
+            heapq.heappush(self.slowest, (seconds, statement))
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, statement))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@dataclass
+class _Route:
+    requests: Dict[int, int] = field(default_factory=dict)   # status -> count
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    sql_seconds: float = 0.0
+
+
+class Metrics:
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], _Route] = {}
+        self._lock = threading.Lock()
+        self.queries_outside_requests = 0
+        self.slow_requests = 0
+        self.db_lock_errors = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: Optional[float], stats: RequestStats) -> None:
+        """Record one finished request; ``seconds`` is None for streams, which are not timed."""
+        with self._lock:
+            entry = self._routes.get((method, route))
+            if entry is None:
+                entry = self._routes[(method, route)] = _Route()
+            entry.requests[status] = entry.requests.get(status, 0) + 1
+            entry.queries += stats.queries
+            entry.sql_seconds += stats.sql_seconds
+            if seconds is not None:
+                entry.count += 1
+                entry.seconds += seconds
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    if seconds <= bound:
+                        entry.buckets[i] += 1
+                        break
+
+    def snapshot(self) -> Dict[Tuple[str, str], _Route]:
+        with self._lock:
+            return {
+                key: _Route(dict(r.requests), list(r.buckets), r.count, r.seconds, r.queries, r.sql_seconds)
+                for key, r in self._routes.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.queries_outside_requests = 0
+            self.slow_requests = 0
+            self.db_lock_errors = 0
+
+
+metrics = Metrics()
+
+
+# -- SQL hooks --
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is None:
+        metrics.queries_outside_requests += 1
+    else:
+        stats.add(statement, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_sql_hooks() -> None:
+    """Time the statements of every engine, including the async engines' sync side."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+# -- Middleware --
+
+class MetricsMiddleware:
+    """Times each HTTP request and attributes its SQL to its route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = {"status": 500, "stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = dict(message.get("headers") or [])
+                response["stream"] = headers.get(b"content-type", b"").startswith(b"text/event-stream")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up the series count
+            path = getattr(route, "path", None) or "<unmatched>"
+            # Event streams stay open for minutes; their duration is not a latency
+            timed = not response["stream"]
+            metrics.observe(scope["method"], path, response["status"], elapsed if timed else None, stats)
+            if timed and elapsed * 1000 >= SLOW_REQUEST_MS:
+                metrics.slow_requests += 1
+                _log_slow(scope["method"], path, response["status"], elapsed, stats)
+
+
+def _log_slow(method: str, path: str, status: int, elapsed: float, stats: RequestStats) -> None:
+    lines = [
+        f"Slow request {method} {path} -> {status}: {elapsed * 1000:.0f} ms, "
+        f"{stats.queries} queries, {stats.sql_seconds * 1000:.0f} ms in SQL"
+    ]
+    for seconds, statement in sorted(stats.slowest, reverse=True):
+        lines.append(f"  {seconds * 1000:8.1f} ms  {' '.join(statement.split())[:300]}")
+    logger.warning("\n".join(lines))
+
+
+# -- Prometheus exposition --
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_prometheus(extra: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """
+    All metrics in the Prometheus text format. ``extra`` adds gauges from other
+    components, as {prefix: {name: value}}.
+    """
+    routes = sorted(metrics.snapshot().items())
+    out: List[str] = []
+
+    def family(name: str, kind: str, help_text: str):
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+
+    family("http_requests_total", "counter", "HTTP requests by route and status.")
+    for (method, path), r in routes:
+        for status, count in sorted(r.requests.items()):
+            out.append(f"http_requests_total{_labels(method=method, route=path, status=status)} {count}")
+
+    family("http_request_duration_seconds", "histogram", "HTTP request latency by route (event streams excluded).")
+    for (method, path), r in routes:
+        if not r.count:
+            continue
+        cumulative = 0
+        for bound, hits in zip(LATENCY_BUCKETS, r.buckets):
+            cumulative += hits
+            out.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=path, le=bound)} {cumulative}")
+        out.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=path, le='+Inf')} {r.count}")
+        out.append(f"http_request_duration_seconds_sum{_labels(method=method, route=path)} {r.seconds:.6f}")
+        out.append(f"http_request_duration_seconds_count{_labels(method=method, route=path)} {r.count}")
+
+    family("http_request_db_queries_total", "counter", "SQL statements executed by requests, by route.")
+    for (method, path), r in routes:
+        out.append(f"http_request_db_queries_total{_labels(method=method, route=path)} {r.queries}")
+
+    family("http_request_db_seconds_total", "counter", "Time spent in SQL by requests, by route.")
+    for (method, path), r in routes:
+        out.append(f"http_request_db_seconds_total{_labels(method=method, route=path)} {r.sql_seconds:.6f}")
+
+    family("db_queries_outside_requests_total", "counter", "SQL statements run outside any HTTP request.")
+    out.append(f"db_queries_outside_requests_total {metrics.queries_outside_requests}")
+    family("http_slow_requests_total", "counter", f"Requests slower than {SLOW_REQUEST_MS:g} ms.")
+    out.append(f"http_slow_requests_total {metrics.slow_requests}")
+    family("db_lock_errors_total", "counter", "Requests answered 503 because the SQLite database stayed locked.")
+    out.append(f"db_lock_errors_total {metrics.db_lock_errors}")
+
+    for prefix, values in (extra or {}).items():
+        for name, value in values.items():
+            family(f"{prefix}_{name}", "gauge", f"{prefix.replace('_', ' ').capitalize()}: {name.replace('_', ' ')}.")
+            out.append(f"{prefix}_{name} {value}")
+    return "\n".join(out) + "\n"
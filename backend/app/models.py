@@ -1,5 +1,5 @@
 ### backend/app/models.py
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Text, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -14,18 +14,24 @@ class Tournament(Base):
     status = Column(String(50), default="active")
     current_round = Column(Integer, default=1)
     total_rounds = Column(Integer)
-    created_at = Column(DateTime, default=func.now())
+    pairing_system = Column(String(20), default="round_robin")
+    rating_system = Column(String(10), default="elo")  # "elo", "glicko2" or "none"; applied per completed round
+    tiebreaks = Column(JSON)  # Ordered tiebreak names (see tiebreaks.TIEBREAKS); NULL uses the defaults
+    schedule = Column(JSON)  # Round-robin: {"seeds": [team ids], "double": bool}; rounds are built when opened
+    result_version = Column(Integer, default=0, server_default="0")  # Bumped by every change the cached reads show
+    created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     teams = relationship("Team", back_populates="tournament", cascade="all, delete-orphan")
     matches = relationship("Match", back_populates="tournament", cascade="all, delete-orphan")
     rounds = relationship("Round", back_populates="tournament", cascade="all, delete-orphan")
+    rating_history = relationship("RatingHistory", cascade="all, delete-orphan")
 
 class Team(Base):
     __tablename__ = "teams"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False, index=True)
     captain_id = Column(Integer, ForeignKey("players.id"))
     matches_played = Column(Integer, default=0)
     wins = Column(Integer, default=0)
@@ -43,9 +49,12 @@ class Team(Base):
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (Index("ix_players_team_position", "team_id", "position"),)
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     rating = Column(Integer, default=1200)
+    rating_deviation = Column(Float)   # Glicko-2 only; NULL until rated
+    rating_volatility = Column(Float)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
     position = Column(Integer, default=1)
     games_played = Column(Integer, default=0)
@@ -67,6 +76,8 @@ class Round(Base):
     start_date = Column(DateTime)
     end_date = Column(DateTime)
     is_completed = Column(Boolean, default=False)
+    total_matches = Column(Integer, default=0)
+    completed_matches = Column(Integer, default=0)
     created_at = Column(DateTime, default=func.now())
 
     tournament = relationship("Tournament", back_populates="rounds")
@@ -74,9 +85,10 @@ class Round(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (Index("ix_matches_tournament_round", "tournament_id", "round_number"),)
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
-    round_id = Column(Integer, ForeignKey("rounds.id"), nullable=False)
+    round_id = Column(Integer, ForeignKey("rounds.id"), nullable=False, index=True)
     round_number = Column(Integer, nullable=False)
     white_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
     black_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
@@ -86,6 +98,8 @@ class Match(Base):
     scheduled_date = Column(DateTime)
     completed_date = Column(DateTime)
     is_completed = Column(Boolean, default=False)
+    total_boards = Column(Integer, default=0)
+    completed_boards = Column(Integer, default=0)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -95,11 +109,12 @@ class Match(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (Index("ix_games_match_board", "match_id", "board_number"),)
     id = Column(Integer, primary_key=True, index=True)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
     board_number = Column(Integer, nullable=False)
-    white_player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
-    black_player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    white_player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    black_player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
     result = Column(String(10))
     white_score = Column(Float, default=0.0)
     black_score = Column(Float, default=0.0)
@@ -111,3 +126,31 @@ class Game(Base):
     match = relationship("Match", back_populates="games")
     white_player = relationship("Player", foreign_keys=[white_player_id])
     black_player = relationship("Player", foreign_keys=[black_player_id])
+
+    # Names are only reported when the players were eager loaded; never lazy load here
+    @property
+    def white_player_name(self):
+        player = self.__dict__.get("white_player")
+        return player.name if player else None
+
+    @property
+    def black_player_name(self):
+        player = self.__dict__.get("black_player")
+        return player.name if player else None
+
+class RatingHistory(Base):
+    __tablename__ = "rating_history"
+    __table_args__ = (Index("ix_rating_history_player_round", "player_id", "round_number"),)
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False, index=True)
+    round_id = Column(Integer, ForeignKey("rounds.id"), nullable=False)
+    round_number = Column(Integer, nullable=False)
+    system = Column(String(10), nullable=False)
+    rating_before = Column(Float, nullable=False)
+    rating_after = Column(Float, nullable=False)
+    deviation = Column(Float)   # Glicko-2, after the round
+    volatility = Column(Float)
+    games = Column(Integer, default=0)
+    score = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=func.now())
@@ -0,0 +1,195 @@
+"""
+Swiss-system pairing.
+
+Teams are ranked by score, split into score groups and paired top half
+against bottom half (Dutch system). Within a group the preferred pairings
+are taken first and the remaining teams are matched with augmenting paths,
+so a group is always paired as completely as the no-repeat and colour
+constraints allow without trying permutations. The augmenting step is
+O(V·E) for V teams and E compatible pairs in the worst case; it only runs
+for the teams the greedy pass left out, which are few while most pairings
+are still allowed. Teams left over float down into the next group.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+@dataclass
+class SwissTeam:
+    id: int
+    score: float = 0.0
+    tiebreak: float = 0.0
+    seed: int = 0
+    colors: List[str] = field(default_factory=list)  # "W"/"B" per match played, oldest first
+    opponents: Set[int] = field(default_factory=set)
+    byes: int = 0
+
+    @property
+    def color_diff(self) -> int:
+        return self.colors.count("W") - self.colors.count("B")
+
+    def must_play(self) -> Optional[str]:
+        """Colour this team is required to get (absolute preference), if any."""
+        if self.color_diff <= -2 or self.colors[-2:] == ["B", "B"]:
+            return "W"
+        if self.color_diff >= 2 or self.colors[-2:] == ["W", "W"]:
+            return "B"
+        return None
+
+
+def _compatible(a: SwissTeam, b: SwissTeam) -> bool:
+    if b.id in a.opponents:
+        return False
+    need_a, need_b = a.must_play(), b.must_play()
+    return need_a is None or need_a != need_b
+
+
+def _assign_colors(a: SwissTeam, b: SwissTeam, round_number: int) -> Tuple[int, int]:
+    """Return (white_id, black_id); ``a`` is the higher-ranked team."""
+    need_a, need_b = a.must_play(), b.must_play()
+    if need_a == "W" or need_b == "B":
+        return a.id, b.id
+    if need_a == "B" or need_b == "W":
+        return b.id, a.id
+    if a.color_diff != b.color_diff:
+        return (a.id, b.id) if a.color_diff < b.color_diff else (b.id, a.id)
+    if a.colors and b.colors and a.colors[-1] != b.colors[-1]:
+        return (a.id, b.id) if a.colors[-1] == "B" else (b.id, a.id)
+    if a.colors:
+        return (b.id, a.id) if a.colors[-1] == "W" else (a.id, b.id)
+    return (a.id, b.id) if round_number % 2 == 1 else (b.id, a.id)
+
+
+def _match_halves(top: List[SwissTeam], bottom: List[SwissTeam]) -> Dict[int, int]:
+    """
+    Maximum matching between the two halves of a score group, preferring
+    top[i] - bottom[i] and then the nearest transpositions.
+    Returns {top index: bottom index}.
+    """
+    match_top: Dict[int, int] = {}
+    match_bottom: Dict[int, int] = {}
+
+    def candidates(i):
+        # bottom[i] first, then alternate outwards
+        yield from (j for j in range(i, len(bottom)))
+        yield from (j for j in range(i - 1, -1, -1))
+
+    # Greedy pass in Dutch order
+    for i, a in enumerate(top):
+        for j in candidates(i):
+            if j not in match_bottom and _compatible(a, bottom[j]):
+                match_top[i], match_bottom[j] = j, i
+                break
+
+    # Augmenting paths for whoever the greedy pass left out
+    for start in range(len(top)):
+        if start in match_top:
+            continue
+        parent: Dict[int, Tuple[int, Optional[int]]] = {}
+        queue = deque([start])
+        seen_top = {start}
+        end = None
+        while queue and end is None:
+            i = queue.popleft()
+            for j in candidates(i):
+                if j in parent or not _compatible(top[i], bottom[j]):
+                    continue
+                parent[j] = (i, match_bottom.get(j))
+                if j not in match_bottom:
+                    end = j
+                    break
+                nxt = match_bottom[j]
+                if nxt not in seen_top:
+                    seen_top.add(nxt)
+                    queue.append(nxt)
+        # Flip the alternating path
+        while end is not None:
+            i, _ = parent[end]
+            previous = match_top.get(i)
+            match_top[i], match_bottom[end] = end, i
+            end = previous
+    return match_top
+
+
+def _pair_group(group: List[SwissTeam]) -> Tuple[List[Tuple[SwissTeam, SwissTeam]], List[SwissTeam]]:
+    """Pair a score group top half against bottom half; return pairs and floaters."""
+    half = len(group) // 2
+    top, bottom = group[:half], group[half:]
+    matched = _match_halves(top, bottom)
+    used_bottom = set(matched.values())
+    pairs = [(top[i], bottom[j]) for i, j in matched.items()]
+    unpaired = [t for i, t in enumerate(top) if i not in matched]
+    unpaired += [t for j, t in enumerate(bottom) if j not in used_bottom]
+    return pairs, unpaired
+
+
+def _pair_leftovers(teams: List[SwissTeam], pairs: List[Tuple[SwissTeam, SwissTeam]]) -> None:
+    """
+    Last resort for whoever the bottom group could not pair: greedy first,
+    then break up an existing pair so two leftovers can both be placed, and
+    only if that fails allow a repeat pairing. Extends ``pairs`` in place.
+    """
+    remaining = list(teams)
+    unpaired = []
+    while remaining:
+        a = remaining.pop(0)
+        partner = next((b for b in remaining if _compatible(a, b)), None)
+        if partner is None:
+            unpaired.append(a)
+        else:
+            remaining.remove(partner)
+            pairs.append((a, partner))
+
+    while len(unpaired) >= 2:
+        x, y = unpaired.pop(0), unpaired.pop(0)
+        for k in range(len(pairs) - 1, -1, -1):
+            a, b = pairs[k]
+            swap = next(((p, q) for p, q in ((a, b), (b, a)) if _compatible(x, p) and _compatible(y, q)), None)
+            if swap:
+                pairs[k] = (swap[0], x)
+                pairs.append((swap[1], y))
+                break
+        else:
+            pairs.append((x, y))
+
+
+def pair_swiss_round(teams: Sequence[SwissTeam], round_number: int) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """
+    Pair one Swiss round.
+    Returns the (white_team_id, black_team_id) pairings, strongest first,
+    and the id of the team given the bye, if any.
+    """
+    ranked = sorted(teams, key=lambda t: (-t.score, -t.tiebreak, t.seed, t.id))
+
+    bye = None
+    if len(ranked) % 2:
+        # Lowest-ranked team with the fewest byes sits out
+        bye = min(reversed(ranked), key=lambda t: t.byes)
+        ranked.remove(bye)
+    rank = {t.id: position for position, t in enumerate(ranked)}
+
+    groups: List[List[SwissTeam]] = []
+    for team in ranked:
+        if groups and groups[-1][0].score == team.score:
+            groups[-1].append(team)
+        else:
+            groups.append([team])
+
+    pairs: List[Tuple[SwissTeam, SwissTeam]] = []
+    floaters: List[SwissTeam] = []
+    for group in groups[:-1]:
+        group_pairs, floaters = _pair_group(floaters + group)
+        pairs += group_pairs
+    group_pairs, leftovers = _pair_group(floaters + (groups[-1] if groups else []))
+    pairs += group_pairs
+    _pair_leftovers(sorted(leftovers, key=lambda t: rank[t.id]), pairs)
+
+    pairings = []
+    for a, b in pairs:
+        if rank[b.id] < rank[a.id]:
+            a, b = b, a
+        pairings.append(_assign_colors(a, b, round_number))
+    pairings.sort(key=lambda p: min(rank[p[0]], rank[p[1]]))
+    return pairings, bye.id if bye else None
@@ -0,0 +1,228 @@
+"""
+Player rating engine.
+
+Ratings move once per completed round, treating the round as one rating
+period: every game of the round is rated from the ratings the players had
+before it, so the whole round is a single vectorized batch (per-player sums
+are ``np.bincount`` calls over the round's games). Each update starts from the
+ratings stored on the players, so nothing is replayed, and a RatingHistory row
+per player and round records the before/after values.
+
+Elo follows the FIDE formula with a fixed K; Glicko-2 follows Glickman's
+"Example of the Glicko-2 system" step by step.
+"""
+
+import math
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+
+from .models import Game, Match, Player, RatingHistory, Round, Team
+
+ELO_K_FACTOR = float(os.getenv("ELO_K_FACTOR", "20"))
+GLICKO_TAU = float(os.getenv("GLICKO_TAU", "0.5"))
+GLICKO_DEFAULT_RD = 350.0
+GLICKO_DEFAULT_VOLATILITY = 0.06
+GLICKO_SCALE = 173.7178
+CONVERGENCE = 1e-6
+
+
+def _sum(index: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(index, weights=values, minlength=size)
+
+
+def elo_update(ratings: np.ndarray, white: np.ndarray, black: np.ndarray,
+               white_score: np.ndarray, k: float = ELO_K_FACTOR) -> np.ndarray:
+    """
+    New Elo ratings after one rating period. ``white``/``black`` index into
+    ``ratings`` per game and ``white_score`` is 1, 0.5 or 0.
+    """
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[black] - ratings[white]) / 400.0))
+    surprise = white_score - expected
+    n = len(ratings)
+    return ratings + k * (_sum(white, surprise, n) - _sum(black, surprise, n))
+
+
+def _volatility(phi, delta, v, sigma, tau):
+    """Step 5 of Glicko-2: the new volatility by the Illinois algorithm, for all players at once."""
+    a = np.log(sigma ** 2)
+
+    def f(x):
+        ex = np.exp(x)
+        return ex * (delta ** 2 - phi ** 2 - v - ex) / (2 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+    big = delta ** 2 > phi ** 2 + v
+    lower = np.where(big, np.log(np.where(big, delta ** 2 - phi ** 2 - v, 1.0)), a - tau)
+    pending = ~big
+    for _ in range(100):
+        pending &= f(lower) < 0
+        if not pending.any():
+            break
+        lower = np.where(pending, lower - tau, lower)
+
+    A, B = a, lower
+    fA, fB = f(A), f(B)
+    for _ in range(100):
+        active = np.abs(B - A) > CONVERGENCE
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):  # converged entries are masked out below
+            C = np.where(active, A + (A - B) * fA / (fB - fA), A)
+        fC = f(C)
+        swap = fC * fB <= 0
+        A, fA = np.where(active & swap, B, A), np.where(active & swap, fB, np.where(active, fA / 2, fA))
+        B, fB = np.where(active, C, B), np.where(active, fC, fB)
+    return np.exp(A / 2)
+
+
+def glicko2_update(ratings: np.ndarray, deviations: np.ndarray, volatilities: np.ndarray,
+                   white: np.ndarray, black: np.ndarray, white_score: np.ndarray,
+                   tau: float = GLICKO_TAU) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    New (rating, deviation, volatility) after one rating period. Players
+    without a game only see their deviation grow.
+    """
+    n = len(ratings)
+    mu = (ratings - 1500.0) / GLICKO_SCALE
+    phi = deviations / GLICKO_SCALE
+    g = 1.0 / np.sqrt(1.0 + 3.0 * phi ** 2 / math.pi ** 2)
+
+    # Each game seen from both sides: (player, opponent, score)
+    player = np.concatenate([white, black])
+    opponent = np.concatenate([black, white])
+    score = np.concatenate([white_score, 1.0 - white_score])
+    expected = 1.0 / (1.0 + np.exp(-g[opponent] * (mu[player] - mu[opponent])))
+
+    played = np.bincount(player, minlength=n) > 0
+    info = _sum(player, g[opponent] ** 2 * expected * (1 - expected), n)
+    improvement = _sum(player, g[opponent] * (score - expected), n)
+    v = np.where(played, 1.0 / np.where(played, info, 1.0), np.inf)
+    delta = np.zeros(n)
+    delta[played] = v[played] * improvement[played]  # v is inf for idle players
+
+    sigma = volatilities.astype(float).copy()
+    if played.any():
+        sigma[played] = _volatility(phi[played], delta[played], v[played], sigma[played], tau)
+    phi_star = np.sqrt(phi ** 2 + sigma ** 2)
+    new_phi = np.where(played, 1.0 / np.sqrt(1.0 / phi_star ** 2 + 1.0 / v), phi_star)
+    new_mu = mu + np.where(played, new_phi ** 2 * improvement, 0.0)
+    return (
+        new_mu * GLICKO_SCALE + 1500.0,
+        np.minimum(new_phi * GLICKO_SCALE, GLICKO_DEFAULT_RD),
+        sigma,
+    )
+
+
+_players = Player.__table__
+_RATING_UPDATE = (
+    update(_players)
+    .where(_players.c.id == bindparam("player_id"))
+    .values(rating=bindparam("new_rating"), rating_deviation=bindparam("new_rd"),
+            rating_volatility=bindparam("new_volatility"))
+)
+
+
+def rate_round(db: Session, rnd: Round, system: Optional[str] = None) -> int:
+    """
+    Apply one completed round to the ratings of the tournament's players and
+    record their history. Returns the number of games rated; the caller commits.
+    """
+    system = system or rnd.tournament.rating_system or "elo"
+    if system not in ("elo", "glicko2"):
+        return 0
+    db.flush()
+    games = (
+        db.query(Game.white_player_id, Game.black_player_id, Game.white_score)
+        .join(Match, Match.id == Game.match_id)
+        .filter(Match.round_id == rnd.id, Game.is_completed == True)
+        .all()
+    )
+    # Glicko-2 also ages the deviation of everyone who sat the round out
+    query = db.query(Player.id, Player.rating, Player.rating_deviation, Player.rating_volatility)
+    if system == "glicko2":
+        query = query.join(Team, Team.id == Player.team_id).filter(Team.tournament_id == rnd.tournament_id)
+    else:
+        query = query.filter(Player.id.in_({p for w, b, _ in games for p in (w, b)}))
+    players = query.order_by(Player.id).all()
+    if not players:
+        return 0
+
+    ids = np.array([p.id for p in players], dtype=np.int64)
+    ratings = np.array([p.rating if p.rating is not None else 1200 for p in players], dtype=float)
+    deviations = np.array([p.rating_deviation or GLICKO_DEFAULT_RD for p in players])
+    volatilities = np.array([p.rating_volatility or GLICKO_DEFAULT_VOLATILITY for p in players])
+
+    table = np.array(games, dtype=float).reshape(-1, 3)
+    white = np.searchsorted(ids, table[:, 0].astype(np.int64))
+    black = np.searchsorted(ids, table[:, 1].astype(np.int64))
+    white_score = table[:, 2]
+
+    if system == "elo":
+        new_ratings = elo_update(ratings, white, black, white_score)
+        # Elo leaves the Glicko columns as they were
+        new_deviations = [p.rating_deviation for p in players]
+        new_volatilities = [p.rating_volatility for p in players]
+    else:
+        new_ratings, new_deviations, new_volatilities = glicko2_update(
+            ratings, deviations, volatilities, white, black, white_score
+        )
+        new_deviations, new_volatilities = new_deviations.tolist(), new_volatilities.tolist()
+
+    n = len(players)
+    games_played = np.bincount(white, minlength=n) + np.bincount(black, minlength=n)
+    scores = _sum(white, white_score, n) + _sum(black, 1.0 - white_score, n)
+
+    db.connection().execute(_RATING_UPDATE, [
+        {"player_id": int(pid), "new_rating": int(round(r)), "new_rd": rd, "new_volatility": vol}
+        for pid, r, rd, vol in zip(ids, new_ratings, new_deviations, new_volatilities)
+    ])
+    db.execute(insert(RatingHistory), [
+        {
+            "player_id": int(pid), "tournament_id": rnd.tournament_id, "round_id": rnd.id,
+            "round_number": rnd.round_number, "system": system,
+            "rating_before": float(before), "rating_after": float(after),
+            "deviation": rd, "volatility": vol,
+            "games": int(count), "score": float(score),
+        }
+        for pid, before, after, rd, vol, count, score in zip(
+            ids, ratings, new_ratings, new_deviations, new_volatilities, games_played, scores
+        )
+    ])
+    return len(games)
+
+
+def rebuild_ratings(db: Session, tournament_id: int) -> int:
+    """
+    Repair path after results of rated rounds were corrected: restore every
+    player's rating from before their first rated round, drop the history and
+    rate the completed rounds again in order. Returns the rounds rated; the
+    caller commits.
+    """
+    first: Dict[int, RatingHistory] = {}
+    for entry in (
+        db.query(RatingHistory)
+        .filter(RatingHistory.tournament_id == tournament_id)
+        .order_by(RatingHistory.round_number.desc())
+    ):
+        first[entry.player_id] = entry
+    if first:
+        db.connection().execute(_RATING_UPDATE, [
+            {"player_id": pid, "new_rating": int(round(e.rating_before)),
+             "new_rd": None, "new_volatility": None}
+            for pid, e in first.items()
+        ])
+    db.query(RatingHistory).filter(RatingHistory.tournament_id == tournament_id).delete(synchronize_session=False)
+    db.expire_all()
+
+    rounds = (
+        db.query(Round)
+        .filter(Round.tournament_id == tournament_id, Round.is_completed == True)
+        .order_by(Round.round_number)
+        .all()
+    )
+    for rnd in rounds:
+        rate_round(db, rnd)
+    return len(rounds)
@@ -0,0 +1,168 @@
+"""
+Bulk roster import.
+
+A CSV (with a header row) or NDJSON file lists one player per row:
+
+    team,name,rating,position
+    Knights,Alice,1850,1
+    Knights,Bob,,
+
+``team`` (a team name; ``team_id`` also works) and ``name`` are required.
+Teams missing from the tournament are created. Rows are parsed as the
+upload streams in, then checked against the tournament's existing roster
+loaded in one query: duplicate names within a team are rejected and missing
+positions are taken from the end of the team. Every valid row is then
+inserted with one executemany per table in a single transaction; invalid rows
+are reported by line number and skipped.
+"""
+
+import codecs
+import csv
+import json
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .models import Player, Team
+from .tournament_logic import bulk_insert_ids
+
+DEFAULT_RATING = 1200
+
+
+class RosterImport:
+    def __init__(self, db: Session, tournament_id: int):
+        self.tournament_id = tournament_id
+        self.teams: Dict[str, Optional[int]] = {}   # team name -> id (None until created)
+        self.team_names: Dict[int, str] = {}
+        self.names: Dict[str, set] = {}             # team name -> player names
+        self.positions: Dict[str, set] = {}         # team name -> positions taken
+        for team_id, name in db.query(Team.id, Team.name).filter(Team.tournament_id == tournament_id):
+            self.teams[name] = team_id
+            self.team_names[team_id] = name
+            self.names[name], self.positions[name] = set(), set()
+        for team_id, name, position in (
+            db.query(Player.team_id, Player.name, Player.position)
+            .join(Team, Team.id == Player.team_id)
+            .filter(Team.tournament_id == tournament_id)
+        ):
+            team = self.team_names[team_id]
+            self.names[team].add(name)
+            self.positions[team].add(position)
+        self.players: List[Tuple[str, dict]] = []   # (team name, row) to insert
+        self.errors: List[dict] = []
+
+    def add(self, line: int, row: dict) -> None:
+        """Validate one parsed row; ``line`` is only used for error reports."""
+        try:
+            if "_error" in row:
+                raise ValueError(row["_error"])
+            team, player = self._check(row)
+        except ValueError as exc:
+            self.errors.append({"line": line, "error": str(exc)})
+            return
+        if team not in self.teams:
+            self.teams[team] = None
+            self.names[team], self.positions[team] = set(), set()
+        if player["position"] is None:
+            player["position"] = max(self.positions[team], default=0) + 1
+        self.names[team].add(player["name"])
+        self.positions[team].add(player["position"])
+        self.players.append((team, player))
+
+    def _check(self, row: dict) -> Tuple[str, dict]:
+        name = str(row.get("name") or "").strip()
+        if not name:
+            raise ValueError("Player name is required")
+        if len(name) > 255:
+            raise ValueError("Player name is longer than 255 characters")
+
+        team = str(row.get("team") or "").strip()
+        team_id = row.get("team_id")
+        if team_id not in (None, ""):
+            try:
+                team = self.team_names[int(team_id)]
+            except (KeyError, ValueError):
+                raise ValueError(f"Team {team_id} is not in this tournament")
+        if not team:
+            raise ValueError("Team is required")
+
+        rating = _optional_int(row.get("rating"), "Rating")
+        position = _optional_int(row.get("position"), "Position")
+        if position is not None and position < 1:
+            raise ValueError("Position must be at least 1")
+        if name in self.names.get(team, ()):
+            raise ValueError(f"Player name '{name}' already exists in team '{team}'")
+        if position is not None and position in self.positions.get(team, ()):
+            raise ValueError(f"Position {position} is already taken in team '{team}'")
+        return team, {"name": name, "rating": DEFAULT_RATING if rating is None else rating, "position": position}
+
+    def save(self, db: Session) -> Dict[str, int]:
+        """Insert the valid rows: new teams first, then all players. The caller commits."""
+        new_teams = [name for name, team_id in self.teams.items() if team_id is None]
+        created = bulk_insert_ids(db, Team, [{"name": n, "tournament_id": self.tournament_id} for n in new_teams])
+        self.teams.update(zip(new_teams, created))
+        if self.players:
+            db.execute(insert(Player), [{**player, "team_id": self.teams[team]} for team, player in self.players])
+        return {"teams_created": len(new_teams), "players_created": len(self.players)}
+
+
+def _optional_int(value, label: str) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is None or not number.is_integer():
+        raise ValueError(f"{label} must be a whole number")
+    return int(number)
+
+
+class RowParser:
+    """
+    Turn uploaded bytes into (line number, row) pairs as they arrive, for
+    either format; CSV rows are keyed by the header row.
+    """
+
+    def __init__(self, fmt: Optional[str] = None):
+        self.fmt = fmt
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.pending = ""
+        self.line = 0
+        self.header: Optional[List[str]] = None
+
+    def feed(self, chunk: bytes, final: bool = False):
+        self.pending += self.decoder.decode(chunk, final)
+        *lines, self.pending = self.pending.split("\n")
+        if final:
+            lines.append(self.pending)
+            self.pending = ""
+        for text in lines:
+            self.line += 1
+            text = text.rstrip("\r")
+            if not text.strip():
+                continue
+            if self.fmt is None:
+                # NDJSON rows are objects; anything else is taken as a CSV header
+                self.fmt = "ndjson" if text.lstrip().startswith("{") else "csv"
+            row = self._parse(text)
+            if row is not None:
+                yield self.line, row
+
+    def _parse(self, text: str):
+        if self.fmt == "ndjson":
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            return row if isinstance(row, dict) else {"_error": "Line is not a JSON object"}
+        values = next(csv.reader([text]))
+        if self.header is None:
+            self.header = [v.strip().lower() for v in values]
+            if "name" not in self.header or not {"team", "team_id"} & set(self.header):
+                raise ValueError("CSV header must name the 'name' and 'team' (or 'team_id') columns")
+            return None
+        if len(values) > len(self.header):
+            return {"_error": f"Expected {len(self.header)} columns, got {len(values)}"}
+        return dict(zip(self.header, values))
@@ -1,7 +1,10 @@
 ### backend/app/schemas.py
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+from .tiebreaks import TIEBREAKS
+
+TiebreakName = Literal[TIEBREAKS]
 # -- Tournament Schemas --
 class TournamentBase(BaseModel):
     name: str
@@ -16,18 +19,27 @@ class TournamentCreate(TournamentBase):
     end_date: Optional[datetime] = None
     team_names: List[str]
     players_per_team: List[int]
+    pairing_system: Literal["round_robin", "swiss"] = "round_robin"
+    double_round_robin: bool = False  # Round-robin only; second cycle with colours reversed
+    total_rounds: Optional[int] = Field(None, ge=1)  # Swiss only; defaults to ceil(log2(teams))
+    tiebreaks: Optional[List[TiebreakName]] = None  # Ranking after match points; defaults to board points, SB
+    rating_system: Literal["elo", "glicko2", "none"] = "elo"  # Player ratings move after every completed round
 
 class TournamentUpdate(BaseModel):
     name: Optional[str]
     description: Optional[str]
     start_date: Optional[datetime]
     end_date: Optional[datetime]
+    tiebreaks: Optional[List[TiebreakName]] = None
 
 class TournamentResponse(TournamentBase):
     id: int
     status: str
     current_round: int
     total_rounds: Optional[int]
+    pairing_system: Optional[str] = "round_robin"
+    tiebreaks: Optional[List[str]] = None
+    rating_system: Optional[str] = "elo"
     class Config:
         from_attributes = True
 
@@ -66,9 +78,19 @@ class PlayerUpdate(BaseModel):
     rating: Optional[float] = None
     position: Optional[int]
 
+class RosterImportError(BaseModel):
+    line: int
+    error: str
+
+class RosterImportResponse(BaseModel):
+    teams_created: int
+    players_created: int
+    errors: List[RosterImportError] = []
+
 class PlayerResponse(PlayerBase):
     id: int
     rating: int
+    rating_deviation: Optional[float] = None
     games_played: int
     wins: int
     draws: int
@@ -92,6 +114,8 @@ class GameResponse(BaseModel):
     white_score: float
     black_score: float
     is_completed: bool
+    white_player_name: Optional[str] = None
+    black_player_name: Optional[str] = None
     class Config:
         from_attributes = True
 
@@ -107,6 +131,30 @@ class GameSimpleResultUpdate(BaseModel):
         return v
 
 
+class BoardResultUpdate(GameSimpleResultUpdate):
+    board_number: int
+
+class MatchResultsUpdate(BaseModel):
+    results: List[BoardResultUpdate]
+
+class RoundBoardResultUpdate(BoardResultUpdate):
+    match_id: int
+
+class RoundResultsUpdate(BaseModel):
+    results: List[RoundBoardResultUpdate]
+
+class BoardResultOutcome(BaseModel):
+    match_id: int
+    board_number: int
+    game_id: int
+    result: str
+    status: str  # 'recorded', 'updated' or 'unchanged'
+
+class BatchResultsResponse(BaseModel):
+    outcomes: List[BoardResultOutcome]
+    completed_match_ids: List[int]
+
+
 class RoundResponse(BaseModel):
     round_number: int
     is_completed: bool
@@ -136,6 +184,7 @@ class StandingsEntry(BaseModel):
     match_points: float
     game_points: float
     sonneborn_berger: float
+    tiebreaks: Dict[str, float] = {}
     class Config:
         from_attributes = True
 
@@ -151,6 +200,39 @@ class BestPlayerEntry(BaseModel):
     losses: int
     points: float
     
+class PlayerGameEntry(BaseModel):
+    game_id: int
+    match_id: int
+    tournament_id: int
+    round_number: int
+    board_number: int
+    color: str  # 'white' or 'black'
+    opponent_id: int
+    opponent_name: str
+    result: Optional[str]
+    is_completed: bool
+    score: Optional[float]  # this player's score
+
+class RatingHistoryEntry(BaseModel):
+    tournament_id: int
+    round_id: int
+    round_number: int
+    system: str
+    rating_before: float
+    rating_after: float
+    deviation: Optional[float]
+    volatility: Optional[float]
+    games: int
+    score: float
+    class Config:
+        from_attributes = True
+
+class PlayerGamesResponse(BaseModel):
+    player_id: int
+    player_name: str
+    team_name: str
+    games: List[PlayerGameEntry]
+
 class BestPlayersResponse(BaseModel):
     tournament_id: int
     tournament_name: str
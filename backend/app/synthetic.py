@@ -0,0 +1,122 @@
+"""
+Synthetic tournaments for demos, benchmarks and load tests.
+
+generate_tournament creates an event of any size with random player ratings
+and plays a share of its schedule with random results. Results go through
+the same bookkeeping as the result endpoints, one round per transaction, so
+standings, player stats and ratings end up as they would in a real event.
+"""
+
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .models import Game, Player, Round, Team, Tournament
+from .tournament_logic import (
+    apply_player_stats, create_tournament_structure, matches_by_team, record_board_results,
+)
+
+
+def tournament_data(num_teams: int, boards: int = 4, **options) -> schemas.TournamentCreate:
+    """Creation payload for ``num_teams`` teams of ``boards`` players; ``options`` override any field."""
+    data = {
+        "name": f"Synthetic {num_teams} teams",
+        "description": "Synthetic tournament",
+        "start_date": None,
+        "team_names": [f"Team {i + 1}" for i in range(num_teams)],
+        "players_per_team": [boards] * num_teams,
+    }
+    data.update(options)
+    return schemas.TournamentCreate(**data)
+
+
+def random_result(rng: random.Random, white_rating: float, black_rating: float, draw_rate: float = 0.3) -> str:
+    """A game result drawn from the Elo expectation of the two ratings."""
+    if rng.random() < draw_rate:
+        return "draw"
+    expected = 1.0 / (1.0 + 10.0 ** ((black_rating - white_rating) / 400.0))
+    return "white_win" if rng.random() < expected else "black_win"
+
+
+def generate_tournament(
+    db: Session,
+    num_teams: int,
+    boards: int = 4,
+    completion: float = 0.0,
+    draw_rate: float = 0.3,
+    seed: Optional[int] = None,
+    rating_range: Optional[Tuple[int, int]] = (1200, 2400),
+    **options,
+) -> Tournament:
+    """
+    Create a tournament and play ``completion`` (0 to 1) of its matches in
+    round order. Player ratings are drawn uniformly from ``rating_range``
+    (None keeps the default rating). ``options`` go to TournamentCreate,
+    e.g. name or pairing_system="swiss". The same seed gives the same event.
+    """
+    if not 0.0 <= completion <= 1.0:
+        raise ValueError("completion must be between 0 and 1")
+    rng = random.Random(seed)
+    tour = create_tournament_structure(db, tournament_data(num_teams, boards, **options))
+    tournament_id = tour.id
+
+    if rating_range:
+        player_ids = [
+            player_id for (player_id,) in
+            db.query(Player.id).join(Team, Team.id == Player.team_id).filter(Team.tournament_id == tournament_id)
+        ]
+        db.execute(update(Player), [{"id": pid, "rating": rng.randint(*rating_range)} for pid in player_ids])
+        db.commit()
+
+    remaining = round(completion * (tour.total_rounds or 0) * (num_teams // 2))
+    while remaining > 0:
+        rnd = (
+            db.query(Round)
+            .filter(Round.tournament_id == tournament_id, Round.is_completed == False)
+            .order_by(Round.round_number)
+            .first()
+        )
+        if rnd is None:
+            break
+        played = _play_round(db, rnd, rng, draw_rate, remaining)
+        if not played:
+            break
+        remaining -= played
+    db.refresh(tour)
+    return tour
+
+
+def _play_round(db: Session, rnd: Round, rng: random.Random, draw_rate: float, limit: int) -> int:
+    """Play up to ``limit`` open matches of a round and commit; completing the round opens the next one."""
+    # Loaded as the result endpoints do, so each match's bookkeeping runs no queries
+    by_team = matches_by_team(db, [rnd.tournament_id])
+    loaded = db.query(Team).filter(Team.tournament_id == rnd.tournament_id).all()
+    matches = sorted(
+        {m.id: m for ms in by_team.values() for m in ms if m.round_id == rnd.id and not m.is_completed}.values(),
+        key=lambda m: m.id,
+    )[:limit]
+    if not matches:
+        return 0
+
+    games: Dict[int, List[Game]] = defaultdict(list)
+    for game in db.query(Game).filter(Game.match_id.in_([m.id for m in matches])).order_by(Game.board_number):
+        games[game.match_id].append(game)
+    ratings = dict(
+        db.query(Player.id, Player.rating)
+        .join(Team, Team.id == Player.team_id)
+        .filter(Team.tournament_id == rnd.tournament_id)
+    )
+    player_deltas: Dict[int, Dict[str, float]] = {}
+    for match in matches:
+        results = [
+            (g, random_result(rng, ratings[g.white_player_id], ratings[g.black_player_id], draw_rate))
+            for g in games[match.id]
+        ]
+        record_board_results(db, match, results, player_deltas, by_team)
+    apply_player_stats(db, player_deltas)
+    db.commit()
+    return len(matches)
@@ -0,0 +1,158 @@
+"""
+Tiebreak engine.
+
+Completed matches of a tournament are loaded once into a sparse team-by-team
+results matrix (one entry per match, as parallel NumPy arrays), and every
+tiebreak is a vectorized reduction over it: sums over opponents are
+``np.bincount`` calls rather than Python loops over ORM objects, so a full
+table for thousands of teams costs a few milliseconds.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .models import Match
+
+# Tiebreaks in the order they can be listed; see Results.tiebreak
+TIEBREAKS = (
+    "board_points",       # game points summed over all boards
+    "sonneborn_berger",   # opponents' match points, weighted by the result against them
+    "buchholz",           # opponents' match points
+    "buchholz_cut1",      # Buchholz without the weakest opponent
+    "direct_encounter",   # match points scored between teams still tied
+    "wins",               # matches won
+    "koya",               # match points scored against opponents on 50% or more
+)
+# The order standings have always used: match points, board points, SB
+DEFAULT_TIEBREAKS = ["board_points", "sonneborn_berger"]
+
+# (white, black) match points per match result
+MATCH_POINTS = {"white_win": (2, 0), "black_win": (0, 2), "draw": (1, 1)}
+
+# One completed match as read from the database; scores may be NULL
+ROW_DTYPE = np.dtype([
+    ("white", np.int64), ("black", np.int64), ("result", object),
+    ("white_score", object), ("black_score", object),
+])
+
+
+@dataclass
+class Results:
+    """Completed matches of one tournament as a sparse results matrix."""
+    team_ids: np.ndarray     # row/column labels
+    white: np.ndarray        # team index of white, per match
+    black: np.ndarray        # team index of black, per match
+    white_mp: np.ndarray     # match points scored by white
+    black_mp: np.ndarray
+    white_gp: np.ndarray     # board points scored by white
+    black_gp: np.ndarray
+
+    @classmethod
+    def from_rows(cls, team_ids: Sequence[int], rows) -> "Results":
+        """
+        Build from team ids and (white_id, black_id, result, white_score, black_score)
+        rows. Rows without a decisive result or with an unknown team are skipped.
+        """
+        ids = np.asarray(team_ids, dtype=np.int64)
+        table = np.fromiter(rows, dtype=ROW_DTYPE)
+        result = table["result"]
+
+        # Team ids to matrix indices
+        sorter = np.argsort(ids)
+        def index(team_ids):
+            if not len(ids):
+                return np.zeros(len(team_ids), dtype=np.intp), np.zeros(len(team_ids), dtype=bool)
+            pos = sorter[np.clip(np.searchsorted(ids, team_ids, sorter=sorter), 0, len(ids) - 1)]
+            return pos, ids[pos] == team_ids
+        white, white_known = index(table["white"])
+        black, black_known = index(table["black"])
+
+        white_mp = np.zeros(len(table))
+        black_mp = np.zeros(len(table))
+        decided = np.zeros(len(table), dtype=bool)
+        for name, (w, b) in MATCH_POINTS.items():
+            hit = result == name
+            white_mp[hit], black_mp[hit] = w, b
+            decided |= hit
+
+        keep = decided & white_known & black_known
+        white_gp = np.nan_to_num(table["white_score"].astype(float))
+        black_gp = np.nan_to_num(table["black_score"].astype(float))
+        return cls(ids, white[keep], black[keep], white_mp[keep], black_mp[keep], white_gp[keep], black_gp[keep])
+
+    @classmethod
+    def load(cls, db: Session, tournament_id: int, team_ids: Sequence[int]) -> "Results":
+        """One query for the completed matches, as plain columns."""
+        rows = db.query(
+            Match.white_team_id, Match.black_team_id, Match.result, Match.white_score, Match.black_score
+        ).filter(Match.tournament_id == tournament_id, Match.is_completed == True)
+        return cls.from_rows(team_ids, map(tuple, rows))
+
+    def _sum(self, white_values, black_values) -> np.ndarray:
+        """Per-team sum of a per-match quantity given from each side's view."""
+        n = len(self.team_ids)
+        return (np.bincount(self.white, weights=white_values, minlength=n)
+                + np.bincount(self.black, weights=black_values, minlength=n))
+
+    @property
+    def played(self) -> np.ndarray:
+        return self._sum(np.ones_like(self.white_mp), np.ones_like(self.black_mp))
+
+    @property
+    def match_points(self) -> np.ndarray:
+        return self._sum(self.white_mp, self.black_mp)
+
+    def outcomes(self) -> Dict[str, np.ndarray]:
+        """Wins, draws and losses per team."""
+        return {
+            "wins": self._sum(self.white_mp == 2, self.black_mp == 2),
+            "draws": self._sum(self.white_mp == 1, self.black_mp == 1),
+            "losses": self._sum(self.white_mp == 0, self.black_mp == 0),
+        }
+
+    def tiebreak(self, name: str, match_points: np.ndarray, tied_on: List[np.ndarray] = ()) -> np.ndarray:
+        """
+        One tiebreak per team. ``tied_on`` holds the criteria ranked before it,
+        which only the direct encounter needs.
+        """
+        mp = match_points
+        if name == "board_points":
+            return self._sum(self.white_gp, self.black_gp)
+        if name == "sonneborn_berger":
+            # A win earns the opponent's full match points, a draw half of them
+            return self._sum(self.white_mp / 2 * mp[self.black], self.black_mp / 2 * mp[self.white])
+        if name == "buchholz":
+            return self._sum(mp[self.black], mp[self.white])
+        if name == "buchholz_cut1":
+            weakest = np.full(len(self.team_ids), np.inf)
+            np.minimum.at(weakest, self.white, mp[self.black])
+            np.minimum.at(weakest, self.black, mp[self.white])
+            return self._sum(mp[self.black], mp[self.white]) - np.where(np.isinf(weakest), 0.0, weakest)
+        if name == "direct_encounter":
+            keys = np.round(np.column_stack([mp, *tied_on]), 6)
+            _, group = np.unique(keys, axis=0, return_inverse=True)
+            group = group.reshape(-1)
+            same = group[self.white] == group[self.black]
+            return self._sum(np.where(same, self.white_mp, 0.0), np.where(same, self.black_mp, 0.0))
+        if name == "wins":
+            return self._sum(self.white_mp == 2, self.black_mp == 2)
+        if name == "koya":
+            strong = mp >= self.played  # at least half of the 2 points available per match
+            return self._sum(np.where(strong[self.black], self.white_mp, 0.0),
+                             np.where(strong[self.white], self.black_mp, 0.0))
+        raise ValueError(f"Unknown tiebreak '{name}'")
+
+    def rank(self, tiebreaks: Sequence[str] = DEFAULT_TIEBREAKS):
+        """
+        Rank teams by match points, then by each tiebreak in order, then id.
+        Returns (team indices best first, match points, {tiebreak: values}).
+        """
+        mp = self.match_points
+        values: Dict[str, np.ndarray] = {}
+        for name in tiebreaks:
+            values[name] = self.tiebreak(name, mp, [values[prev] for prev in values])
+        keys = [self.team_ids] + [-values[name] for name in reversed(list(values))] + [-mp]
+        return np.lexsort(keys), mp, values
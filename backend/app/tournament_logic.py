@@ -1,19 +1,27 @@
 ### backend/app/tournament_logic.py
-from typing import List, Tuple
-from datetime import datetime
-from sqlalchemy.orm import Session
-from .models import Tournament, Round, Match, Game,Team, Player
-from . import schemas
-
-from typing import List, Tuple
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
+import math
+from sqlalchemy import bindparam, case, func, insert, or_, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.util import identity_key
 from .models import Tournament, Round, Match, Game, Team, Player
 from . import schemas
+from .pairing import SwissTeam, pair_swiss_round
+from .tiebreaks import DEFAULT_TIEBREAKS, MATCH_POINTS, Results
+from .ratings import rate_round
 
-def create_tournament_structure(db: Session,data: schemas.TournamentCreate):
+def create_tournament_structure(db: Session, data: schemas.TournamentCreate):
     """
-    Create tournament, teams, players, rounds, matches, and games.
+    Create tournament, teams and players, and open round 1.
+
+    Later rounds are not written up front: round-robin events store their
+    Berger schedule descriptor and every round is materialized into Match and
+    Game rows when it is opened (see open_round). Every level of the structure
+    is written with one set-based INSERT, so creation costs a handful of
+    statements in a single transaction regardless of the event size.
     """
     # Step 1: Create the tournament
     tour = Tournament(
@@ -21,177 +29,571 @@ def create_tournament_structure(db: Session,data: schemas.TournamentCreate):
         description=data.description,
         start_date=data.start_date or datetime.utcnow(),
         end_date=data.end_date,
-        status="active"
+        status="active",
+        tiebreaks=data.tiebreaks,
+        rating_system=data.rating_system,
     )
     db.add(tour)
     db.flush()  # To get tour.id
 
     # Step 2: Create teams and players
-    teams = []
-    for name, num_players in zip(data.team_names, data.players_per_team):
-        team = Team(name=name, tournament_id=tour.id)
-        db.add(team)
-        db.flush()
-        teams.append(team)
-
-        for i in range(num_players):
-            player = Player(
-                name=f"Player {i + 1} of {name}",
-                team_id=team.id
-            )
-            db.add(player)
+    entries = list(zip(data.team_names, data.players_per_team))
+    team_ids = bulk_insert_ids(db, Team, [
+        {"name": name, "tournament_id": tour.id} for name, _ in entries
+    ])
 
-    db.flush()
+    player_rows = [
+        {"name": f"Player {i + 1} of {name}", "team_id": team_id, "position": i + 1}
+        for team_id, (name, num_players) in zip(team_ids, entries)
+        for i in range(num_players)
+    ]
+    player_ids = bulk_insert_ids(db, Player, player_rows)
 
-    # Step 3: Generate all rounds using round-robin logic
-    team_ids = [team.id for team in teams]
-    all_rounds = generate_all_round_robin_rounds(team_ids)
-    tour.total_rounds = len(all_rounds)
-    db.commit()
+    # One roster per team, in board order
+    rosters: Dict[int, List[int]] = {team_id: [] for team_id in team_ids}
+    for row, player_id in zip(player_rows, player_ids):
+        rosters[row["team_id"]].append(player_id)
+
+    # Step 3: Pair round 1; later rounds are opened as play progresses
+    if data.pairing_system == "swiss":
+        tour.pairing_system = "swiss"
+        tour.total_rounds = data.total_rounds or default_swiss_rounds(len(team_ids))
+        seeds = [SwissTeam(id=team_id, seed=seed) for seed, team_id in enumerate(team_ids)]
+        first_round = pair_swiss_round(seeds, 1)[0]
+    else:
+        tour.pairing_system = "round_robin"
+        tour.schedule = {"seeds": team_ids, "double": data.double_round_robin}
+        tour.total_rounds = round_robin_round_count(len(team_ids), data.double_round_robin)
+        first_round = berger_round(team_ids, 1, data.double_round_robin) if tour.total_rounds else None
 
-    # Step 4: Create rounds, matches, and games
-    for round_num, pairings in enumerate(all_rounds, start=1):
-        rnd = Round(tournament_id=tour.id, round_number=round_num)
-        db.add(rnd)
-        db.flush()
-
-        for white_id, black_id in pairings:
-            match = Match(
-                tournament_id=tour.id,
-                round_id=rnd.id,
-                round_number=round_num,
-                white_team_id=white_id,
-                black_team_id=black_id
-            )
-            db.add(match)
-            db.flush()
-
-            white_players = db.query(Player).filter_by(team_id=white_id).order_by(Player.id).all()
-            black_players = db.query(Player).filter_by(team_id=black_id).order_by(Player.id).all()
-
-            for board_num, (wp, bp) in enumerate(zip(white_players, black_players), start=1):
-                game = Game(
-                    match_id=match.id,
-                    board_number=board_num,
-                    white_player_id=wp.id,
-                    black_player_id=bp.id
-                )
-                db.add(game)
+    # Step 4: Create round 1 with its matches and games
+    if first_round is not None:
+        materialize_rounds(db, tour.id, [(1, first_round)], rosters)
 
     db.commit()
     return tour
 
-def calculate_standings(db: Session, tournament_id: int) -> List[schemas.StandingsEntry]:
-    tour = db.query(Tournament).filter(Tournament.id == tournament_id).first()
-    if not tour:
+def materialize_rounds(
+    db: Session,
+    tournament_id: int,
+    rounds: List[Tuple[int, List[Tuple[int, int]]]],
+    rosters: Dict[int, List[int]],
+) -> List[int]:
+    """
+    Insert Round, Match and Game rows for (round_number, pairings) entries,
+    one set-based INSERT per table. Boards pair the rosters in order.
+    Returns the new round ids; the caller commits.
+    """
+    round_ids = bulk_insert_ids(db, Round, [
+        {"tournament_id": tournament_id, "round_number": round_num, "total_matches": len(pairings)}
+        for round_num, pairings in rounds
+    ])
+
+    match_rows = [
+        {
+            "tournament_id": tournament_id,
+            "round_id": round_id,
+            "round_number": round_num,
+            "white_team_id": white_id,
+            "black_team_id": black_id,
+            "total_boards": min(len(rosters.get(white_id, [])), len(rosters.get(black_id, []))),
+        }
+        for round_id, (round_num, pairings) in zip(round_ids, rounds)
+        for white_id, black_id in pairings
+    ]
+    match_ids = bulk_insert_ids(db, Match, match_rows)
+
+    game_rows = [
+        {
+            "match_id": match_id,
+            "board_number": board_num,
+            "white_player_id": wp,
+            "black_player_id": bp,
+        }
+        for match_id, row in zip(match_ids, match_rows)
+        for board_num, (wp, bp) in enumerate(
+            zip(rosters.get(row["white_team_id"], []), rosters.get(row["black_team_id"], [])), start=1
+        )
+    ]
+    if game_rows:
+        db.execute(insert(Game), game_rows)
+    return round_ids
+
+def load_rosters(db: Session, tournament_id: int) -> Dict[int, List[int]]:
+    """
+    Player ids of every team in a tournament, in board order, from one query.
+    """
+    rows = (
+        db.query(Player.id, Player.team_id)
+        .join(Team, Team.id == Player.team_id)
+        .filter(Team.tournament_id == tournament_id)
+        .order_by(Player.team_id, Player.position, Player.id)
+    )
+    rosters: Dict[int, List[int]] = {}
+    for player_id, team_id in rows:
+        rosters.setdefault(team_id, []).append(player_id)
+    return rosters
+
+def default_swiss_rounds(num_teams: int) -> int:
+    """Enough rounds to separate a single winner, capped by the field size."""
+    return max(1, min(num_teams - 1, math.ceil(math.log2(max(num_teams, 2)))))
+
+def open_round(db: Session, tour: Tournament, round_num: Optional[int] = None) -> Optional[int]:
+    """
+    Materialize the next round of a tournament into Round, Match and Game rows.
+
+    Round-robin pairings come from the stored Berger schedule, Swiss pairings
+    from the current standings; boards use the rosters as they are now.
+    Rounds open in order, so ``round_num`` (default: the next one) is only
+    opened if it directly follows the last open round. Returns the new round
+    id, or None if there is nothing to open. The caller commits.
+    """
+    db.flush()
+    opened = db.query(Round).filter(Round.tournament_id == tour.id).count()
+    round_num = round_num or opened + 1
+    if round_num != opened + 1 or round_num > (tour.total_rounds or 0):
+        return None
+
+    if tour.pairing_system == "swiss":
+        pairings = _swiss_pairings(db, tour, round_num)
+    elif tour.schedule:
+        # Withdrawn teams leave a bye in their Berger slot
+        existing = {team_id for (team_id,) in db.query(Team.id).filter(Team.tournament_id == tour.id)}
+        seeds = [team_id if team_id in existing else None for team_id in tour.schedule["seeds"]]
+        pairings = berger_round(seeds, round_num, tour.schedule.get("double", False))
+    else:
+        # Events created before schedules were stored have every round already
+        return None
+    return materialize_rounds(db, tour.id, [(round_num, pairings)], load_rosters(db, tour.id))[0]
+
+def _swiss_pairings(db: Session, tour: Tournament, round_num: int) -> List[Tuple[int, int]]:
+    """Pair a Swiss round from the current standings and pairing history."""
+    teams = {
+        t.id: SwissTeam(id=t.id, score=t.match_points or 0.0, tiebreak=t.game_points or 0.0, seed=seed)
+        for seed, t in enumerate(db.query(Team).filter(Team.tournament_id == tour.id).order_by(Team.id))
+    }
+    history = (
+        db.query(Match.round_number, Match.white_team_id, Match.black_team_id)
+        .filter(Match.tournament_id == tour.id)
+        .order_by(Match.round_number)
+    )
+    appearances = {team_id: 0 for team_id in teams}
+    for _, white_id, black_id in history:
+        for team_id, opponent_id, color in ((white_id, black_id, "W"), (black_id, white_id, "B")):
+            if team_id in teams:
+                teams[team_id].colors.append(color)
+                teams[team_id].opponents.add(opponent_id)
+                appearances[team_id] += 1
+    for team_id, count in appearances.items():
+        teams[team_id].byes = round_num - 1 - count
+
+    pairings, _ = pair_swiss_round(list(teams.values()), round_num)
+    return pairings
+
+def bulk_insert_ids(db: Session, model, rows: List[dict]) -> List[int]:
+    """
+    Insert rows in one executemany and return their primary keys in row order.
+    """
+    if not rows:
         return []
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLAlchemy can only keep RETURNING in parameter order on SQLite by
+        # inserting row by row. SQLite hands out increasing rowids in VALUES
+        # order under its single writer, so sorted ids are in row order too.
+        return sorted(db.scalars(insert(model).returning(model.id), rows))
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows))
 
-    team_dict = {team.id: team for team in tour.teams}
-    for team in team_dict.values():
-        team.match_points = 0.0
-        team.game_points = 0.0
-        team.sonneborn_berger = 0.0
-        team.wins = 0
-        team.draws = 0
-        team.losses = 0
-    db.commit()
+# Board scores for (white, black) per game result
+GAME_SCORES = {"white_win": (1.0, 0.0), "black_win": (0.0, 1.0), "draw": (0.5, 0.5)}
 
-    # First pass: calculate match_points and game_points
-    match_results = []
-    for m in tour.matches:
-        if not m.is_completed:
-            continue
+def record_board_results(
+    db: Session,
+    match: Match,
+    results: List[Tuple[Game, str]],
+    player_deltas: Optional[Dict[int, Dict[str, float]]] = None,
+    by_team: Optional[Dict[int, List[Match]]] = None,
+) -> List[Team]:
+    """
+    Apply board results to one match and run its completion bookkeeping once.
 
-        white_team = team_dict.get(m.white_team_id)
-        black_team = team_dict.get(m.black_team_id)
-        if not white_team or not black_team:
-            continue
+    Match scores and the match/round completion counters are adjusted by the
+    difference each board makes, so the cost does not depend on the number of
+    boards or matches in the round. Re-submitted boards replace their previous
+    score. Player stat changes are written here unless ``player_deltas`` is
+    given, in which case they are added to it for the caller to write with
+    apply_player_stats. ``by_team`` is passed on to apply_match_result.
+    The counters are read and written back, which is safe because write
+    sessions hold SQLite's write lock from their first statement (see
+    database._configure_sqlite). Returns the teams whose standings changed;
+    the caller commits.
+    """
+    previous = (match.result, match.white_score, match.black_score) if match.is_completed else None
 
-        white_team.game_points += m.white_score
-        black_team.game_points += m.black_score
-
-        if m.result == "white_win":
-            white_team.match_points += 2
-            result = "white_win"
-            white_team.wins += 1
-            black_team.losses += 1
-        elif m.result == "black_win":
-            black_team.match_points += 2
-            result = "black_win"
-            black_team.wins += 1
-            white_team.losses += 1
-        elif m.result == "draw":
-            white_team.match_points += 1
-            black_team.match_points += 1
-            result = "draw"
-            white_team.draws += 1
-            black_team.draws += 1
+    deferred = player_deltas is not None
+    if not deferred:
+        player_deltas = {}
+    for game, result in results:
+        white_score, black_score = GAME_SCORES[result]
+        if game.is_completed:
+            match.white_score -= game.white_score
+            match.black_score -= game.black_score
+            _add_player_score(player_deltas, game.white_player_id, game.white_score, -1)
+            _add_player_score(player_deltas, game.black_player_id, game.black_score, -1)
         else:
-            continue
+            match.completed_boards += 1
+        _add_player_score(player_deltas, game.white_player_id, white_score)
+        _add_player_score(player_deltas, game.black_player_id, black_score)
+        match.white_score += white_score
+        match.black_score += black_score
+        game.white_score = white_score
+        game.black_score = black_score
+        game.result = result
+        game.is_completed = True
+        _write_all(game, _GAME_RESULT_COLUMNS)
+    _write_all(match, _MATCH_SCORE_COLUMNS)
+    if not deferred:
+        apply_player_stats(db, player_deltas)
 
-        match_results.append((white_team.id, black_team.id, result))
-    for team in team_dict.values():
-        team.matches_played = team.wins + team.draws + team.losses
+    if match.completed_boards < match.total_boards:
+        return []
 
-    # Second pass: calculate Sonneborn-Berger
-    for white_id, black_id, result in match_results:
-        white = team_dict[white_id]
-        black = team_dict[black_id]
+    if match.white_score > match.black_score:
+        match.result = "white_win"
+    elif match.black_score > match.white_score:
+        match.result = "black_win"
+    else:
+        match.result = "draw"
+    match.completed_date = match.completed_date or datetime.utcnow()
 
-        if result == "white_win":
-            white.sonneborn_berger += black.match_points
-        elif result == "black_win":
-            black.sonneborn_berger += white.match_points
-        elif result == "draw":
-            white.sonneborn_berger += black.match_points / 2
-            black.sonneborn_berger += white.match_points / 2
+    current = (match.result, match.white_score, match.black_score)
+    if current == previous:
+        return []
 
-    db.commit()
+    # 📊 Move standings by this match's delta only (a correction first removes the old result)
+    changed: Dict[int, Team] = {}
+    if previous:
+        changed.update((t.id, t) for t in apply_match_result(db, match, *previous, sign=-1, by_team=by_team))
+    changed.update((t.id, t) for t in apply_match_result(db, match, *current, by_team=by_team))
 
-    return [
-        schemas.StandingsEntry(
-            team_id=team.id,
-            team_name=team.name,
-            matches_played=team.matches_played,
-            wins=team.wins,
-            draws=team.draws,
-            losses=team.losses,
-            match_points=team.match_points,
-            game_points=team.game_points,
-            sonneborn_berger=round(team.sonneborn_berger, 2),
+    if not match.is_completed:
+        match.is_completed = True
+        rnd = db.get(Round, match.round_id)
+        rnd.completed_matches += 1
+        if rnd.completed_matches >= rnd.total_matches and not rnd.is_completed:
+            rnd.is_completed = True
+            tour = db.get(Tournament, match.tournament_id)
+            tour.current_round = (tour.current_round or 1) + 1
+            rate_round(db, rnd, tour.rating_system)
+            # No-op if an admin already opened the next round early
+            open_round(db, tour, rnd.round_number + 1)
+
+    _write_all(match, _MATCH_RESULT_COLUMNS)
+    for team in changed.values():
+        _write_all(team, _STANDINGS_COLUMNS)
+    return list(changed.values())
+
+# The ORM sends a batch of UPDATEs as one executemany only while consecutive
+# rows change the same columns. A column assigned its current value (a 0-0
+# score, an unchanged loss count) drops out of the SET clause and splits the
+# batch, so random results would cost nearly one statement per row; these
+# columns are always written instead.
+_GAME_RESULT_COLUMNS = ("result", "white_score", "black_score", "is_completed")
+_MATCH_SCORE_COLUMNS = ("white_score", "black_score", "completed_boards")
+_MATCH_RESULT_COLUMNS = ("result", "completed_date", "is_completed")
+_STANDINGS_COLUMNS = ("match_points", "game_points", "sonneborn_berger", "wins", "draws", "losses", "matches_played")
+
+def _write_all(obj, columns: Tuple[str, ...]) -> None:
+    for column in columns:
+        flag_modified(obj, column)
+
+def _add_player_score(deltas: Dict[int, Dict[str, float]], player_id: int, score: float, sign: int = 1) -> None:
+    outcome = "wins" if score == 1.0 else "draws" if score == 0.5 else "losses"
+    delta = deltas.setdefault(player_id, {"games_played": 0, "wins": 0, "draws": 0, "losses": 0, "points": 0.0})
+    delta["games_played"] += sign
+    delta[outcome] += sign
+    delta["points"] += sign * score
+
+_players = Player.__table__
+_PLAYER_STATS_UPDATE = (
+    update(_players)
+    .where(_players.c.id == bindparam("player_id"))
+    .values({
+        column: _players.c[column] + bindparam(f"d_{column}")
+        for column in ("games_played", "wins", "draws", "losses", "points")
+    })
+)
+
+def apply_player_stats(db: Session, deltas: Dict[int, Dict[str, float]]) -> None:
+    """Increment the players' stat columns in place, one executemany for all boards."""
+    rows = [
+        {"player_id": player_id, **{f"d_{k}": v for k, v in delta.items()}}
+        for player_id, delta in deltas.items() if any(delta.values())
+    ]
+    if rows:
+        db.connection().execute(_PLAYER_STATS_UPDATE, rows)
+
+def rebuild_player_stats(db: Session, tournament_id: int) -> None:
+    """Recompute the stat columns of a tournament's players from their completed games."""
+    score = case((Game.white_player_id == Player.id, Game.white_score), else_=Game.black_score)
+
+    def total(expr):
+        return (
+            select(func.coalesce(expr, 0))
+            .where(or_(Game.white_player_id == Player.id, Game.black_player_id == Player.id),
+                   Game.is_completed == True)
+            .scalar_subquery()
+        )
+
+    db.execute(
+        update(Player)
+        .where(Player.team_id.in_(select(Team.id).where(Team.tournament_id == tournament_id)))
+        .values(
+            games_played=total(func.count(Game.id)),
+            wins=total(func.sum(case((score == 1.0, 1), else_=0))),
+            draws=total(func.sum(case((score == 0.5, 1), else_=0))),
+            losses=total(func.sum(case((score == 0.0, 1), else_=0))),
+            points=total(func.sum(score)),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+# Sonneborn-Berger weight earned by (white, black) per match result
+SB_WEIGHTS = {"white_win": (1.0, 0.0), "black_win": (0.0, 1.0), "draw": (0.5, 0.5)}
+
+def matches_by_team(db: Session, tournament_ids) -> Dict[int, List[Match]]:
+    """Every match of the tournaments, listed under both of its teams."""
+    by_team: Dict[int, List[Match]] = defaultdict(list)
+    for m in db.query(Match).filter(Match.tournament_id.in_(tournament_ids)):
+        by_team[m.white_team_id].append(m)
+        by_team[m.black_team_id].append(m)
+    return by_team
+
+def load_teams(db: Session, team_ids) -> Dict[int, Team]:
+    """Teams by id: those already in the session without SQL, the rest in one SELECT."""
+    teams, missing = {}, []
+    for tid in team_ids:
+        team = db.identity_map.get(identity_key(Team, tid))
+        if team is None:
+            missing.append(tid)
+        else:
+            teams[tid] = team
+    if missing:
+        teams.update((t.id, t) for t in db.query(Team).filter(Team.id.in_(missing)))
+    return teams
+
+def apply_match_result(
+    db: Session,
+    match: Match,
+    result: str,
+    white_score: float,
+    black_score: float,
+    sign: int = 1,
+    by_team: Optional[Dict[int, List[Match]]] = None,
+) -> List[Team]:
+    """
+    Add (sign=1) or remove (sign=-1) one completed match's contribution to the
+    standings columns of its teams, including the Sonneborn-Berger terms of
+    every opponent those teams met in other completed matches. Those matches
+    are queried, or looked up in ``by_team`` (see matches_by_team) when the
+    caller has already loaded them.
+    Returns the teams whose rows changed; the caller commits.
+    """
+    if result not in MATCH_POINTS:
+        return []
+
+    white = db.get(Team, match.white_team_id)
+    black = db.get(Team, match.black_team_id)
+    if not white or not black:
+        return []
+
+    white_mp, black_mp = (sign * p for p in MATCH_POINTS[result])
+    white_sb, black_sb = SB_WEIGHTS[result]
+    changed = {white.id: white, black.id: black}
+
+    # Removing: drop this match's own SB terms while the old match points still apply
+    if sign < 0:
+        white.sonneborn_berger -= white_sb * black.match_points
+        black.sonneborn_berger -= black_sb * white.match_points
+
+    white.match_points += white_mp
+    black.match_points += black_mp
+    white.game_points += sign * white_score
+    black.game_points += sign * black_score
+    for team, own_result in ((white, "white_win"), (black, "black_win")):
+        if result == "draw":
+            team.draws += sign
+        elif result == own_result:
+            team.wins += sign
+        else:
+            team.losses += sign
+        team.matches_played += sign
+
+    if sign > 0:
+        white.sonneborn_berger += white_sb * black.match_points
+        black.sonneborn_berger += black_sb * white.match_points
+
+    # Opponents met elsewhere carry an SB term proportional to our match points
+    delta = {white.id: white_mp, black.id: black_mp}
+    if by_team is None:
+        db.flush()  # other matches completed earlier in this transaction must be visible
+        others = db.query(Match).filter(
+            Match.tournament_id == match.tournament_id,
+            Match.is_completed == True,
+            Match.id != match.id,
+            (Match.white_team_id.in_(delta)) | (Match.black_team_id.in_(delta)),
+        ).all()
+    else:
+        others = list({
+            m.id: m for team_id in delta for m in by_team.get(team_id, ())
+            if m.is_completed and m.id != match.id
+        }.values())
+    opponents = load_teams(db, {m.white_team_id for m in others} | {m.black_team_id for m in others})
+    for m in others:
+        if m.result not in SB_WEIGHTS:
+            continue
+        m_white_sb, m_black_sb = SB_WEIGHTS[m.result]
+        if m.white_team_id in delta:
+            opponents[m.black_team_id].sonneborn_berger += m_black_sb * delta[m.white_team_id]
+            changed[m.black_team_id] = opponents[m.black_team_id]
+        if m.black_team_id in delta:
+            opponents[m.white_team_id].sonneborn_berger += m_white_sb * delta[m.black_team_id]
+            changed[m.white_team_id] = opponents[m.white_team_id]
+
+    return list(changed.values())
+
+def get_standings(db: Session, tournament_id: int) -> List[schemas.StandingsEntry]:
+    """
+    Standings ranked by match points and the tournament's tiebreak list. The
+    default list (board points, Sonneborn-Berger) is read in order from the
+    columns maintained by apply_match_result; any other list loads the
+    completed matches into the vectorized engine. No writes.
+    """
+    tiebreaks = _tiebreaks(db, tournament_id)
+    if tiebreaks == DEFAULT_TIEBREAKS:
+        teams = (
+            db.query(Team)
+            .filter(Team.tournament_id == tournament_id)
+            .order_by(Team.match_points.desc(), Team.game_points.desc(), Team.sonneborn_berger.desc(), Team.id)
+            .all()
         )
-        for team in sorted(team_dict.values(), key=lambda t: (-t.match_points, -t.game_points, -t.sonneborn_berger))
+        return [
+            standings_entry(t, {"board_points": t.game_points, "sonneborn_berger": round(t.sonneborn_berger, 2)})
+            for t in teams
+        ]
+    teams = db.query(Team).filter(Team.tournament_id == tournament_id).order_by(Team.id).all()
+    results = Results.load(db, tournament_id, [t.id for t in teams])
+    return _ranked_entries(db, tournament_id, teams, results)
+
+def _tiebreaks(db: Session, tournament_id: int) -> List[str]:
+    tour = db.get(Tournament, tournament_id)
+    return list((tour.tiebreaks if tour else None) or DEFAULT_TIEBREAKS)
+
+def _ranked_entries(db: Session, tournament_id: int, teams: List[Team], results: Results) -> List[schemas.StandingsEntry]:
+    order, _, values = results.rank(_tiebreaks(db, tournament_id))
+    return [
+        standings_entry(teams[i], {name: round(float(v[i]), 2) for name, v in values.items()})
+        for i in order
     ]
 
+def standings_entry(team: Team, tiebreaks: Optional[Dict[str, float]] = None) -> schemas.StandingsEntry:
+    return schemas.StandingsEntry(
+        team_id=team.id,
+        team_name=team.name,
+        matches_played=team.matches_played,
+        wins=team.wins,
+        draws=team.draws,
+        losses=team.losses,
+        match_points=team.match_points,
+        game_points=team.game_points,
+        sonneborn_berger=round(team.sonneborn_berger, 2),
+        tiebreaks=tiebreaks or {},
+    )
 
-def generate_all_round_robin_rounds(team_ids: List[int]) -> List[List[Tuple[int, int]]]:
+def calculate_standings(db: Session, tournament_id: int) -> List[schemas.StandingsEntry]:
     """
-    Generate all rounds using the circle method for round-robin scheduling.
-    Returns a list of rounds, where each round is a list of (white_team_id, black_team_id) tuples.
+    Rebuild every team's standings columns, and the players' stat columns,
+    from scratch. Both are normally maintained incrementally; this is the
+    repair path.
     """
-    teams = team_ids[:]
-    if len(teams) % 2 != 0:
-        teams.append(None)  # Add a dummy for byes
+    teams = db.query(Team).filter(Team.tournament_id == tournament_id).order_by(Team.id).all()
+    if not teams:
+        return []
 
-    total_rounds = len(teams) - 1
-    half = len(teams) // 2
-    rounds: List[List[Tuple[int, int]]] = []
+    results = Results.load(db, tournament_id, [t.id for t in teams])
+    match_points = results.match_points
+    game_points = results.tiebreak("board_points", match_points)
+    sonneborn_berger = results.tiebreak("sonneborn_berger", match_points)
+    outcomes = results.outcomes()
+    for i, team in enumerate(teams):
+        team.match_points = float(match_points[i])
+        team.game_points = float(game_points[i])
+        team.sonneborn_berger = float(sonneborn_berger[i])
+        team.wins = int(outcomes["wins"][i])
+        team.draws = int(outcomes["draws"][i])
+        team.losses = int(outcomes["losses"][i])
+        team.matches_played = team.wins + team.draws + team.losses
+    rebuild_player_stats(db, tournament_id)
 
-    for round_num in range(1, total_rounds + 1):
-        arr = teams[:]
-        for _ in range(round_num - 1):
-            arr = [arr[0]] + [arr[-1]] + arr[1:-1]  # rotate
+    # Ranked before the commit expires the teams, which would reload them one by one
+    entries = _ranked_entries(db, tournament_id, teams, results)
+    db.commit()
+    return entries
 
-        pairings: List[Tuple[int, int]] = []
-        for i in range(half):
-            t1, t2 = arr[i], arr[-i - 1]
-            if t1 is None or t2 is None:
-                continue
-            if round_num % 2 == 0:
-                t1, t2 = t2, t1  # alternate home/away
-            pairings.append((t1, t2))
 
-        rounds.append(pairings)
+def round_robin_round_count(num_teams: int, double: bool = False) -> int:
+    seats = num_teams + num_teams % 2
+    return max(seats - 1, 0) * (2 if double else 1)
 
-    return rounds
+def berger_round(team_ids: List[int], round_num: int, double: bool = False) -> List[Tuple[int, int]]:
+    """
+    Pairings of one round of a FIDE Berger table, computed directly in O(n).
 
+    team_ids[k - 1] sits at Berger number k; with an odd field the last
+    number is a bye and its pairing is dropped. In a double round-robin the
+    second cycle repeats the first with colours reversed; the last two
+    rounds of the first cycle are swapped (FIDE C.05 Annex 1) so nobody gets
+    the same colour three times running across the turn.
+    Returns (white_team_id, black_team_id) tuples in board order.
+    """
+    seats = len(team_ids) + len(team_ids) % 2
+    cycle = seats - 1
+    if not 1 <= round_num <= round_robin_round_count(len(team_ids), double):
+        raise ValueError(f"Round {round_num} is out of range")
+
+    reverse = round_num > cycle
+    r = round_num - cycle if reverse else round_num
+    if double and not reverse and cycle >= 2 and r >= cycle - 1:
+        r = 2 * cycle - 1 - r
+    # Number playing the last seat; the others pair up symmetrically around it
+    p = (r - 1) * (seats // 2) % cycle + 1
+
+    def team(number: int) -> Optional[int]:
+        return team_ids[number - 1] if number <= len(team_ids) else None
+
+    boards = [(p, seats) if r % 2 else (seats, p)]
+    for k in range(1, seats // 2):
+        boards.append(((p - 1 + k) % cycle + 1, (p - 1 - k) % cycle + 1))
+
+    pairings: List[Tuple[int, int]] = []
+    for white, black in boards:
+        if reverse:
+            white, black = black, white
+        white_id, black_id = team(white), team(black)
+        if white_id is not None and black_id is not None:
+            pairings.append((white_id, black_id))
+    return pairings
+
+def iter_round_robin_rounds(team_ids: List[int], double: bool = False) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Lazily yield every round of a (double) round-robin, O(n) work per round.
+    """
+    for round_num in range(1, round_robin_round_count(len(team_ids), double) + 1):
+        yield berger_round(team_ids, round_num, double)
+
+def generate_all_round_robin_rounds(team_ids: List[int], double: bool = False) -> List[List[Tuple[int, int]]]:
+    """
+    Generate all rounds of a round-robin schedule using Berger tables.
+    Returns a list of rounds, where each round is a list of (white_team_id, black_team_id) tuples.
+    """
+    return list(iter_round_robin_rounds(team_ids, double))
@@ -0,0 +1,295 @@
+"""
+Tournament export and import.
+
+An export is a stream of JSON lines: a tournament header, then the rows of
+teams, players, rounds, matches, games and rating history, parents before
+children. Rows are read with ``yield_per`` (a server-side cursor where the
+driver has one) and written out batch by batch, so memory stays flat however
+large the tournament is.
+
+Two encodings share the same line protocol and can be gzip-compressed:
+  ndjson    one row per line:       {"table": "games", "id": 1, ...}
+  columnar  one batch per line:     {"table": "games", "columns": {"id": [...], ...}}
+
+Import spools the upload to a temporary file first, then reads it in batches
+with executemany INSERTs, remapping every id to the ones the target database
+assigns.
+"""
+
+import gzip
+import json
+import tempfile
+import zlib
+from datetime import datetime
+from typing import IO, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, insert, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .database import ReadSessionLocal, SessionLocal
+from .models import Game, Match, Player, RatingHistory, Round, Team, Tournament
+from .tournament_logic import bulk_insert_ids
+
+FORMAT_VERSION = 1
+BATCH_SIZE = 1000
+SPOOL_MEMORY = 8 * 2 ** 20  # uploads larger than this are spooled to disk
+
+# Export order; every table only references tables before it (except team captains)
+TABLES = [
+    ("teams", Team),
+    ("players", Player),
+    ("rounds", Round),
+    ("matches", Match),
+    ("games", Game),
+    ("rating_history", RatingHistory),
+]
+MODELS = {"tournament": Tournament, **dict(TABLES)}
+
+# Foreign keys to remap on import: column -> table whose ids it holds
+FOREIGN_KEYS = {
+    "teams": {"tournament_id": "tournament"},
+    "players": {"team_id": "teams"},
+    "rounds": {"tournament_id": "tournament"},
+    "matches": {"tournament_id": "tournament", "round_id": "rounds",
+                "white_team_id": "teams", "black_team_id": "teams"},
+    "games": {"match_id": "matches", "white_player_id": "players", "black_player_id": "players"},
+    "rating_history": {"player_id": "players", "tournament_id": "tournament", "round_id": "rounds"},
+}
+
+
+class TransferError(ValueError):
+    """The uploaded stream is not a tournament export this version can read."""
+
+
+def _queries(tournament_id: int):
+    yield "tournament", select(Tournament.__table__).where(Tournament.id == tournament_id)
+    team_ids = select(Team.id).where(Team.tournament_id == tournament_id)
+    match_ids = select(Match.id).where(Match.tournament_id == tournament_id)
+    yield "teams", select(Team.__table__).where(Team.tournament_id == tournament_id).order_by(Team.id)
+    yield "players", select(Player.__table__).where(Player.team_id.in_(team_ids)).order_by(Player.id)
+    yield "rounds", select(Round.__table__).where(Round.tournament_id == tournament_id).order_by(Round.id)
+    yield "matches", select(Match.__table__).where(Match.tournament_id == tournament_id).order_by(Match.id)
+    yield "games", select(Game.__table__).where(Game.match_id.in_(match_ids)).order_by(Game.id)
+    yield "rating_history", (
+        select(RatingHistory.__table__)
+        .where(RatingHistory.tournament_id == tournament_id)
+        .order_by(RatingHistory.id)
+    )
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), default=_encode).encode() + b"\n"
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def export_lines(db: Session, tournament_id: int, columnar: bool = False) -> Iterator[bytes]:
+    """Yield the export of one tournament as JSON lines."""
+    for table, query in _queries(tournament_id):
+        result = db.execute(query.execution_options(yield_per=BATCH_SIZE))
+        for batch in result.partitions():
+            rows = [row._asdict() for row in batch]
+            if table == "tournament":
+                yield _json({"table": table, "format_version": FORMAT_VERSION, **rows[0]})
+            elif columnar:
+                yield _json({"table": table, "columns": {k: [r[k] for r in rows] for k in rows[0]}})
+            else:
+                for row in rows:
+                    yield _json({"table": table, **row})
+
+
+def gzip_stream(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream incrementally into one gzip member."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for line in lines:
+        chunk = compressor.compress(line)
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+class TournamentImporter:
+    """
+    Insert an export into ``db`` batch by batch. Feed it parsed lines with
+    ``add`` and call ``finish``; the caller commits.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.tournament: Optional[Tournament] = None
+        self.ids: Dict[str, Dict[int, int]] = {table: {} for table in FOREIGN_KEYS}
+        self.captains: Dict[int, int] = {}  # old team id -> old captain player id
+        self.pending: Dict[str, List[dict]] = {table: [] for table, _ in TABLES}
+        self.counts: Dict[str, int] = {table: 0 for table, _ in TABLES}
+        self._order = [table for table, _ in TABLES]
+        self._current = 0
+
+    def add(self, line: dict) -> None:
+        table = line.pop("table", None)
+        if table == "tournament":
+            self._start(line)
+            return
+        if self.tournament is None:
+            raise TransferError("Export must start with the tournament")
+        if table not in self.pending:
+            raise TransferError(f"Unknown table '{table}'")
+
+        # Parents are flushed before the first row of a child table arrives
+        position = self._order.index(table)
+        if position < self._current:
+            raise TransferError(f"'{table}' rows must come before '{self._order[self._current]}' rows")
+        while self._current < position:
+            self._flush(self._order[self._current])
+            self._current += 1
+
+        if "columns" in line:
+            columns = line["columns"]
+            names = list(columns)
+            rows = [dict(zip(names, values)) for values in zip(*(columns[n] for n in names))]
+        else:
+            rows = [line]
+        self.pending[table].extend(rows)
+        if len(self.pending[table]) >= BATCH_SIZE:
+            self._flush(table)
+
+    def _start(self, row: dict) -> None:
+        if self.tournament is not None:
+            raise TransferError("Export contains more than one tournament")
+        if row.pop("format_version", None) != FORMAT_VERSION:
+            raise TransferError(f"Unsupported export version; expected {FORMAT_VERSION}")
+        values = self._clean(Tournament, row)
+        values.pop("id", None)
+        self.tournament = Tournament(**values)
+        self.db.add(self.tournament)
+        self.db.flush()
+        self.ids["tournament"] = {row.get("id"): self.tournament.id}
+
+    def _clean(self, model, row: dict) -> dict:
+        """Known columns only, with datetimes parsed back."""
+        columns = model.__table__.columns
+        values = {k: v for k, v in row.items() if k in columns}
+        for name, value in values.items():
+            if value is not None and isinstance(columns[name].type, DateTime):
+                try:
+                    values[name] = datetime.fromisoformat(value)
+                except (TypeError, ValueError):
+                    raise TransferError(f"{model.__tablename__}.{name}: bad datetime {value!r}")
+        return values
+
+    def _flush(self, table: str) -> None:
+        rows = self.pending[table]
+        if not rows:
+            return
+        model = MODELS[table]
+        old_ids, prepared = [], []
+        for row in rows:
+            values = self._clean(model, row)
+            old_ids.append(values.pop("id", None))
+            for column, target in FOREIGN_KEYS[table].items():
+                if values.get(column) is not None:
+                    try:
+                        values[column] = self.ids[target][values[column]]
+                    except KeyError:
+                        raise TransferError(f"{table}.{column} refers to a missing {target} row {values[column]}")
+            if table == "teams" and values.get("captain_id") is not None:
+                self.captains[old_ids[-1]] = values.pop("captain_id")
+            prepared.append(values)
+
+        if table in self.ids:
+            self.ids[table].update(zip(old_ids, bulk_insert_ids(self.db, model, prepared)))
+        else:
+            self.db.execute(insert(model), prepared)
+        self.counts[table] += len(rows)
+        rows.clear()
+
+    def finish(self) -> Tournament:
+        if self.tournament is None:
+            raise TransferError("Empty export")
+        for table in self._order:
+            self._flush(table)
+
+        teams, players = self.ids["teams"], self.ids["players"]
+        captains = [
+            {"id": teams[team_id], "captain_id": players[player_id]}
+            for team_id, player_id in self.captains.items() if player_id in players
+        ]
+        if captains:
+            self.db.execute(update(Team), captains)
+        schedule = self.tournament.schedule
+        if schedule and schedule.get("seeds"):
+            self.tournament.schedule = {**schedule, "seeds": [teams.get(t) for t in schedule["seeds"]]}
+        return self.tournament
+
+
+def export_response(tournament_id: int, fmt: str = "ndjson", compress: bool = False) -> StreamingResponse:
+    """
+    Stream an export from its own read session, which lives as long as the
+    response body rather than the request handler.
+    """
+    def body():
+        db = ReadSessionLocal()
+        try:
+            yield from export_lines(db, tournament_id, columnar=fmt == "columnar")
+        finally:
+            db.close()
+
+    filename = f"tournament-{tournament_id}.{fmt}" + (".gz" if compress else "")
+    return StreamingResponse(
+        gzip_stream(body()) if compress else body(),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def import_stream(chunks: AsyncIterator[bytes]) -> Tuple[int, Dict[str, int]]:
+    """
+    Import an uploaded export. The body is spooled to a temporary file as it
+    arrives, then parsed and inserted in one threadpool call with a single
+    commit, so the write lock is held for the inserts only and not for as long
+    as the client takes to upload. Returns the new tournament id and row counts.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY) as spool:
+        async for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+        return await run_in_threadpool(import_file, spool)
+
+
+def import_file(body: IO[bytes]) -> Tuple[int, Dict[str, int]]:
+    """Import an export, plain or gzip-compressed, from a binary file."""
+    compressed = body.read(2) == b"\x1f\x8b"
+    body.seek(0)
+    lines = gzip.GzipFile(fileobj=body, mode="rb") if compressed else body
+    db = SessionLocal()
+    try:
+        importer = TournamentImporter(db)
+        try:
+            for line in lines:
+                if line.strip():
+                    importer.add(_parse(line))
+        except (gzip.BadGzipFile, EOFError, zlib.error) as exc:
+            raise TransferError("Export is not a valid gzip stream") from exc
+        tour = importer.finish()
+        db.commit()
+        return tour.id, dict(importer.counts)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _parse(line: bytes) -> dict:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        raise TransferError("Export lines must be JSON objects")
+    if not isinstance(data, dict):
+        raise TransferError("Export lines must be JSON objects")
+    return data
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compare throughput of the same read endpoints served by sync handlers
+(threadpool + Session) and async handlers (AsyncSession) at growing
+client concurrency. Requests go through httpx's in-process ASGI transport.
+
+    python benchmarks/bench_async_vs_sync.py --clients 50 200 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="chess-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/bench.db"
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base, SessionLocal, async_engine, engine, get_async_db, get_db
+from app.models import Round
+from app.synthetic import tournament_data
+from app.tournament_logic import create_tournament_structure
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync/matches/{round_id}")
+def sync_matches(round_id: int, db: Session = Depends(get_db)):
+    return [m.id for m in crud.get_matches(db, round_id=round_id)]
+
+
+@bench_app.get("/async/matches/{round_id}")
+async def async_matches(round_id: int, db: AsyncSession = Depends(get_async_db)):
+    return [m.id for m in await db.run_sync(crud.get_matches, round_id=round_id)]
+
+
+async def drive(client: httpx.AsyncClient, url: str, clients: int, total: int) -> float:
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            res = await client.get(url)
+            res.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return total / (time.perf_counter() - start)
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'clients':>8} {'sync req/s':>11} {'async req/s':>12}")
+        for clients in args.clients:
+            sync_rps = await drive(client, f"/sync/matches/{args.round_id}", clients, args.requests)
+            async_rps = await drive(client, f"/async/matches/{args.round_id}", clients, args.requests)
+            print(f"{clients:>8} {sync_rps:>11.0f} {async_rps:>12.0f}")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--teams", type=int, default=40)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        create_tournament_structure(db, tournament_data(args.teams))
+        args.round_id = db.query(Round.id).filter(Round.round_number == 1).scalar()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
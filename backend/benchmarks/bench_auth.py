@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Measure the auth overhead of an admin request with the verified-token cache
+off (every request decodes and checks the JWT, as before the cache) and on.
+
+The "verify" rows time auth_utils.verify_token alone; the "request" rows time
+a whole POST /api/auth/verify through the ASGI app, which runs no SQL.
+
+    python benchmarks/bench_auth.py --requests 2000
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from fastapi.testclient import TestClient
+
+from app import auth_utils
+from app.auth_utils import TokenCache, create_token, verify_token
+from app.main import app
+
+
+def timed(fn, n: int):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    token = create_token("admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+
+    print(f"{'case':<10} {'cache':>6} {'median us':>10} {'p99 us':>8}")
+    for cached in (False, True):
+        auth_utils.token_cache = TokenCache(1024 if cached else 0)
+        cases = {
+            "verify": lambda: verify_token(token),
+            "request": lambda: client.post("/api/auth/verify", headers=headers),
+        }
+        for name, fn in cases.items():
+            fn()  # warm up (and fill the cache)
+            timings = sorted(timed(fn, args.requests))
+            print(f"{name:<10} {'on' if cached else 'off':>6} {statistics.median(timings) * 1e6:>10.1f} "
+                  f"{timings[int(len(timings) * 0.99)] * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Time crud.get_best_players on a synthetic tournament with every game played.
+
+    python benchmarks/bench_best_players.py --teams 200 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from common import temp_session
+from sqlalchemy import event, update
+
+from app import crud
+from app.models import Game
+from app.synthetic import tournament_data
+from app.tournament_logic import create_tournament_structure
+
+SCORES = [(1.0, 0.0, "white_win"), (0.0, 1.0, "black_win"), (0.5, 0.5, "draw")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        tournament_id = create_tournament_structure(db, tournament_data(args.teams, args.boards)).id
+        rng = random.Random(1)
+        game_ids = [row.id for row in db.query(Game.id)]
+        rows = []
+        for game_id in game_ids:
+            white, black, result = rng.choice(SCORES)
+            rows.append({"id": game_id, "white_score": white, "black_score": black,
+                         "result": result, "is_completed": True})
+        db.execute(update(Game), rows)
+        db.commit()
+
+        queries = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *a: queries.append(1))
+        timings = []
+        for _ in range(args.repeat):
+            queries.clear()
+            start = time.perf_counter()
+            leaders = crud.get_best_players(db, tournament_id)
+            timings.append(time.perf_counter() - start)
+
+    print(f"games={len(game_ids)} players={len(leaders)} queries/call={len(queries)}")
+    print(f"best={min(timings):.3f}s median={statistics.median(timings):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
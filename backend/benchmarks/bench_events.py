@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Measure SSE fan-out: how long one published event takes to reach every
+waiting subscriber of a tournament.
+
+    python benchmarks/bench_events.py --subscribers 100 1000 5000 --events 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from app.events import EventBroker
+
+
+async def run(num_subscribers: int, num_events: int):
+    broker = EventBroker()
+    delivered = []
+
+    async def subscriber():
+        seq = 0
+        while seq < num_events:
+            frames, seq = await broker.wait(1, seq, timeout=30)
+            delivered.append(time.perf_counter())
+
+    tasks = [asyncio.create_task(subscriber()) for _ in range(num_subscribers)]
+    await asyncio.sleep(0.05)
+
+    latencies = []
+    for n in range(num_events):
+        delivered.clear()
+        start = time.perf_counter()
+        broker.publish(1, [("board", {"match_id": n, "board_number": 1, "result": "draw"})])
+        while len(delivered) < num_subscribers:
+            await asyncio.sleep(0)
+        latencies.append(max(delivered) - start)
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'subscribers':>11} {'median ms':>10} {'worst ms':>9} {'us/subscriber':>14}")
+    for num_subscribers in args.subscribers:
+        latencies = asyncio.run(run(num_subscribers, args.events))
+        median = statistics.median(latencies)
+        print(f"{num_subscribers:>11} {median * 1e3:>10.2f} {max(latencies) * 1e3:>9.2f} "
+              f"{median / num_subscribers * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
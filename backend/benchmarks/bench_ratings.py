@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Time one rating period (a round) for large batches of games, vectorized Elo
+and Glicko-2 against a per-game Python Elo loop.
+
+    python benchmarks/bench_ratings.py --games 1000 10000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from app.ratings import ELO_K_FACTOR, elo_update, glicko2_update
+
+
+def python_elo(ratings, white, black, white_score, k=ELO_K_FACTOR):
+    new = list(ratings)
+    for w, b, s in zip(white, black, white_score):
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[b] - ratings[w]) / 400.0))
+        new[w] += k * (s - expected)
+        new[b] -= k * (s - expected)
+    return new
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'games':>7} {'players':>8} {'loop Elo ms':>12} {'Elo ms':>7} {'Glicko-2 ms':>12}")
+    for num_games in args.games:
+        rng = np.random.default_rng(num_games)
+        players = 2 * num_games  # one game per player, as in a round
+        order = rng.permutation(players)
+        white, black = order[:num_games], order[num_games:]
+        white_score = rng.choice([0.0, 0.5, 1.0], size=num_games)
+        ratings = rng.normal(1600, 200, size=players)
+        deviations = rng.uniform(40, 350, size=players)
+        volatilities = np.full(players, 0.06)
+
+        start = time.perf_counter()
+        expected = python_elo(ratings.tolist(), white.tolist(), black.tolist(), white_score.tolist())
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = elo_update(ratings, white, black, white_score)
+        elo = time.perf_counter() - start
+        assert np.allclose(new, expected)
+
+        start = time.perf_counter()
+        glicko2_update(ratings, deviations, volatilities, white, black, white_score)
+        glicko = time.perf_counter() - start
+
+        print(f"{num_games:>7} {players:>8} {loop * 1e3:>12.1f} {elo * 1e3:>7.2f} {glicko * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Time round-robin schedule generation (Berger tables) for large fields.
+
+    python benchmarks/bench_round_robin.py --teams 100 500 1000 2000 --double
+"""
+
+import argparse
+import time
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from app.tournament_logic import berger_round, iter_round_robin_rounds, round_robin_round_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    parser.add_argument("--double", action="store_true", help="double round-robin")
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'rounds':>7} {'pairings':>10} {'total s':>8} {'us/round':>9} {'one round ms':>13}")
+    for num_teams in args.teams:
+        team_ids = list(range(1, num_teams + 1))
+        rounds = round_robin_round_count(num_teams, args.double)
+
+        start = time.perf_counter()
+        pairings = sum(len(r) for r in iter_round_robin_rounds(team_ids, args.double))
+        total = time.perf_counter() - start
+
+        # Random access to a single round, as used when a round is opened
+        start = time.perf_counter()
+        berger_round(team_ids, rounds // 2 + 1, args.double)
+        single = time.perf_counter() - start
+
+        print(f"{num_teams:>6} {rounds:>7} {pairings:>10} {total:>8.2f} "
+              f"{total / rounds * 1e6:>9.0f} {single * 1e3:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
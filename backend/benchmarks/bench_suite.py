@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the tournament_logic and crud hot paths across field sizes.
+
+Every case runs on a fresh copy of a synthetic tournament (app.synthetic)
+with --completion of its matches played, and reports its best and median
+time and the SQL statements per call. Write the results as JSON and compare
+two runs to spot regressions:
+
+    python benchmarks/bench_suite.py --sizes 10 50 100 -o before.json
+    python benchmarks/bench_suite.py --sizes 10 50 100 -o after.json --compare before.json
+
+With --compare the exit status is 1 when a case got slower than --threshold
+(and by more than 1 ms), or runs more statements than before.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from common import backend_dir, temp_session
+
+import sqlalchemy
+from sqlalchemy import event
+
+from app import crud, tournament_logic
+from app.api.matches import submit_board_result, submit_round_results
+from app.models import Game, Match, Round
+from app.schemas import GameSimpleResultUpdate, RoundResultsUpdate
+from app.synthetic import generate_tournament, random_result, tournament_data
+
+NOISE_FLOOR = 0.001  # seconds; smaller differences are not reported as regressions
+
+
+def _open_round(db, tournament_id: int) -> Optional[Round]:
+    return (
+        db.query(Round)
+        .filter(Round.tournament_id == tournament_id, Round.is_completed == False)
+        .order_by(Round.round_number)
+        .first()
+    )
+
+
+# Each case prepares its call on a fresh copy of the tournament and returns it,
+# or None when the tournament has nothing for it to do (e.g. no open round)
+
+def case_create(db, tournament_id: int, args) -> Callable:
+    data = tournament_data(args.teams, args.boards)
+    return lambda: tournament_logic.create_tournament_structure(db, data)
+
+
+def case_round_robin(db, tournament_id: int, args) -> Callable:
+    team_ids = list(range(1, args.teams + 1))
+    return lambda: tournament_logic.generate_all_round_robin_rounds(team_ids)
+
+
+def case_calculate_standings(db, tournament_id: int, args) -> Callable:
+    return lambda: tournament_logic.calculate_standings(db, tournament_id)
+
+
+def case_get_standings(db, tournament_id: int, args) -> Callable:
+    return lambda: tournament_logic.get_standings(db, tournament_id)
+
+
+def case_best_players(db, tournament_id: int, args) -> Callable:
+    return lambda: crud.get_best_players(db, tournament_id)
+
+
+def case_submit_board(db, tournament_id: int, args) -> Optional[Callable]:
+    rnd = _open_round(db, tournament_id)
+    if rnd is None:
+        return None
+    game = (
+        db.query(Game).join(Match, Match.id == Game.match_id)
+        .filter(Match.round_id == rnd.id, Game.is_completed == False)
+        .order_by(Game.id)
+        .first()
+    )
+    db.expunge_all()
+    update = GameSimpleResultUpdate(result="draw")
+    return lambda: submit_board_result(game.match_id, game.board_number, update, db=db, _=None)
+
+
+def case_submit_round(db, tournament_id: int, args) -> Optional[Callable]:
+    """Every board of the open round in one request; completing it rates the round and opens the next."""
+    rnd = _open_round(db, tournament_id)
+    if rnd is None:
+        return None
+    rng = random.Random(args.seed)
+    boards = (
+        db.query(Game.match_id, Game.board_number)
+        .join(Match, Match.id == Game.match_id)
+        .filter(Match.round_id == rnd.id)
+        .order_by(Game.match_id, Game.board_number)
+    )
+    payload = RoundResultsUpdate(results=[
+        {"match_id": match_id, "board_number": board, "result": random_result(rng, 0, 0)}
+        for match_id, board in boards
+    ])
+    round_id = rnd.id
+    db.expunge_all()
+    return lambda: submit_round_results(round_id, payload, db=db, _=None)
+
+
+CASES: Dict[str, Callable] = {
+    "create_tournament_structure": case_create,
+    "generate_all_round_robin_rounds": case_round_robin,
+    "calculate_standings": case_calculate_standings,
+    "get_standings": case_get_standings,
+    "get_best_players": case_best_players,
+    "submit_board_result": case_submit_board,
+    "submit_round_results": case_submit_round,
+}
+
+
+def run_case(setup: Callable, template: str, tournament_id: int, args) -> Optional[dict]:
+    timings, queries = [], 0
+    for _ in range(args.repeat):
+        with temp_session(template) as db:
+            call = setup(db, tournament_id, args)
+            if call is None:
+                return None
+            statements = []
+
+            def count(*_):
+                statements.append(1)
+
+            engine = db.get_bind()
+            event.listen(engine, "before_cursor_execute", count)
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+            event.remove(engine, "before_cursor_execute", count)
+            queries = len(statements)
+    return {"best": min(timings), "median": statistics.median(timings), "queries": queries}
+
+
+def _git(*cmd: str) -> str:
+    try:
+        return subprocess.run(["git", *cmd], cwd=backend_dir, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = {(r["case"], r["teams"]): r for r in json.load(f)["results"]}
+    print(f"\nAgainst {baseline_path} ({threshold:.0%} threshold):")
+    print(f"{'case':<32} {'teams':>6} {'before ms':>10} {'after ms':>9} {'change':>8} {'queries':>9}")
+    regressions = 0
+    for r in results:
+        old = baseline.get((r["case"], r["teams"]))
+        if old is None:
+            continue
+        change = r["median"] / old["median"] - 1 if old["median"] else 0.0
+        slower = change > threshold and r["median"] - old["median"] > NOISE_FLOOR
+        more_queries = r["queries"] > old["queries"]
+        flag = "  REGRESSION" if slower or more_queries else ""
+        regressions += bool(flag)
+        print(f"{r['case']:<32} {r['teams']:>6} {old['median'] * 1e3:>10.2f} {r['median'] * 1e3:>9.2f} "
+              f"{change:>+8.0%} {old['queries']:>4}->{r['queries']:<4}{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="teams per tournament")
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--completion", type=float, default=0.5, help="share of the matches played, 0 to 1")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="run only these cases")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown reported as a regression")
+    args = parser.parse_args()
+    cases = {name: CASES[name] for name in (args.cases or CASES)}
+
+    results = []
+    print(f"{'case':<32} {'teams':>6} {'best ms':>9} {'median ms':>10} {'queries':>8}")
+    for teams in args.sizes:
+        args.teams = teams
+        with temp_session() as base:
+            tournament_id = generate_tournament(
+                base, teams, args.boards, completion=args.completion, seed=args.seed
+            ).id
+            template = base.get_bind().url.database
+            base.close()
+            for name, setup in cases.items():
+                timing = run_case(setup, template, tournament_id, args)
+                if timing is None:
+                    print(f"{name:<32} {teams:>6}   skipped (nothing to do at this completion)")
+                    continue
+                results.append({"case": name, "teams": teams, **timing})
+                print(f"{name:<32} {teams:>6} {timing['best'] * 1e3:>9.2f} {timing['median'] * 1e3:>10.2f} "
+                      f"{timing['queries']:>8}")
+
+    report = {
+        "meta": {
+            "commit": _git("rev-parse", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sizes": args.sizes,
+            "boards": args.boards,
+            "completion": args.completion,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        sys.exit(compare(results, args.compare, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Time Swiss pairing per round for large fields, with random results between rounds.
+
+    python benchmarks/bench_swiss_pairing.py --teams 200 1000 5000 --rounds 9
+"""
+
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from app.pairing import SwissTeam, pair_swiss_round
+
+RESULTS = [(2, 0), (0, 2), (1, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[200, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=9)
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'rounds':>7} {'mean ms':>8} {'worst ms':>9} {'repeats':>8}")
+    for num_teams in args.teams:
+        rng = random.Random(num_teams)
+        teams = {i: SwissTeam(id=i, seed=i) for i in range(num_teams)}
+        timings, repeats = [], 0
+        for round_number in range(1, args.rounds + 1):
+            start = time.perf_counter()
+            pairings, bye = pair_swiss_round(list(teams.values()), round_number)
+            timings.append(time.perf_counter() - start)
+            if bye is not None:
+                teams[bye].byes += 1
+            for white, black in pairings:
+                repeats += black in teams[white].opponents
+                teams[white].opponents.add(black)
+                teams[black].opponents.add(white)
+                teams[white].colors.append("W")
+                teams[black].colors.append("B")
+                white_mp, black_mp = rng.choice(RESULTS)
+                teams[white].score += white_mp
+                teams[black].score += black_mp
+        mean_ms = 1000 * sum(timings) / len(timings)
+        print(f"{num_teams:>6} {args.rounds:>7} {mean_ms:>8.1f} {1000 * max(timings):>9.1f} {repeats:>8}")
+
+
+if __name__ == "__main__":
+    main()
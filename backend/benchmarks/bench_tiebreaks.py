@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Time the vectorized tiebreak engine against the per-match Python loop it
+replaced, on synthetic results (random pairings and results each round).
+
+    python benchmarks/bench_tiebreaks.py --teams 500 2000 5000 --rounds 11
+"""
+
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the backend on sys.path)
+
+from app.tiebreaks import MATCH_POINTS, TIEBREAKS, Results
+
+RESULTS = list(MATCH_POINTS)
+
+
+def synthetic_rows(num_teams, rounds, rng):
+    rows = []
+    for _ in range(rounds):
+        order = list(range(num_teams))
+        rng.shuffle(order)
+        for white, black in zip(order[::2], order[1::2]):
+            result = rng.choice(RESULTS)
+            white_gp = rng.choice([2.5, 3, 4]) if result == "white_win" else 2 if result == "draw" else 1
+            rows.append((white, black, result, white_gp, 4 - white_gp))
+    return rows
+
+
+def python_sonneborn_berger(num_teams, rows):
+    """The loop calculate_standings used before the engine."""
+    match_points = [0.0] * num_teams
+    for white, black, result, _, _ in rows:
+        white_mp, black_mp = MATCH_POINTS[result]
+        match_points[white] += white_mp
+        match_points[black] += black_mp
+    sb = [0.0] * num_teams
+    for white, black, result, _, _ in rows:
+        if result == "white_win":
+            sb[white] += match_points[black]
+        elif result == "black_win":
+            sb[black] += match_points[white]
+        else:
+            sb[white] += match_points[black] / 2
+            sb[black] += match_points[white] / 2
+    return sb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--rounds", type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'matches':>8} {'build ms':>9} {'SB loop ms':>11} {'SB ms':>7} {'all 7 ms':>9}")
+    for num_teams in args.teams:
+        rows = synthetic_rows(num_teams, args.rounds, random.Random(num_teams))
+
+        start = time.perf_counter()
+        results = Results.from_rows(range(num_teams), rows)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = python_sonneborn_berger(num_teams, rows)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sb = results.tiebreak("sonneborn_berger", results.match_points)
+        vectorized = time.perf_counter() - start
+        assert sb.tolist() == expected
+
+        start = time.perf_counter()
+        results.rank(TIEBREAKS)
+        full = time.perf_counter() - start
+
+        print(f"{num_teams:>6} {len(rows):>8} {build * 1e3:>9.1f} {loop * 1e3:>11.1f} "
+              f"{vectorized * 1e3:>7.1f} {full * 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
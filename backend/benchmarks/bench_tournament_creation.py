@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Time create_tournament_structure for growing field sizes.
+
+    python benchmarks/bench_tournament_creation.py --teams 10 50 200 --boards 8
+"""
+
+import argparse
+
+from common import temp_session, timer
+
+from app.models import Game, Match
+from app.synthetic import tournament_data
+from app.tournament_logic import create_tournament_structure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--boards", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'rounds':>7} {'matches':>8} {'games':>8} {'seconds':>8}")
+    for num_teams in args.teams:
+        with temp_session() as db:
+            results = {}
+            with timer(results, "create"):
+                tour = create_tournament_structure(db, tournament_data(num_teams, args.boards))
+            matches = db.query(Match).count()
+            games = db.query(Game).count()
+            print(f"{num_teams:>6} {tour.total_rounds:>7} {matches:>8} {games:>8} {results['create']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Load test of the last hour of an event: arbiters posting board results while
+spectators poll standings, the leaderboard and the round's matches.
+
+The harness generates a tournament with --completion of its matches played,
+starts uvicorn on it, and runs --writers arbiters and --readers spectators
+against http://127.0.0.1 for --duration seconds. Arbiters post
+/api/matches/{id}/board/{n}/result for the open round's boards (rounds roll
+over as they complete). Spectators poll the --mix of endpoints with their
+last ETag, as browsers do. It reports, per endpoint, throughput,
+p50/p95/p99 latency, error responses and "database is locked" errors
+(answered 503 by the app). Afterwards it checks that every match's and
+round's stored counters agree with its games, and exits 1 if any do not.
+
+    python benchmarks/bench_tournament_day.py --teams 40 --writers 20 --readers 200 --duration 30
+    python benchmarks/bench_tournament_day.py --profile production --workers 2 -o day.json
+
+Server-side SQL per route is on the server's /metrics while it runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from common import backend_dir
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.synthetic import generate_tournament
+
+ADMIN_USERNAME, ADMIN_PASSWORD = "arbiter", "load-test"
+READ_ENDPOINTS = ("standings", "best-players", "matches")
+
+
+class Endpoint:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.locked = 0
+        self.failures: Counter = Counter()   # no response, by exception: timeouts, dropped connections
+
+    def summary(self, duration: float) -> dict:
+        ok = sum(n for status, n in self.statuses.items() if status < 400)
+        lat = sorted(self.latencies)
+        pct = statistics.quantiles(lat, n=100, method="inclusive") if len(lat) > 1 else lat * 99
+        return {
+            "requests": len(lat) + sum(self.failures.values()),
+            "per_second": len(lat) / duration,
+            "p50_ms": pct[49] * 1e3 if pct else None,
+            "p95_ms": pct[94] * 1e3 if pct else None,
+            "p99_ms": pct[98] * 1e3 if pct else None,
+            "ok": ok,
+            "errors": len(lat) - ok + sum(self.failures.values()),
+            "locked": self.locked,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "failures": dict(self.failures),
+        }
+
+
+class Schedule:
+    """
+    The open round and its boards not yet handed to an arbiter, read straight
+    from the database file (read-only) so the harness stays out of the
+    server's request counts.
+    """
+
+    def __init__(self, db_path: str, tournament_id: int):
+        self.db_path = db_path
+        self.tournament_id = tournament_id
+        self.round_id: Optional[int] = None
+        self.boards: List[Tuple[int, int]] = []
+        self.refresh()
+
+    def refresh(self) -> None:
+        with sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30) as conn:
+            row = conn.execute(
+                "SELECT id FROM rounds WHERE tournament_id = ? AND is_completed = 0 ORDER BY round_number LIMIT 1",
+                (self.tournament_id,),
+            ).fetchone()
+            if row is None:
+                # Everything is played: keep arbiters busy with corrections to the last round
+                row = conn.execute(
+                    "SELECT id FROM rounds WHERE tournament_id = ? ORDER BY round_number DESC LIMIT 1",
+                    (self.tournament_id,),
+                ).fetchone()
+                pending = ""
+            else:
+                pending = "AND g.is_completed = 0"
+            self.round_id = row[0]
+            query = ("SELECT g.match_id, g.board_number FROM games g JOIN matches m ON m.id = g.match_id "
+                     "WHERE m.round_id = ? {} ORDER BY g.id")
+            self.boards = conn.execute(query.format(pending), (self.round_id,)).fetchall()
+            if not self.boards:
+                # The last boards were handed out but not stored yet (or failed): correct the round meanwhile
+                self.boards = conn.execute(query.format(""), (self.round_id,)).fetchall()
+        random.shuffle(self.boards)
+
+    def next_board(self) -> Tuple[int, int]:
+        if not self.boards:
+            self.refresh()
+        return self.boards.pop()
+
+
+def counter_mismatches(db_path: str, tournament_id: int) -> List[str]:
+    """
+    Matches and rounds whose maintained counters disagree with their games:
+    what lost updates between concurrent result posts would leave behind.
+    """
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30) as conn:
+        matches = conn.execute(
+            "SELECT m.id, m.completed_boards, SUM(g.is_completed), m.white_score, SUM(g.white_score), "
+            "m.black_score, SUM(g.black_score) FROM matches m JOIN games g ON g.match_id = m.id "
+            "WHERE m.tournament_id = ? GROUP BY m.id",
+            (tournament_id,),
+        ).fetchall()
+        rounds = conn.execute(
+            "SELECT r.id, r.completed_matches, COUNT(m.id) FROM rounds r "
+            "LEFT JOIN matches m ON m.round_id = r.id AND m.is_completed = 1 "
+            "WHERE r.tournament_id = ? GROUP BY r.id",
+            (tournament_id,),
+        ).fetchall()
+    problems = []
+    for match_id, boards, games, white, games_white, black, games_black in matches:
+        if boards != games or abs(white - games_white) > 1e-9 or abs(black - games_black) > 1e-9:
+            problems.append(f"match {match_id}: {boards} boards {white}-{black} stored, "
+                            f"{games} boards {games_white}-{games_black} in its games")
+    for round_id, stored, counted in rounds:
+        if stored != counted:
+            problems.append(f"round {round_id}: {stored} completed matches stored, {counted} counted")
+    return problems
+
+
+async def arbiter(client, schedule: Schedule, stats: Dict[str, Endpoint], token: str, args, stop: float):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < stop:
+        match_id, board = schedule.next_board()
+        result = random.choice(("white_win", "black_win", "draw"))
+        await _request(client, stats["board result"], "POST", f"/api/matches/{match_id}/board/{board}/result",
+                       headers=headers, json={"result": result})
+        await _think(args.writer_interval)
+
+
+async def spectator(client, schedule: Schedule, stats: Dict[str, Endpoint], mix: List[str], args, stop: float):
+    etags: Dict[str, str] = {}
+    tid = schedule.tournament_id
+    while time.perf_counter() < stop:
+        endpoint = random.choice(mix)
+        url = {
+            "standings": f"/api/tournaments/{tid}/standings",
+            "best-players": f"/api/tournaments/{tid}/best-players?limit=20",
+            "matches": f"/api/matches/{schedule.round_id}",
+        }[endpoint]
+        headers = {"If-None-Match": etags[url]} if args.etag and url in etags else {}
+        res = await _request(client, stats[endpoint], "GET", url, headers=headers)
+        if res is not None and "etag" in res.headers:
+            etags[url] = res.headers["etag"]
+        await _think(args.reader_interval)
+
+
+async def _request(client, endpoint: Endpoint, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    try:
+        res = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as exc:
+        endpoint.failures[type(exc).__name__] += 1
+        return None
+    endpoint.latencies.append(time.perf_counter() - start)
+    endpoint.statuses[res.status_code] += 1
+    if res.status_code == 503 or (res.status_code >= 500 and "locked" in res.text):
+        endpoint.locked += 1
+    return res
+
+
+async def _think(interval: float) -> None:
+    # Jittered so clients do not fall into lockstep
+    if interval > 0:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * interval)
+
+
+async def run_load(base_url: str, schedule: Schedule, args) -> Tuple[Dict[str, Endpoint], float]:
+    mix = [name for name, weight in args.mix.items() for _ in range(weight)]
+    stats = {name: Endpoint() for name in ("board result", *READ_ENDPOINTS)}
+    # Idle connections expire before uvicorn's 5 s keep-alive closes them under a request
+    limits = httpx.Limits(max_connections=args.writers + args.readers, keepalive_expiry=2.0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        res = await client.post("/api/auth/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+        res.raise_for_status()
+        token = res.json()["token"]
+        start = time.perf_counter()
+        stop = start + args.duration
+        await asyncio.gather(
+            *(arbiter(client, schedule, stats, token, args, stop) for _ in range(args.writers)),
+            *(spectator(client, schedule, stats, mix, args, stop) for _ in range(args.readers)),
+        )
+        return stats, time.perf_counter() - start
+
+
+def start_server(db_path: str, log_path: str, args) -> Tuple[subprocess.Popen, str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DB_PROFILE": args.profile,
+        "ALLOWED_HOSTS": "127.0.0.1,localhost",
+        "ADMIN_USERNAME": ADMIN_USERNAME,
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "DEBUG": "false",
+    }
+    env.pop("ASYNC_DATABASE_URL", None)
+    log = open(log_path, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            break
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    with open(log_path) as f:
+        sys.exit(f"Server did not start:\n{f.read()[-4000:]}")
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in READ_ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}; choose from {', '.join(READ_ENDPOINTS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--boards", type=int, default=6)
+    parser.add_argument("--completion", type=float, default=0.85, help="share of the event already played")
+    parser.add_argument("--writers", type=int, default=20, help="arbiters posting board results")
+    parser.add_argument("--readers", type=int, default=200, help="spectators polling")
+    parser.add_argument("--writer-interval", type=float, default=0.5, help="seconds between an arbiter's posts")
+    parser.add_argument("--reader-interval", type=float, default=1.0, help="seconds between a spectator's polls")
+    parser.add_argument("--mix", type=parse_mix, default="standings=3,best-players=1,matches=2",
+                        help="spectator endpoint weights")
+    parser.add_argument("--no-etag", dest="etag", action="store_false", help="spectators ignore ETags")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout, seconds")
+    parser.add_argument("--profile", choices=["default", "production"], default="default",
+                        help="the server's DB_PROFILE")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write the report to this JSON file")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="chess-day-") as tmp:
+        db_path = f"{tmp}/day.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            tour = generate_tournament(db, args.teams, args.boards, completion=args.completion, seed=args.seed)
+            tournament_id, total_rounds = tour.id, tour.total_rounds
+        engine.dispose()
+        schedule = Schedule(db_path, tournament_id)
+        first_round = schedule.round_id
+
+        server, base_url = start_server(db_path, f"{tmp}/server.log", args)
+        try:
+            stats, duration = asyncio.run(run_load(base_url, schedule, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+        schedule.refresh()
+        rounds_played = schedule.round_id - first_round
+        mismatches = counter_mismatches(db_path, tournament_id)
+
+    report = {
+        "settings": {k: v for k, v in vars(args).items() if k != "output"},
+        "duration": duration,
+        "rounds_completed": rounds_played,
+        "total_rounds": total_rounds,
+        "endpoints": {name: endpoint.summary(duration) for name, endpoint in stats.items()},
+        "counter_mismatches": mismatches,
+    }
+    print(f"{args.writers} arbiters, {args.readers} spectators, {duration:.0f}s, profile={args.profile}, "
+          f"workers={args.workers}; {rounds_played} round(s) completed during the run")
+    print(f"{'endpoint':<14} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'errors':>7} {'locked':>7}")
+    for name, s in report["endpoints"].items():
+        if not s["requests"]:
+            continue
+        print(f"{name:<14} {s['requests']:>9} {s['per_second']:>8.1f} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+              f"{s['p99_ms']:>8.1f} {s['errors']:>7} {s['locked']:>7}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if mismatches:
+        print(f"\n{len(mismatches)} counter(s) disagree with the games:", *mismatches[:20], sep="\n  ")
+        sys.exit(1)
+    print("\nMatch and round counters agree with the games")
+
+
+if __name__ == "__main__":
+    main()
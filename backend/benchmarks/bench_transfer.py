@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Time a full tournament export and re-import (every round opened), with the
+peak Python memory of each, per format.
+
+    python benchmarks/bench_transfer.py --teams 50 200
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from common import temp_session
+
+from app.synthetic import tournament_data
+from app.tournament_logic import create_tournament_structure, open_round
+from app.transfer import TournamentImporter, export_lines, gzip_stream
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[50, 200])
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'games':>7} {'format':>12} {'MB out':>7} {'export s':>9} {'peak MB':>8} "
+          f"{'import s':>9} {'peak MB':>8}")
+    for num_teams in args.teams:
+        with temp_session() as db:
+            tour = create_tournament_structure(db, tournament_data(num_teams))
+            while open_round(db, tour) is not None:
+                pass
+            db.commit()
+
+            for fmt, compress in (("ndjson", False), ("columnar", False), ("columnar", True)):
+                def export():
+                    lines = export_lines(db, tour.id, columnar=fmt == "columnar")
+                    # Keep only the size, as a client writing to disk would
+                    return sum(len(chunk) for chunk in (gzip_stream(lines) if compress else lines))
+                size, export_s, export_peak = measure(export)
+
+                payload = b"".join(export_lines(db, tour.id, columnar=fmt == "columnar"))
+
+                def import_():
+                    importer = TournamentImporter(db)
+                    for line in payload.splitlines():
+                        importer.add(json.loads(line))
+                    importer.finish()
+                    db.rollback()  # keep the database at one tournament
+                    return importer.counts["games"]
+                games, import_s, import_peak = measure(import_)
+
+                label = fmt + ("+gzip" if compress else "")
+                print(f"{num_teams:>6} {games:>7} {label:>12} {size / 2 ** 20:>7.1f} {export_s:>9.2f} "
+                      f"{export_peak:>8.1f} {import_s:>9.2f} {import_peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
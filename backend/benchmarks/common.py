@@ -0,0 +1,46 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+
+
+@contextmanager
+def temp_session(template: Optional[str] = None):
+    """
+    Yield a session bound to a fresh SQLite file that is removed afterwards,
+    starting as a copy of the ``template`` database file when given.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if template:
+            shutil.copyfile(template, f"{tmp}/bench.db")
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+        try:
+            yield session
+        finally:
+            session.close()
+            engine.dispose()
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
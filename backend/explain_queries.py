@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Print SQLite EXPLAIN QUERY PLAN for the hot queries of the API.
+
+    python explain_queries.py            # plans against DATABASE_URL
+    python explain_queries.py --check    # exit 1 if a hot query scans a table
+
+A plan line starting with "SCAN <table>" (without an index) means a full
+table scan, which is what this script is meant to catch.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.resolve()
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import Game, Match, Player, Team, Tournament
+from app import crud
+
+HOT_QUERIES = {
+    "submit_board_result: game by match and board": select(Game).where(
+        Game.match_id == 1, Game.board_number == 1
+    ),
+    "get_matches: matches of a round": select(Match).where(Match.round_id == 1),
+    "matches by tournament and round number": select(Match).where(
+        Match.tournament_id == 1, Match.round_number == 1
+    ),
+    "swaps/rosters: players of a team by position": select(Player).where(
+        Player.team_id == 1
+    ).order_by(Player.position),
+    "standings: teams of a tournament": select(Team).where(Team.tournament_id == 1).order_by(Team.id),
+    "current tournament: latest created": select(Tournament).order_by(
+        Tournament.created_at.desc()
+    ).limit(1),
+    "standings delta: completed matches of two teams": select(Match).where(
+        Match.tournament_id == 1,
+        Match.is_completed == True,
+        Match.id != 1,
+        or_(Match.white_team_id.in_([1, 2]), Match.black_team_id.in_([1, 2])),
+    ),
+}
+
+
+def plan(conn, stmt):
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def is_full_scan(line: str) -> bool:
+    return line.startswith("SCAN ") and "USING" not in line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="fail when a hot query does a full table scan")
+    args = parser.parse_args()
+
+    queries = dict(HOT_QUERIES)
+    with Session(engine) as db:
+        queries["best players: leaderboard aggregate"] = crud.best_players_query(db, 1).statement
+        queries["player games: history page"] = crud.player_games_query(db, 1, after_id=1).limit(50).statement
+
+    regressions = []
+    with engine.connect() as conn:
+        for name, stmt in queries.items():
+            print(f"\n== {name}")
+            for line in plan(conn, stmt):
+                marker = "!!" if is_full_scan(line) else "  "
+                print(f"{marker} {line}")
+                if is_full_scan(line):
+                    regressions.append(name)
+
+    if regressions:
+        print(f"\n{len(regressions)} hot quer{'y' if len(regressions) == 1 else 'ies'} with full table scans:")
+        for name in regressions:
+            print(f"  - {name}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
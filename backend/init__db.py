@@ -2,13 +2,17 @@
 #!/usr/bin/env python3
 """
 Database initialization script with sample data.
+
+    python init__db.py                                  # 6 teams of 4, nothing played
+    python init__db.py --teams 40 --boards 6 --completion 0.5 --seed 1
+    python init__db.py --teams 64 --swiss --rounds 7 --completion 1
 """
 
+import argparse
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta ,UTC
 import os
-from app import schemas 
 
 backend_dir = Path(__file__).parent.resolve()
 app_dir = backend_dir / "app"
@@ -27,29 +31,42 @@ DATABASE_URL = raw_url.replace("sqlite+aiosqlite://", "sqlite://", 1)
 engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(bind=engine)
 
-from app.tournament_logic import create_tournament_structure
+from app.synthetic import generate_tournament
 from app.database import Base
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create the tables and a sample tournament.")
+    parser.add_argument("--teams", type=int, default=6)
+    parser.add_argument("--boards", type=int, default=4, help="players per team")
+    parser.add_argument("--completion", type=float, default=0.0,
+                        help="share of the matches to play with random results, 0 to 1")
+    parser.add_argument("--draw-rate", type=float, default=0.3)
+    parser.add_argument("--swiss", action="store_true", help="Swiss pairings instead of round-robin")
+    parser.add_argument("--rounds", type=int, help="Swiss only; defaults to ceil(log2(teams))")
+    parser.add_argument("--seed", type=int, help="same seed, same ratings and results")
+    parser.add_argument("--name", default="Sample Tournament")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     Base.metadata.create_all(bind=engine)
     print("✅ Tables created")
-    n=6  # Number of teams to create
     session = SessionLocal()
     try:
-        team_names = [f"Team {i+1}" for i in range(n)]
-        players_per_team = [4]*n
-        data = {
-            "name": "Sample Tournament",
+        options = {
+            "name": args.name,
             "description": "Auto-generated",
             "start_date": datetime.now(UTC),
             "end_date": datetime.now(UTC) + timedelta(days=1),
-            "team_names": team_names,
-            "players_per_team": players_per_team
         }
-        pydantic_data = schemas.TournamentCreate(**data)
-        tour = create_tournament_structure(session, pydantic_data)
-        session.commit()
-        print(f"Created tournament: {tour.name}")
+        if args.swiss:
+            options.update(pairing_system="swiss", total_rounds=args.rounds)
+        tour = generate_tournament(
+            session, args.teams, args.boards, completion=args.completion,
+            draw_rate=args.draw_rate, seed=args.seed, **options,
+        )
+        print(f"Created tournament: {tour.name} ({args.teams} teams, {tour.total_rounds} rounds, "
+              f"{args.completion:.0%} of the matches played)")
     except Exception as e:
         session.rollback()
         print(f"❌ Init failed: {e}")
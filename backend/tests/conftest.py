@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from typing import Callable
+
+# Point the app at a throwaway database before it is imported
+_tmp_dir = tempfile.mkdtemp(prefix="chess-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test.db"
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.database import DATABASE_URL, Base, engine
+from app.auth_utils import get_current_user
+from app.cache import result_cache
+from app import schemas
+from app.tournament_logic import create_tournament_structure
+
+
+# The tests' own session is a plain connection: the app's write engine opens
+# every transaction with BEGIN IMMEDIATE, so a test session on it would hold
+# the write lock between its reads and block the requests it makes
+test_engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+TestSession = sessionmaker(bind=test_engine, autoflush=False, autocommit=False)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    result_cache.clear()
+    session = TestSession()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def admin_client(db):
+    app.dependency_overrides[get_current_user] = lambda: {"user": "test"}
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def make_tournament(db, num_teams: int = 6, boards: int = 4):
+    data = schemas.TournamentCreate(
+        name=f"Test {num_teams} teams",
+        start_date=None,
+        team_names=[f"Team {i + 1}" for i in range(num_teams)],
+        players_per_team=[boards] * num_teams,
+    )
+    return create_tournament_structure(db, data)
+
+
+@contextmanager
+def count_queries(bind=Engine):
+    """
+    Collect every SQL statement executed on ``bind`` (any engine by default)
+    inside the block. The write engine's BEGIN IMMEDIATE is left out, like the
+    COMMIT the driver sends without a cursor.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement != "BEGIN IMMEDIATE":
+            statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def count_statements():
+    """Make one API call and return the response with the SQL statements it ran."""
+    def call(client, method: str, url: str, **kwargs):
+        with count_queries() as statements:
+            response = client.request(method, url, **kwargs)
+        return response, statements
+    return call
+
+
+def write_lock_free() -> bool:
+    """True when another connection can take the database's write lock right now."""
+    conn = sqlite3.connect(f"{_tmp_dir}/test.db", timeout=0.2)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def post_interrupted(url: str, body: bytes, during: Callable[[], None]) -> httpx.Response:
+    """
+    POST ``body`` to the app as a stream: half of it, then ``during()``, then
+    the rest. The TestClient reads a request body whole before calling the
+    app, so this goes through httpx's ASGI transport instead.
+    """
+    async def chunks():
+        yield body[:len(body) // 2]
+        during()
+        yield body[len(body) // 2:]
+
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.post(url, content=chunks())
+
+    return asyncio.run(post())
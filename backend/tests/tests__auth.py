@@ -0,0 +1,77 @@
+import time
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from app import auth_utils
+from app.auth_utils import TokenCache, create_token, token_cache
+from app.main import app
+
+
+@pytest.fixture
+def client(db):
+    token_cache.clear()
+    with TestClient(app) as client:
+        yield client
+    token_cache.clear()
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeated_requests_verify_the_signature_once(client, monkeypatch):
+    calls = []
+    decode = jwt.decode
+    monkeypatch.setattr(auth_utils.jwt, "decode", lambda *a, **kw: calls.append(1) or decode(*a, **kw))
+    token = create_token("admin")
+
+    for _ in range(3):
+        res = client.post("/api/auth/verify", headers=_bearer(token))
+        assert res.status_code == 200 and res.json()["user"] == "admin"
+    assert len(calls) == 1
+
+    res = client.post("/api/auth/verify", headers=_bearer(token + "x"))
+    assert res.status_code == 401 and res.json()["detail"] == "Invalid token"
+
+
+def test_logout_revokes_the_token(client):
+    token = create_token("admin")
+    client.post("/api/auth/verify", headers=_bearer(token))
+
+    assert client.post("/api/auth/logout", headers=_bearer(token)).json() == {"status": "logged out"}
+    res = client.post("/api/auth/verify", headers=_bearer(token))
+    assert res.status_code == 401 and res.json()["detail"] == "Token revoked"
+    assert client.post("/api/auth/logout", headers=_bearer(token)).status_code == 401
+    # Other tokens stay valid
+    assert client.post("/api/auth/verify", headers=_bearer(create_token("arbiter"))).status_code == 200
+
+
+def test_token_without_exp_is_verified_every_time_and_can_be_revoked(client):
+    token = jwt.encode({"sub": "admin"}, auth_utils.JWT_SECRET, algorithm=auth_utils.JWT_ALGORITHM)
+    for _ in range(2):
+        assert client.post("/api/auth/verify", headers=_bearer(token)).status_code == 200
+    assert token_cache.stats()["entries"] == 0
+
+    assert client.post("/api/auth/logout", headers=_bearer(token)).status_code == 200
+    res = client.post("/api/auth/verify", headers=_bearer(token))
+    assert res.status_code == 401 and res.json()["detail"] == "Token revoked"
+
+
+def test_cache_evicts_least_recently_used_and_expired_tokens():
+    cache = TokenCache(max_entries=2)
+    exp = time.time() + 60
+    cache.put("a", {"sub": "a", "exp": exp})
+    cache.put("b", {"sub": "b", "exp": exp})
+    cache.get("a")
+    cache.put("c", {"sub": "c", "exp": exp})
+    assert cache.get("b") is None and cache.get("a")["sub"] == "a"
+    assert cache.evictions == 1
+
+    cache.put("old", {"sub": "old", "exp": time.time() - 1})
+    assert cache.get("old") is None
+
+    disabled = TokenCache(max_entries=0)
+    disabled.put("a", {"sub": "a", "exp": exp})
+    assert disabled.get("a") is None
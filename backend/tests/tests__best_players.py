@@ -0,0 +1,52 @@
+import random
+from collections import defaultdict
+
+from app import crud
+from app.models import Game, Player
+
+from conftest import count_queries, make_tournament
+
+SCORES = [(1.0, 0.0, "white_win"), (0.0, 1.0, "black_win"), (0.5, 0.5, "draw")]
+
+
+def _play_games(db, fraction=0.6, seed=3):
+    rng = random.Random(seed)
+    for game in db.query(Game).all():
+        if rng.random() < fraction:
+            game.white_score, game.black_score, game.result = rng.choice(SCORES)
+            game.is_completed = True
+    db.commit()
+
+
+def test_best_players_runs_one_query_and_matches_games(db):
+    tournament_id = make_tournament(db, num_teams=6).id
+    _play_games(db)
+
+    expected = defaultdict(lambda: [0, 0.0])
+    for game in db.query(Game).filter(Game.is_completed == True):
+        expected[game.white_player_id][0] += 1
+        expected[game.white_player_id][1] += game.white_score
+        expected[game.black_player_id][0] += 1
+        expected[game.black_player_id][1] += game.black_score
+
+    with count_queries() as statements:
+        leaders = crud.get_best_players(db, tournament_id)
+    assert len(statements) == 1
+
+    assert {p.player_id: [p.games_played, p.points] for p in leaders} == dict(expected)
+    assert all(p.wins + p.draws + p.losses == p.games_played for p in leaders)
+    assert [p.points for p in leaders] == sorted((p.points for p in leaders), reverse=True)
+
+
+def test_best_players_filters(db):
+    tour = make_tournament(db, num_teams=6)
+    _play_games(db)
+    team_id = db.query(Player.team_id).first()[0]
+
+    assert len(crud.get_best_players(db, tour.id, limit=3)) == 3
+    team_rows = crud.get_best_players(db, tour.id, team_id=team_id)
+    assert team_rows and {p.player_id for p in team_rows} <= {
+        p.id for p in db.query(Player).filter(Player.team_id == team_id)
+    }
+    busy = crud.get_best_players(db, tour.id, min_games=4)
+    assert all(p.games_played >= 4 for p in busy)
@@ -0,0 +1,57 @@
+from app.cache import ResultCache, bump_version, result_cache
+from app.models import Team
+
+from conftest import make_tournament
+
+
+def test_unchanged_standings_poll_gets_304(db, admin_client):
+    tour = make_tournament(db, num_teams=4)
+    url = f"/api/tournaments/{tour.id}/standings"
+
+    first = admin_client.get(url)
+    etag = first.headers["etag"]
+    again = admin_client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    admin_client.post("/api/matches/1/board/1/result", json={"result": "white_win"})
+    changed = admin_client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_best_players_served_from_cache_until_bumped(db, admin_client):
+    tour = make_tournament(db, num_teams=4)
+    url = f"/api/tournaments/{tour.id}/best-players"
+
+    admin_client.get(url)
+    hits = result_cache.hits
+    assert admin_client.get(url).json()["tournament_id"] == tour.id
+    assert result_cache.hits == hits + 1
+
+    admin_client.put("/api/players/1", json={"name": "Renamed", "position": None})
+    admin_client.get(url)
+    assert result_cache.hits == hits + 1
+
+
+def test_write_by_another_worker_invalidates_this_cache(db, admin_client):
+    tour = make_tournament(db, num_teams=4)
+    url = f"/api/tournaments/{tour.id}/standings"
+    etag = admin_client.get(url).headers["etag"]
+
+    # Another process commits a rename; this process's cache never hears of it
+    db.query(Team).filter(Team.tournament_id == tour.id).first().name = "Renamed elsewhere"
+    bump_version(db, tour.id)
+    db.commit()
+
+    res = admin_client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert "Renamed elsewhere" in {row["team_name"] for row in res.json()["standings"]}
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResultCache(max_entries=2)
+    for tournament_id in (1, 2, 3):
+        cache.put(tournament_id, "standings", 0, b"{}")
+    assert cache.get(1, "standings", 0) is None
+    assert cache.get(3, "standings", 0) == b"{}"
+    assert cache.evictions == 1
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+
+from app.events import EventBroker, event_broker
+from app.main import app
+from app.models import Match
+
+from conftest import make_tournament
+
+
+def _parse(raw: bytes):
+    events = []
+    for block in raw.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["id"], fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _read_stream(path: str, headers=()):
+    """Run the SSE endpoint until its first body chunk, then disconnect."""
+    body, first_chunk = [], asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await first_chunk.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body" and message.get("body"):
+            body.append(message["body"])
+            first_chunk.set()
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"testserver"), *[(k.lower().encode(), v.encode()) for k, v in headers]],
+        "client": ("test", 1), "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return b"".join(body)
+
+
+def test_broker_resumes_from_last_event_id():
+    broker = EventBroker(buffer_size=3)
+    broker.publish(1, [("board", {"n": 1}), ("board", {"n": 2})])
+
+    assert broker.resume(1, None) == ([], 2)
+    frames, seq = broker.resume(1, f"{broker._epoch}:1")
+    assert seq == 2
+    assert [data for _, _, data in _parse(b"".join(frames))] == [{"n": 2}]
+
+    # Unknown epoch (server restarted) or events already dropped from the buffer
+    assert _parse(broker.resume(1, "deadbeef:1")[0][0])[0][1] == "reset"
+    broker.publish(1, [("board", {"n": n}) for n in range(3, 6)])
+    assert _parse(broker.resume(1, f"{broker._epoch}:1")[0][0])[0][1] == "reset"
+    assert len(broker.resume(1, f"{broker._epoch}:2")[0]) == 3
+
+
+def test_waiting_subscribers_wake_on_publish_from_another_thread():
+    broker = EventBroker()
+
+    async def main():
+        waiters = [asyncio.create_task(broker.wait(7, 0, timeout=5)) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        threading.Thread(target=broker.publish, args=(7, [("match", {"match_id": 1})])).start()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(main())
+    assert all(seq == 1 and len(frames) == 1 for frames, seq in results)
+    # Every subscriber gets the same serialized frame
+    assert len({frames[0] for frames, _ in results}) == 1
+
+
+def test_result_submission_streams_board_match_and_standings(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    _, seq = event_broker.resume(tournament_id, None)
+    match_id = db.query(Match.id).filter(Match.tournament_id == tournament_id).order_by(Match.id).first()[0]
+
+    res = admin_client.post(f"/api/matches/{match_id}/results", json={"results": [
+        {"board_number": board, "result": "white_win"} for board in range(1, 5)
+    ]})
+    assert res.status_code == 200
+
+    raw = asyncio.run(_read_stream(
+        f"/api/tournaments/{tournament_id}/events",
+        headers=[("Last-Event-ID", f"{event_broker._epoch}:{seq}")],
+    ))
+    events = _parse(raw)
+    kinds = [kind for _, kind, _ in events]
+    assert kinds == ["board"] * 4 + ["match", "standings"]
+    assert events[4][2]["is_completed"] and events[4][2]["result"] == "white_win"
+    assert {row["match_points"] for row in events[5][2]["rows"]} == {2.0, 0.0}
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app import crud
+from app.models import Round
+
+from conftest import count_queries, make_tournament
+
+
+def test_round_matches_load_in_two_queries(db, admin_client):
+    make_tournament(db, num_teams=12)
+    round_id = db.query(Round.id).filter(Round.round_number == 1).scalar()
+
+    with count_queries() as statements:
+        res = admin_client.get(f"/api/matches/{round_id}", params={"include_players": True})
+    assert res.status_code == 200
+    assert len(res.json()) == 6
+    assert len(statements) == 2
+    assert res.json()[0]["games"][0]["white_player_name"].startswith("Player 1 of")
+
+
+def test_other_relationships_raise_instead_of_lazy_loading(db):
+    make_tournament(db, num_teams=4)
+    match = crud.get_matches(db)[0]
+    assert len(match.games) == 4
+    assert match.games[0].white_player_name is None
+    with pytest.raises(InvalidRequestError):
+        match.round
+    with pytest.raises(InvalidRequestError):
+        match.games[0].white_player
+
+
+def test_cursor_pagination_walks_the_round(db, admin_client):
+    make_tournament(db, num_teams=10)
+    round_id = db.query(Round.id).filter(Round.round_number == 1).scalar()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        res = admin_client.get(f"/api/matches/{round_id}", params=params)
+        seen += [m["id"] for m in res.json()]
+        cursor = res.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == sorted(seen) and len(seen) == 5
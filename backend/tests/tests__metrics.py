@@ -0,0 +1,77 @@
+import logging
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import metrics as metrics_module
+from app import tournament_logic
+from app.metrics import metrics
+from app.models import Match
+
+from conftest import make_tournament
+
+STANDINGS = 'route="/api/tournaments/{tournament_id}/standings"'
+
+
+def _samples(text, name):
+    return {line.split(" ")[0]: float(line.split(" ")[1]) for line in text.splitlines()
+            if line.startswith(name)}
+
+
+def test_metrics_count_requests_and_queries_per_route(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    metrics.reset()
+    for _ in range(3):
+        admin_client.get(f"/api/tournaments/{tournament_id}/standings")
+    admin_client.get("/api/tournaments/999/standings")
+    admin_client.get("/no/such/page")
+
+    res = admin_client.get("/metrics")
+    assert res.status_code == 200 and res.headers["content-type"].startswith("text/plain")
+    text = res.text
+
+    requests = _samples(text, "http_requests_total")
+    assert requests[f'http_requests_total{{method="GET",{STANDINGS},status="200"}}'] == 3
+    assert requests[f'http_requests_total{{method="GET",{STANDINGS},status="404"}}'] == 1
+    # Paths without a route share one label
+    assert requests['http_requests_total{method="GET",route="<unmatched>",status="404"}'] == 1
+
+    histogram = _samples(text, "http_request_duration_seconds")
+    assert histogram[f'http_request_duration_seconds_count{{method="GET",{STANDINGS}}}'] == 4
+    assert histogram[f'http_request_duration_seconds_bucket{{method="GET",{STANDINGS},le="+Inf"}}'] == 4
+
+    # Standings are cached after the first request, so only two requests reached the database
+    queries = _samples(text, "http_request_db_queries_total")[f'http_request_db_queries_total{{method="GET",{STANDINGS}}}']
+    assert 2 <= queries <= 10
+    assert "result_cache_hits" in _samples(text, "result_cache_hits")
+
+
+def test_slow_requests_are_logged_with_their_statements(db, admin_client, monkeypatch, caplog):
+    tournament_id = make_tournament(db, num_teams=4).id
+    monkeypatch.setattr(metrics_module, "SLOW_REQUEST_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        admin_client.get(f"/api/tournaments/{tournament_id}/standings")
+    record = next(r for r in caplog.records if "standings" in r.getMessage())
+    assert "queries" in record.getMessage() and "SELECT" in record.getMessage()
+
+
+def test_locked_database_answers_503(db, admin_client, monkeypatch):
+    make_tournament(db, num_teams=2)
+    url = f"/api/matches/{db.query(Match.id).scalar()}/board/1/result"
+    metrics.reset()
+
+    def fail(message):
+        def record_board_results(*args, **kwargs):
+            raise OperationalError("UPDATE games ...", {}, sqlite3.OperationalError(message))
+        monkeypatch.setattr(tournament_logic, "record_board_results", record_board_results)
+
+    fail("database is locked")
+    res = admin_client.post(url, json={"result": "draw"})
+    assert res.status_code == 503 and res.headers["retry-after"] == "1"
+    assert _samples(admin_client.get("/metrics").text, "db_lock_errors_total") == {"db_lock_errors_total": 1}
+
+    # Any other operational error is still a server error
+    fail("disk I/O error")
+    with pytest.raises(OperationalError):
+        admin_client.post(url, json={"result": "draw"})
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, update
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Team
+from app.synthetic import generate_tournament
+from app.tournament_logic import calculate_standings
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _upgrade(url: str, monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config()  # no ini file, so the test's logging setup is left alone
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, "head")
+
+
+def test_upgrade_runs_on_a_database_built_by_create_all(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path}/app.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    before = {t: [c["name"] for c in inspect(engine).get_columns(t)] for t in Base.metadata.tables}
+
+    _upgrade(url, monkeypatch)
+    _upgrade(url, monkeypatch)  # already at head: nothing to do
+
+    after = {t: [c["name"] for c in inspect(engine).get_columns(t)] for t in Base.metadata.tables}
+    assert after == before
+    engine.dispose()
+
+
+def test_upgrade_rebuilds_stale_team_standings(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path}/app.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        tournament_id = generate_tournament(db, 10, 4, completion=0.6, seed=3).id
+        expected = [e.model_dump() for e in calculate_standings(db, tournament_id)]
+        # As left by the old code, which only wrote these columns on GET /standings
+        db.execute(update(Team).values(match_points=5, game_points=7, sonneborn_berger=11, wins=1, draws=0,
+                                       losses=2, matches_played=3))
+        db.commit()
+
+    _upgrade(url, monkeypatch)
+
+    with sessionmaker(bind=engine)() as db:
+        rows = {t.id: t for t in db.query(Team)}
+        for entry in expected:
+            team = rows[entry["team_id"]]
+            assert (team.match_points, team.game_points, round(team.sonneborn_berger, 2)) == \
+                (entry["match_points"], entry["game_points"], entry["sonneborn_berger"])
+            assert (team.wins, team.draws, team.losses, team.matches_played) == \
+                (entry["wins"], entry["draws"], entry["losses"], entry["matches_played"])
+    engine.dispose()
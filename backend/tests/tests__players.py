@@ -0,0 +1,71 @@
+from app.models import Game, Match, Player
+from app.tournament_logic import rebuild_player_stats
+
+from conftest import make_tournament
+
+STATS = ("games_played", "wins", "draws", "losses", "points")
+
+
+def _stats(db):
+    db.expire_all()
+    return {p.id: tuple(getattr(p, k) for k in STATS) for p in db.query(Player)}
+
+
+def _play_round(client, db, tournament_id, round_number, results):
+    for match in db.query(Match).filter(Match.tournament_id == tournament_id, Match.round_number == round_number):
+        res = client.post(f"/api/matches/{match.id}/results", json={"results": [
+            {"board_number": board, "result": result} for board, result in enumerate(results, start=1)
+        ]})
+        assert res.status_code == 200
+
+
+def test_player_stats_follow_submissions_and_corrections(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    _play_round(admin_client, db, tournament_id, 1, ["white_win", "black_win", "draw", "draw"])
+    match = db.query(Match).filter(Match.tournament_id == tournament_id).order_by(Match.id).first()
+    game = db.query(Game).filter(Game.match_id == match.id, Game.board_number == 1).one()
+    white_id, black_id = game.white_player_id, game.black_player_id
+
+    stats = _stats(db)
+    assert stats[white_id] == (1, 1, 0, 0, 1.0)
+    assert stats[black_id] == (1, 0, 0, 1, 0.0)
+
+    # A correction moves the result instead of counting the game twice
+    admin_client.post(f"/api/matches/{match.id}/board/1/result", json={"result": "draw"})
+    stats = _stats(db)
+    assert stats[white_id] == (1, 0, 1, 0, 0.5)
+    assert stats[black_id] == (1, 0, 1, 0, 0.5)
+
+    rebuild_player_stats(db, tournament_id)
+    db.commit()
+    assert _stats(db) == stats
+
+    body = admin_client.get(f"/api/players/{white_id}/statistics").json()
+    assert (body["games_played"], body["draws"], body["points"]) == (1, 1, 0.5)
+
+
+def test_player_games_are_paged_by_cursor(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    for round_number in (1, 2, 3):
+        _play_round(admin_client, db, tournament_id, round_number, ["white_win"] * 4)
+    player = db.query(Player).order_by(Player.id).first()
+
+    full = admin_client.get(f"/api/players/{player.id}/games").json()
+    assert full["player_name"] == player.name
+    games = full["games"]
+    assert len(games) == 3
+    assert [g["round_number"] for g in games] == [1, 2, 3]
+    assert all(g["score"] == (1.0 if g["color"] == "white" else 0.0) for g in games)
+    assert all(g["opponent_id"] != player.id for g in games)
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        res = admin_client.get(f"/api/players/{player.id}/games", params=params)
+        pages += res.json()["games"]
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == games
+
+    assert admin_client.get("/api/players/999999/games").status_code == 404
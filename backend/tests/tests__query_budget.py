@@ -0,0 +1,186 @@
+"""
+SQL statement budgets per endpoint.
+
+Every route of the app is called once against a seeded tournament (round 1
+played, round 2 open) and may run at most its budgeted number of statements.
+The seed is big enough that a lazy load per team, match or player blows any
+budget, so an N+1 regression fails here instead of in production. A route
+without a budget fails ``test_every_route_has_a_budget``.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pytest
+from fastapi.routing import APIRoute
+
+from app.auth_utils import create_token
+from app.main import app
+from app.models import Game, Match, Player, Round
+
+from conftest import make_tournament
+
+SEED_TEAMS = 12
+
+
+@dataclass
+class Budget:
+    method: str
+    route: str              # route template, as registered
+    queries: int            # most SQL statements the call may run
+    url: Optional[str] = None  # defaults to ``route`` filled from the seed
+    json: Optional[dict] = None
+    content: Optional[bytes] = None
+    status: int = 200
+    build: Optional[Callable] = None  # (seed ids, client, db) -> request kwargs, for what templates cannot express
+
+    @property
+    def id(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+def _round_results(ids, client, db) -> dict:
+    return {"json": {"results": [
+        {"match_id": m.id, "board_number": b, "result": "draw"}
+        for m in db.query(Match).filter(Match.round_id == ids["round_id"]) for b in range(1, 5)
+    ]}}
+
+
+def _export(ids, client, db) -> dict:
+    return {"content": client.get(f"/api/tournaments/{ids['tournament_id']}/export").content}
+
+
+BUDGETS = [
+    # tournaments
+    Budget("GET", "/api/tournaments/current", 1),
+    Budget("GET", "/api/tournaments/{tournament_id}", 1),
+    Budget("GET", "/api/tournaments/", 1),
+    Budget("POST", "/api/tournaments/", 8, json={
+        "name": "Budget", "start_date": None, "team_names": [f"T{i}" for i in range(SEED_TEAMS)],
+        "players_per_team": [4] * SEED_TEAMS,
+    }),
+    Budget("PUT", "/api/tournaments/{tournament_id}", 4, json={
+        "name": "Renamed", "description": None, "start_date": None, "end_date": None,
+    }),
+    Budget("DELETE", "/api/tournaments/{tournament_id}", 9),
+    Budget("GET", "/api/tournaments/{tournament_id}/standings", 3),
+    Budget("GET", "/api/tournaments/{tournament_id}/events", 1, url="/api/tournaments/0/events", status=404),
+    Budget("GET", "/api/tournaments/{tournament_id}/export", 8),
+    Budget("POST", "/api/tournaments/import", 12, build=_export),
+    Budget("POST", "/api/tournaments/{tournament_id}/standings/rebuild", 5),
+    Budget("POST", "/api/tournaments/{tournament_id}/ratings/rebuild", 11),
+    Budget("POST", "/api/tournaments/{tournament_id}/rounds/open", 9),
+    Budget("GET", "/api/tournaments/{tournament_id}/best-players", 3),
+    # teams
+    Budget("GET", "/api/teams/", 1, url="/api/teams/?tournament_id={tournament_id}"),
+    Budget("GET", "/api/teams/{team_id}", 1),
+    Budget("POST", "/api/teams/", 3, json={"name": "Latecomers", "tournament_id": "{tournament_id}"}),
+    Budget("PUT", "/api/teams/{team_id}", 4, json={"name": "Renamed"}),
+    # players
+    Budget("GET", "/api/players/", 1, url="/api/players/?tournament_id={tournament_id}"),
+    Budget("GET", "/api/players/{player_id}", 1),
+    Budget("POST", "/api/players/", 7, json={"name": "Substitute", "team_id": "{team_id}", "position": None}),
+    Budget("POST", "/api/players/import", 6, url="/api/players/import?tournament_id={tournament_id}",
+           content=b"team,name\n" + b"".join(b"Club %d,Player %d\n" % (i % 5, i) for i in range(100))),
+    Budget("PUT", "/api/players/{player_id}", 8, json={"name": "Renamed", "position": None}),
+    Budget("DELETE", "/api/players/{player_id}", 9),
+    Budget("GET", "/api/players/{player_id}/games", 3),
+    Budget("GET", "/api/players/{player_id}/rating-history", 2),
+    Budget("GET", "/api/players/{player_id}/statistics", 2),
+    # matches
+    Budget("GET", "/api/matches/{round_id}", 2, url="/api/matches/{round_id}?include_players=true"),
+    Budget("POST", "/api/matches/{match_id}/board/{board_number}/result", 5, json={"result": "draw"}),
+    Budget("POST", "/api/matches/{match_id}/results", 11, json={
+        "results": [{"board_number": b, "result": "white_win"} for b in range(1, 5)],
+    }),
+    Budget("POST", "/api/matches/rounds/{round_id}/results", 25, build=_round_results),
+    Budget("POST", "/api/matches/rounds/{round_number}/reschedule", 2,
+           json={"scheduled_date": "2030-01-01T10:00:00"}),
+    Budget("GET", "/api/matches/{match_id}/available-swaps", 4),
+    Budget("POST", "/api/matches/{match_id}/games/{game_id}/swap-players", 5, json={
+        "new_white_player_id": "{reserve_id}",
+    }),
+    # auth and service routes
+    Budget("POST", "/api/auth/login", 0, json={"username": "nobody", "password": "wrong"}, status=401),
+    Budget("POST", "/api/auth/verify", 0),
+    Budget("POST", "/api/auth/logout", 0, build=lambda ids, client, db: {
+        "headers": {"Authorization": f"Bearer {create_token('admin')}"},
+    }),
+    Budget("GET", "/health", 0),
+    Budget("GET", "/cache/stats", 0),
+    Budget("GET", "/events/stats", 0),
+    Budget("GET", "/metrics", 0),
+    Budget("GET", "/", 0),
+]
+
+
+def seed(db, client) -> dict:
+    """A tournament with round 1 played and round 2 open, plus a reserve player on one team."""
+    tournament_id = make_tournament(db, num_teams=SEED_TEAMS, boards=4).id
+    round_1 = db.query(Round).filter(Round.tournament_id == tournament_id, Round.round_number == 1).one()
+    res = client.post(f"/api/matches/rounds/{round_1.id}/results", json={"results": [
+        {"match_id": m.id, "board_number": b, "result": ("white_win", "draw", "black_win")[b % 3]}
+        for m in db.query(Match).filter(Match.round_id == round_1.id) for b in range(1, 5)
+    ]})
+    assert res.status_code == 200
+
+    db.expire_all()
+    round_2 = db.query(Round).filter(Round.tournament_id == tournament_id, Round.round_number == 2).one()
+    match = db.query(Match).filter(Match.round_id == round_2.id).order_by(Match.id).first()
+    game = db.query(Game).filter(Game.match_id == match.id, Game.board_number == 1).one()
+    reserve = Player(name="Reserve", team_id=match.white_team_id, position=5)
+    db.add(reserve)
+    db.commit()
+    return {
+        "tournament_id": tournament_id,
+        "round_id": round_2.id,
+        "round_number": 2,
+        "match_id": match.id,
+        "board_number": 1,
+        "game_id": game.id,
+        "team_id": match.white_team_id,
+        "player_id": game.white_player_id,
+        "reserve_id": reserve.id,
+    }
+
+
+def _fill(value, ids: dict):
+    """Substitute seed ids into URL and JSON templates; a bare "{name}" becomes the int."""
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in ids:
+            return ids[value[1:-1]]
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {k: _fill(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, ids) for v in value]
+    return value
+
+
+@pytest.mark.parametrize("budget", BUDGETS, ids=lambda b: b.id)
+def test_query_budget(db, admin_client, count_statements, budget):
+    ids = seed(db, admin_client)
+    request = {"url": _fill(budget.url or budget.route, ids)}
+    if budget.json is not None:
+        request["json"] = _fill(budget.json, ids)
+    if budget.content is not None:
+        request["content"] = budget.content
+    if budget.build:
+        request.update(budget.build(ids, admin_client, db))
+
+    response, statements = count_statements(admin_client, budget.method, **request)
+    assert response.status_code == budget.status, response.text
+    assert len(statements) <= budget.queries, (
+        f"{budget.id} ran {len(statements)} statements, budget is {budget.queries}:\n" + "\n".join(statements)
+    )
+
+
+def test_every_route_has_a_budget():
+    budgeted = {(b.method, b.route) for b in BUDGETS}
+    routes = {
+        (method, route.path)
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    assert routes - budgeted == set()
+    assert budgeted - routes == set()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app import schemas
+from app.models import Match, Player, RatingHistory
+from app.ratings import elo_update, glicko2_update, rebuild_ratings
+from app.tournament_logic import create_tournament_structure
+
+
+def test_elo_matches_reference_example():
+    # Player rated 1613 scores 2.5 from 5 games (expected 2.867); with K=32 the new rating is 1601
+    ratings = np.array([1613, 1609, 1477, 1388, 1586, 1720], dtype=float)
+    new = elo_update(ratings, np.zeros(5, dtype=int), np.arange(1, 6), np.array([0, 0.5, 1, 1, 0]), k=32)
+    assert round(new[0]) == 1601
+    # Elo is zero-sum with a shared K
+    assert new.sum() == pytest.approx(ratings.sum())
+
+
+def test_glicko2_matches_glickman_example():
+    # Glickman, "Example of the Glicko-2 system": 1500/200 beats 1400/30, loses to 1550/100 and 1700/300
+    ratings = np.array([1500, 1400, 1550, 1700], dtype=float)
+    deviations = np.array([200, 30, 100, 300], dtype=float)
+    volatilities = np.full(4, 0.06)
+    rating, deviation, volatility = glicko2_update(
+        ratings, deviations, volatilities,
+        np.zeros(3, dtype=int), np.array([1, 2, 3]), np.array([1, 0, 0], dtype=float), tau=0.5,
+    )
+    assert rating[0] == pytest.approx(1464.06, abs=0.01)
+    assert deviation[0] == pytest.approx(151.52, abs=0.01)
+    assert volatility[0] == pytest.approx(0.05999, abs=1e-5)
+
+
+def test_glicko2_idle_players_only_gain_deviation():
+    rating, deviation, volatility = glicko2_update(
+        np.array([1500.0, 1500.0, 1600.0]), np.array([50.0, 50.0, 80.0]), np.full(3, 0.06),
+        np.array([0]), np.array([1]), np.array([0.5]),
+    )
+    assert rating[2] == 1600.0 and volatility[2] == 0.06
+    assert deviation[2] == pytest.approx(np.hypot(80 / 173.7178, 0.06) * 173.7178)
+
+
+@pytest.mark.parametrize("system", ["elo", "glicko2"])
+def test_completed_round_updates_ratings_and_history(db, admin_client, system):
+    tour = create_tournament_structure(db, schemas.TournamentCreate(
+        name="Rated", start_date=None, team_names=["A", "B", "C", "D"],
+        players_per_team=[4] * 4, rating_system=system,
+    ))
+    tournament_id = tour.id
+    for match in db.query(Match).filter(Match.tournament_id == tournament_id, Match.round_number == 1):
+        admin_client.post(f"/api/matches/{match.id}/results", json={"results": [
+            {"board_number": b, "result": "white_win"} for b in range(1, 5)
+        ]})
+
+    db.expire_all()
+    history = db.query(RatingHistory).filter(RatingHistory.tournament_id == tournament_id).all()
+    assert len(history) == 16 and {h.system for h in history} == {system}
+    ratings = {p.id: p.rating for p in db.query(Player)}
+    for h in history:
+        assert ratings[h.player_id] == round(h.rating_after)
+        assert (h.rating_after > h.rating_before) == (h.score == 1.0)
+
+    res = admin_client.get(f"/api/players/{history[0].player_id}/rating-history")
+    assert [e["round_number"] for e in res.json()] == [1]
+
+    # Rebuilding re-rates the same round from the same starting ratings
+    rebuild_ratings(db, tournament_id)
+    db.commit()
+    db.expire_all()
+    assert {p.id: p.rating for p in db.query(Player)} == ratings
+    assert db.query(RatingHistory).filter(RatingHistory.tournament_id == tournament_id).count() == 16
@@ -0,0 +1,107 @@
+import threading
+
+from app.models import Game, Match, Round, Tournament
+
+from conftest import count_queries, make_tournament
+
+
+def _submit(client, match_id, board, result):
+    res = client.post(f"/api/matches/{match_id}/board/{board}/result", json={"result": result})
+    assert res.status_code == 200
+
+
+def test_round_completion_advances_current_round(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    first_round = db.query(Round).filter(Round.round_number == 1).one()
+    match_ids = [m.id for m in first_round.matches]
+
+    for match_id in match_ids:
+        for board in range(1, 5):
+            _submit(admin_client, match_id, board, "white_win")
+    # Re-submitting a board of a completed round must not count it twice
+    _submit(admin_client, match_ids[0], 1, "draw")
+
+    db.expire_all()
+    rnd = db.get(Round, first_round.id)
+    assert rnd.is_completed and rnd.completed_matches == rnd.total_matches == 2
+    assert db.get(Tournament, tournament_id).current_round == 2
+    match = db.get(Match, match_ids[0])
+    assert (match.completed_boards, match.white_score, match.black_score) == (4, 3.5, 0.5)
+    assert match.result == "white_win"
+
+
+def test_concurrent_board_posts_keep_counters_in_step(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=6).id
+    first_round = db.query(Round).filter(Round.round_number == 1).one()
+    boards = [(m.id, board) for m in first_round.matches for board in range(1, 5)]
+    start = threading.Barrier(len(boards))
+
+    def post(match_id, board):
+        start.wait()
+        _submit(admin_client, match_id, board, "draw")
+
+    threads = [threading.Thread(target=post, args=board) for board in boards]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    db.expire_all()
+    assert db.query(Game).filter(Game.is_completed == True).count() == len(boards)
+    for match in db.query(Match).filter(Match.round_id == first_round.id):
+        assert (match.completed_boards, match.white_score, match.black_score) == (4, 2.0, 2.0)
+    rnd = db.get(Round, first_round.id)
+    assert rnd.is_completed and rnd.completed_matches == 3
+    assert db.get(Tournament, tournament_id).current_round == 2
+
+
+def test_submission_cost_does_not_grow_with_round_size(db, admin_client):
+    counts = []
+    for num_teams in (4, 20):
+        make_tournament(db, num_teams=num_teams)
+        match = db.query(Match).order_by(Match.id.desc()).first()
+        for board in range(1, 4):
+            _submit(admin_client, match.id, board, "draw")
+        with count_queries() as statements:
+            _submit(admin_client, match.id, 4, "white_win")
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_round_results_batch_applies_all_boards_once(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=6).id
+    rnd = db.query(Round).filter(Round.round_number == 1).one()
+    match_ids = [m.id for m in rnd.matches]
+    payload = {"results": [
+        {"match_id": match_id, "board_number": board, "result": "black_win" if board == 1 else "draw"}
+        for match_id in match_ids for board in range(1, 5)
+    ]}
+
+    res = admin_client.post(f"/api/matches/rounds/{rnd.id}/results", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["completed_match_ids"] == sorted(match_ids)
+    assert {o["status"] for o in body["outcomes"]} == {"recorded"}
+
+    again = admin_client.post(f"/api/matches/{match_ids[0]}/results",
+                              json={"results": [{"board_number": 1, "result": "black_win"}]})
+    assert again.json()["outcomes"][0]["status"] == "unchanged"
+
+    db.expire_all()
+    assert db.get(Round, rnd.id).is_completed
+    assert db.get(Tournament, tournament_id).current_round == 2
+    standings = admin_client.get(f"/api/tournaments/{tournament_id}/standings").json()["standings"]
+    assert sorted(e["match_points"] for e in standings) == [0, 0, 0, 2, 2, 2]
+
+
+def test_batch_is_rejected_before_anything_is_written(db, admin_client):
+    make_tournament(db, num_teams=4)
+    match = db.query(Match).first()
+    duplicate = {"results": [{"board_number": 1, "result": "draw"}, {"board_number": 1, "result": "draw"}]}
+    assert admin_client.post(f"/api/matches/{match.id}/results", json=duplicate).status_code == 400
+
+    unknown = {"results": [{"board_number": 1, "result": "draw"}, {"board_number": 9, "result": "draw"}]}
+    res = admin_client.post(f"/api/matches/{match.id}/results", json=unknown)
+    assert res.status_code == 404
+    db.expire_all()
+    assert db.get(Match, match.id).completed_boards == 0
@@ -0,0 +1,88 @@
+import json
+
+from app.models import Player, Team
+
+from conftest import count_queries, make_tournament, post_interrupted, write_lock_free
+
+
+def _roster(db, tournament_id):
+    db.expire_all()
+    return {
+        (team, name): (position, rating)
+        for team, name, position, rating in (
+            db.query(Team.name, Player.name, Player.position, Player.rating)
+            .join(Player, Player.team_id == Team.id)
+            .filter(Team.tournament_id == tournament_id)
+        )
+    }
+
+
+def test_csv_import_adds_players_and_reports_bad_rows(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=2, boards=4).id
+    body = "\n".join([
+        "team,name,rating,position",
+        "Team 1,Newcomer,1700,",
+        "Knights,Alice,1850,2",
+        "Knights,Bob,,",
+        "Knights,Alice,1500,",          # duplicate within the file
+        "Team 2,Player 1 of Team 2,,",  # duplicate of an existing player
+        "Knights,Carol,strong,",
+        ",Nobody,,",
+        "Knights,Dave,,2",              # position already taken
+    ])
+    res = admin_client.post(f"/api/players/import?tournament_id={tournament_id}", content=body.encode(),
+                            headers={"Content-Type": "text/csv"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert (data["teams_created"], data["players_created"]) == (1, 3)
+    assert [e["line"] for e in data["errors"]] == [5, 6, 7, 8, 9]
+
+    roster = _roster(db, tournament_id)
+    assert roster[("Team 1", "Newcomer")] == (5, 1700)
+    assert roster[("Knights", "Alice")] == (2, 1850)
+    # Missing positions continue after the highest one taken
+    assert roster[("Knights", "Bob")] == (3, 1200)
+    assert len(roster) == 2 * 4 + 3
+
+
+def test_ndjson_import_in_one_transaction(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=2, boards=4).id
+    team_id = db.query(Team.id).filter(Team.tournament_id == tournament_id, Team.name == "Team 1").scalar()
+    lines = [{"team": f"Club {t}", "name": f"Player {t}-{p}"} for t in range(50) for p in range(40)]
+    lines.append({"team_id": team_id, "name": "Late entry", "rating": 2000})
+    body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+
+    with count_queries() as statements:
+        res = admin_client.post(f"/api/players/import?tournament_id={tournament_id}", content=body.encode())
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert (data["teams_created"], data["players_created"]) == (50, 2001)
+    assert data["errors"] == [{"line": 2002, "error": "Line is not a JSON object"}]
+    # One roster lookup and one executemany for all players, however many rows
+    assert sum(s.startswith("SELECT") for s in statements) == 3
+    assert sum(s.startswith("INSERT INTO players") for s in statements) == 1
+
+    roster = _roster(db, tournament_id)
+    assert roster[("Club 49", "Player 49-39")] == (40, 1200)
+    assert roster[("Team 1", "Late entry")] == (5, 2000)
+
+
+def test_dry_run_and_bad_files(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=2, boards=4).id
+    url = f"/api/players/import?tournament_id={tournament_id}"
+    res = admin_client.post(url + "&dry_run=true", content=b"team,name\nKnights,Alice\n")
+    assert res.json()["players_created"] == 1
+    assert db.query(Player).count() == 8
+
+    assert admin_client.post(url, content=b"club,player\nKnights,Alice\n").status_code == 400
+    assert admin_client.post("/api/players/import?tournament_id=999", content=b"team,name\n").status_code == 404
+
+
+def test_import_leaves_the_write_lock_free_while_uploading(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=2, boards=4).id
+    body = "\n".join(["team,name"] + [f"Knights,Player {i}" for i in range(200)]).encode()
+    free = []
+    res = post_interrupted(f"/api/players/import?tournament_id={tournament_id}", body,
+                           lambda: free.append(write_lock_free()))
+    assert res.status_code == 200 and res.json()["players_created"] == 200
+    assert free == [True]
@@ -0,0 +1,169 @@
+from collections import Counter
+
+from app import schemas
+from app.models import Game, Match, Player, Round, Team, Tournament
+from app.tournament_logic import (
+    berger_round,
+    open_round,
+    create_tournament_structure,
+    generate_all_round_robin_rounds,
+    iter_round_robin_rounds,
+)
+
+# FIDE C.05 Annex 1 Berger tables, by starting number
+BERGER_4 = [[(1, 4), (2, 3)], [(4, 3), (1, 2)], [(2, 4), (3, 1)]]
+BERGER_6 = [
+    [(1, 6), (2, 5), (3, 4)],
+    [(6, 4), (5, 3), (1, 2)],
+    [(2, 6), (3, 1), (4, 5)],
+    [(6, 5), (1, 4), (2, 3)],
+    [(3, 6), (4, 2), (5, 1)],
+]
+
+
+def _longest_colour_run(rounds):
+    last, run, longest = {}, Counter(), 0
+    for pairings in rounds:
+        for white, black in pairings:
+            for team, colour in ((white, "W"), (black, "B")):
+                run[team] = run[team] + 1 if last.get(team) == colour else 1
+                last[team] = colour
+                longest = max(longest, run[team])
+    return longest
+
+
+def test_matches_fide_berger_tables():
+    assert generate_all_round_robin_rounds([1, 2, 3, 4]) == BERGER_4
+    assert generate_all_round_robin_rounds([1, 2, 3, 4, 5, 6]) == BERGER_6
+    # Odd field: the last starting number is the bye
+    assert generate_all_round_robin_rounds([1, 2, 3, 4, 5]) == [
+        [p for p in r if 6 not in p] for r in BERGER_6
+    ]
+
+
+def test_single_round_robin_properties():
+    for n in range(2, 41):
+        teams = list(range(100, 100 + n))
+        rounds = list(iter_round_robin_rounds(teams))
+        assert len(rounds) == n - 1 + n % 2
+
+        met, whites, blacks = Counter(), Counter(), Counter()
+        for round_num, pairings in enumerate(rounds, start=1):
+            assert pairings == berger_round(teams, round_num)
+            playing = [t for pair in pairings for t in pair]
+            assert len(playing) == len(set(playing))
+            assert len(pairings) == n // 2
+            for white, black in pairings:
+                met[frozenset((white, black))] += 1
+                whites[white] += 1
+                blacks[black] += 1
+
+        assert len(met) == n * (n - 1) // 2
+        assert set(met.values()) == {1}
+        assert max(abs(whites[t] - blacks[t]) for t in teams) <= 1
+        assert _longest_colour_run(rounds) <= 2
+
+
+def test_double_round_robin_reverses_colours():
+    for n in range(2, 41):
+        teams = list(range(n))
+        rounds = generate_all_round_robin_rounds(teams, double=True)
+        assert len(rounds) == 2 * (n - 1 + n % 2)
+
+        games = Counter(pair for pairings in rounds for pair in pairings)
+        assert set(games.values()) == {1}
+        assert all((black, white) in games for white, black in games)
+        assert len(games) == n * (n - 1)
+        assert _longest_colour_run(rounds) <= 2
+
+
+def _create(db, num_teams, double=False):
+    return create_tournament_structure(db, schemas.TournamentCreate(
+        name="Lazy",
+        start_date=None,
+        team_names=[f"Team {i}" for i in range(num_teams)],
+        players_per_team=[4] * num_teams,
+        double_round_robin=double,
+    ))
+
+
+def _play_round(client, db, tournament_id, round_number):
+    for match in db.query(Match).filter(Match.tournament_id == tournament_id, Match.round_number == round_number):
+        res = client.post(f"/api/matches/{match.id}/results", json={"results": [
+            {"board_number": board, "result": "draw"} for board in range(1, 5)
+        ]})
+        assert res.status_code == 200
+
+
+def _opened_pairings(db, tournament_id):
+    rounds = {}
+    for match in db.query(Match).filter(Match.tournament_id == tournament_id).order_by(Match.id):
+        rounds.setdefault(match.round_number, []).append((match.white_team_id, match.black_team_id))
+    return [rounds[n] for n in sorted(rounds)]
+
+
+def test_only_first_round_is_materialized(db):
+    tour = _create(db, 5, double=True)
+    assert tour.total_rounds == 10
+    assert tour.schedule["double"] is True
+    assert db.query(Round).count() == 1
+    assert db.query(Match).count() == 2
+    assert db.query(Game).count() == 8
+
+
+def test_rounds_open_as_play_completes(db, admin_client):
+    tour = _create(db, 5)
+    tournament_id, team_ids, total = tour.id, tour.schedule["seeds"], tour.total_rounds
+
+    for round_number in range(1, total + 1):
+        assert db.query(Round).filter(Round.tournament_id == tournament_id).count() == round_number
+        _play_round(admin_client, db, tournament_id, round_number)
+        db.expire_all()
+
+    assert _opened_pairings(db, tournament_id) == generate_all_round_robin_rounds(team_ids)
+    assert db.get(Tournament, tournament_id).current_round == total + 1
+
+
+def test_opened_round_uses_current_roster(db):
+    tour = _create(db, 4)
+    team_id = tour.schedule["seeds"][0]
+    first, second = db.query(Player).filter(Player.team_id == team_id).order_by(Player.position)[:2]
+    first.position, second.position = 2, 1
+
+    round_id = open_round(db, tour)
+    db.commit()
+    game = (
+        db.query(Game).join(Match).filter(Match.round_id == round_id, Game.board_number == 1)
+        .filter((Match.white_team_id == team_id) | (Match.black_team_id == team_id)).one()
+    )
+    assert second.id in (game.white_player_id, game.black_player_id)
+
+
+def test_withdrawn_team_gets_a_bye(db):
+    tour = _create(db, 4)
+    withdrawn = tour.schedule["seeds"][3]
+    db.query(Player).filter(Player.team_id == withdrawn).delete()
+    db.query(Team).filter(Team.id == withdrawn).delete()
+
+    round_id = open_round(db, tour)
+    db.commit()
+    pairings = [(m.white_team_id, m.black_team_id) for m in db.query(Match).filter(Match.round_id == round_id)]
+    assert len(pairings) == 1
+    assert all(withdrawn not in pair for pair in pairings)
+
+
+def test_admin_can_open_rounds_early(db, admin_client):
+    tour = _create(db, 4)
+    tournament_id = tour.id
+
+    res = admin_client.post(f"/api/tournaments/{tournament_id}/rounds/open")
+    assert res.status_code == 200
+    assert res.json()["round_number"] == 2
+
+    # Completing round 1 must not open round 3 on top of the early round 2
+    _play_round(admin_client, db, tournament_id, 1)
+    db.expire_all()
+    assert db.query(Round).filter(Round.tournament_id == tournament_id).count() == 2
+
+    assert admin_client.post(f"/api/tournaments/{tournament_id}/rounds/open").status_code == 200
+    assert admin_client.post(f"/api/tournaments/{tournament_id}/rounds/open").status_code == 400
@@ -0,0 +1,65 @@
+import random
+
+from app.models import Match
+from app import tournament_logic
+
+from conftest import make_tournament
+
+RESULTS = ["white_win", "black_win", "draw"]
+
+
+def test_incremental_standings_match_full_rebuild(db, admin_client):
+    tour = make_tournament(db, num_teams=6)
+    rng = random.Random(7)
+    matches = []
+
+    # Rounds open one at a time as the previous one completes
+    for round_number in range(1, 5):
+        round_matches = db.query(Match).filter(
+            Match.tournament_id == tour.id, Match.round_number == round_number
+        ).all()
+        for match in round_matches:
+            for board in range(1, 5):
+                res = admin_client.post(f"/api/matches/{match.id}/board/{board}/result",
+                                        json={"result": rng.choice(RESULTS)})
+                assert res.status_code == 200
+        matches += round_matches
+
+    # Corrections on already completed matches
+    for match in matches[:4]:
+        admin_client.post(f"/api/matches/{match.id}/board/1/result", json={"result": "black_win"})
+        admin_client.post(f"/api/matches/{match.id}/board/2/result", json={"result": "black_win"})
+
+    incremental = admin_client.get(f"/api/tournaments/{tour.id}/standings").json()["standings"]
+    db.expire_all()
+    rebuilt = [e.model_dump() for e in tournament_logic.calculate_standings(db, tour.id)]
+    assert incremental == rebuilt
+    assert sum(e["matches_played"] for e in incremental) == 24
+
+
+def test_batched_round_results_match_full_rebuild(db, admin_client):
+    tour = make_tournament(db, num_teams=8)
+    rng = random.Random(11)
+
+    # Whole rounds in one request each, then corrections to all of round 1 at once
+    rounds = []
+    for round_number in range(1, 5):
+        round_matches = db.query(Match).filter(
+            Match.tournament_id == tour.id, Match.round_number == round_number
+        ).all()
+        rounds.append(round_matches)
+        res = admin_client.post(f"/api/matches/rounds/{round_matches[0].round_id}/results", json={"results": [
+            {"match_id": m.id, "board_number": b, "result": rng.choice(RESULTS)}
+            for m in round_matches for b in range(1, 5)
+        ]})
+        assert res.status_code == 200, res.text
+    res = admin_client.post(f"/api/matches/rounds/{rounds[0][0].round_id}/results", json={"results": [
+        {"match_id": m.id, "board_number": b, "result": "black_win"} for m in rounds[0] for b in (1, 2)
+    ]})
+    assert res.status_code == 200, res.text
+
+    incremental = admin_client.get(f"/api/tournaments/{tour.id}/standings").json()["standings"]
+    db.expire_all()
+    rebuilt = [e.model_dump() for e in tournament_logic.calculate_standings(db, tour.id)]
+    assert incremental == rebuilt
+    assert sum(e["matches_played"] for e in incremental) == 32
@@ -0,0 +1,74 @@
+import random
+
+from app import schemas
+from app.models import Round, Tournament
+from app.pairing import SwissTeam, pair_swiss_round
+from app.tournament_logic import create_tournament_structure
+
+RESULTS = [(2, 0), (0, 2), (1, 1)]
+
+
+def _play_rounds(num_teams, rounds, seed=0):
+    rng = random.Random(seed)
+    teams = {i: SwissTeam(id=i, seed=i) for i in range(num_teams)}
+    for round_number in range(1, rounds + 1):
+        pairings, bye = pair_swiss_round(list(teams.values()), round_number)
+        yield teams, pairings, bye
+        if bye is not None:
+            teams[bye].byes += 1
+        for white, black in pairings:
+            teams[white].opponents.add(black)
+            teams[black].opponents.add(white)
+            teams[white].colors.append("W")
+            teams[black].colors.append("B")
+            white_mp, black_mp = rng.choice(RESULTS)
+            teams[white].score += white_mp
+            teams[black].score += black_mp
+
+
+def test_swiss_rounds_pair_everyone_once_without_repeats():
+    for num_teams in (16, 15, 64, 201):
+        byes = set()
+        for teams, pairings, bye in _play_rounds(num_teams, rounds=7, seed=num_teams):
+            seated = [team for pair in pairings for team in pair]
+            assert len(seated) == len(set(seated)) == num_teams - num_teams % 2
+            assert all(black not in teams[white].opponents for white, black in pairings)
+            if bye is not None:
+                assert bye not in byes
+                byes.add(bye)
+        assert max(abs(t.color_diff) for t in teams.values()) <= 2
+
+
+def test_swiss_pairs_within_score_groups_first():
+    teams = [SwissTeam(id=i, seed=i, score=2.0 if i < 4 else 0.0) for i in range(8)]
+    pairings, _ = pair_swiss_round(teams, 2)
+    leaders = {0, 1, 2, 3}
+    assert all((w in leaders) == (b in leaders) for w, b in pairings)
+
+
+def test_swiss_tournament_pairs_next_round_on_completion(db, admin_client):
+    data = schemas.TournamentCreate(
+        name="Open", start_date=None, team_names=[f"T{i}" for i in range(6)],
+        players_per_team=[4] * 6, pairing_system="swiss",
+    )
+    tour = create_tournament_structure(db, data)
+    tournament_id = tour.id
+    assert tour.total_rounds == 3
+    assert db.query(Round).count() == 1
+
+    # Swiss rounds cannot be paired before the standings are in
+    assert admin_client.post(f"/api/tournaments/{tournament_id}/rounds/open").status_code == 400
+
+    first = db.query(Round).one()
+    payload = {"results": [
+        {"match_id": m.id, "board_number": b, "result": "white_win"}
+        for m in first.matches for b in range(1, 5)
+    ]}
+    assert admin_client.post(f"/api/matches/rounds/{first.id}/results", json=payload).status_code == 200
+
+    db.expire_all()
+    second = db.query(Round).filter(Round.round_number == 2).one()
+    assert len(second.matches) == 3
+    met_before = {frozenset((m.white_team_id, m.black_team_id)) for m in first.matches}
+    assert all(frozenset((m.white_team_id, m.black_team_id)) not in met_before for m in second.matches)
+    assert db.get(Tournament, tournament_id).current_round == 2
@@ -0,0 +1,31 @@
+import pytest
+
+from app import tournament_logic
+from app.models import Game, Match, Player
+from app.synthetic import generate_tournament
+
+
+def test_generated_tournament_is_consistent(db):
+    tour = generate_tournament(db, 9, boards=4, completion=0.5, seed=5)
+    # Half of 9 rounds of 4 matches, rounded
+    assert db.query(Match).filter(Match.tournament_id == tour.id, Match.is_completed == True).count() == 18
+    assert db.query(Game).filter(Game.is_completed == True).count() == 72
+    assert {rating for (rating,) in db.query(Player.rating)} != {1200}
+
+    standings = [e.model_dump() for e in tournament_logic.get_standings(db, tour.id)]
+    db.expire_all()
+    assert standings == [e.model_dump() for e in tournament_logic.calculate_standings(db, tour.id)]
+
+
+def test_same_seed_same_results(db):
+    def results(seed):
+        tour = generate_tournament(db, 6, completion=1.0, seed=seed, pairing_system="swiss")
+        return [
+            g.result for g in
+            db.query(Game).join(Match, Match.id == Game.match_id)
+            .filter(Match.tournament_id == tour.id).order_by(Match.round_number, Match.id, Game.board_number)
+        ]
+
+    assert results(3) == results(3)
+    with pytest.raises(ValueError):
+        generate_tournament(db, 6, completion=1.5)
@@ -0,0 +1,86 @@
+import random
+
+from app import schemas
+from app.models import Match, Team
+from app.tiebreaks import Results
+from app.tournament_logic import calculate_standings, create_tournament_structure
+
+from conftest import make_tournament
+
+RESULTS = ["white_win", "black_win", "draw"]
+
+# (white, black, result, white board points, black board points)
+ROWS = [
+    (1, 2, "white_win", 3, 1),
+    (3, 1, "white_win", 2.5, 1.5),
+    (2, 3, "draw", 2, 2),
+    (4, 1, "black_win", 1, 3),
+    (4, 2, "draw", 2, 2),
+    (3, 4, "white_win", 4, 0),
+]
+
+
+def test_tiebreaks_on_a_hand_computed_table():
+    results = Results.from_rows([1, 2, 3, 4], ROWS)
+    mp = results.match_points
+    assert mp.tolist() == [4, 2, 5, 1]
+
+    expected = {
+        "board_points": [7.5, 5, 8.5, 3],
+        "sonneborn_berger": [3, 3, 6, 1],
+        "buchholz": [8, 10, 7, 11],
+        "buchholz_cut1": [7, 9, 6, 9],
+        "wins": [2, 0, 2, 0],
+        "koya": [0, 1, 2, 0],
+    }
+    for name, values in expected.items():
+        assert results.tiebreak(name, mp).tolist() == values, name
+
+    order, _, _ = results.rank()
+    assert order.tolist() == [2, 0, 1, 3]
+
+
+def test_direct_encounter_only_counts_games_between_tied_teams():
+    results = Results.from_rows([1, 2, 3, 4], [
+        (1, 2, "white_win", 3, 1),
+        (3, 4, "white_win", 3, 1),
+        (2, 3, "white_win", 3, 1),
+    ])
+    order, mp, values = results.rank(["direct_encounter"])
+    assert mp.tolist() == [2, 2, 2, 0]
+    assert values["direct_encounter"].tolist() == [2, 2, 0, 0]
+    assert order.tolist() == [0, 1, 2, 3]
+
+
+def test_engine_matches_maintained_sonneborn_berger(db, admin_client):
+    tour = make_tournament(db, num_teams=7)
+    tournament_id, total_rounds = tour.id, tour.total_rounds
+    rng = random.Random(3)
+    for round_number in range(1, total_rounds + 1):
+        for match in db.query(Match).filter(Match.tournament_id == tournament_id, Match.round_number == round_number):
+            admin_client.post(f"/api/matches/{match.id}/results", json={"results": [
+                {"board_number": board, "result": rng.choice(RESULTS)} for board in range(1, 5)
+            ]})
+        db.expire_all()
+
+    standings = admin_client.get(f"/api/tournaments/{tournament_id}/standings").json()["standings"]
+    assert all(e["tiebreaks"]["sonneborn_berger"] == e["sonneborn_berger"] for e in standings)
+
+    db.expire_all()
+    maintained = {t.id: t.sonneborn_berger for t in db.query(Team)}
+    rebuilt = calculate_standings(db, tournament_id)
+    assert {e.team_id: e.sonneborn_berger for e in rebuilt} == {k: round(v, 2) for k, v in maintained.items()}
+    # The default tiebreaks are served from the maintained columns, ranked as the engine ranks them
+    assert [(e["team_id"], e["tiebreaks"]) for e in standings] == [(e.team_id, e.tiebreaks) for e in rebuilt]
+
+
+def test_configured_tiebreaks_order_the_standings(db, admin_client):
+    tour = create_tournament_structure(db, schemas.TournamentCreate(
+        name="Tiebreaks", start_date=None, team_names=["A", "B", "C", "D"],
+        players_per_team=[2] * 4, tiebreaks=["wins", "buchholz"],
+    ))
+    tournament_id = tour.id
+    assert admin_client.get(f"/api/tournaments/{tournament_id}").json()["tiebreaks"] == ["wins", "buchholz"]
+
+    standings = admin_client.get(f"/api/tournaments/{tournament_id}/standings").json()["standings"]
+    assert [list(e["tiebreaks"]) for e in standings] == [["wins", "buchholz"]] * 4
@@ -0,0 +1,114 @@
+import gzip
+import json
+
+import pytest
+
+from app import transfer
+from app.models import Game, Match, Player, RatingHistory, Round, Team, Tournament
+from app.tournament_logic import open_round
+from conftest import make_tournament, post_interrupted, write_lock_free
+
+
+def _play_round(client, db, tournament_id, round_number):
+    for match in db.query(Match).filter(Match.tournament_id == tournament_id, Match.round_number == round_number):
+        client.post(f"/api/matches/{match.id}/results", json={"results": [
+            {"board_number": b, "result": ("white_win", "draw", "black_win")[b % 3]} for b in range(1, 5)
+        ]})
+    db.expire_all()
+
+
+def _counts(db, tournament_id):
+    team_ids = [t for t, in db.query(Team.id).filter(Team.tournament_id == tournament_id)]
+    match_ids = [m for m, in db.query(Match.id).filter(Match.tournament_id == tournament_id)]
+    return {
+        "teams": len(team_ids),
+        "players": db.query(Player).filter(Player.team_id.in_(team_ids)).count(),
+        "rounds": db.query(Round).filter(Round.tournament_id == tournament_id).count(),
+        "matches": len(match_ids),
+        "games": db.query(Game).filter(Game.match_id.in_(match_ids)).count(),
+        "rating_history": db.query(RatingHistory).filter(RatingHistory.tournament_id == tournament_id).count(),
+    }
+
+
+@pytest.mark.parametrize("fmt,compress", [("ndjson", False), ("columnar", True)])
+def test_export_import_round_trip(db, admin_client, fmt, compress):
+    tournament_id = make_tournament(db, num_teams=6).id
+    _play_round(admin_client, db, tournament_id, 1)
+
+    response = admin_client.get(f"/api/tournaments/{tournament_id}/export",
+                                params={"format": fmt, "gzip": compress})
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    body = response.content
+    lines = [json.loads(line) for line in (gzip.decompress(body) if compress else body).splitlines()]
+    assert lines[0]["table"] == "tournament" and lines[0]["format_version"] == 1
+
+    imported = admin_client.post("/api/tournaments/import", content=body)
+    assert imported.status_code == 200, imported.text
+    new_id = imported.json()["id"]
+    assert new_id != tournament_id
+
+    db.expire_all()
+    assert _counts(db, new_id) == _counts(db, tournament_id)
+    original = admin_client.get(f"/api/tournaments/{tournament_id}/standings").json()["standings"]
+    copy = admin_client.get(f"/api/tournaments/{new_id}/standings").json()["standings"]
+    assert [(s["team_name"], s["match_points"], s["game_points"]) for s in copy] == \
+        [(s["team_name"], s["match_points"], s["game_points"]) for s in original]
+
+    # Ids in the copy point at the copy's own rows
+    new_teams = {t.id for t in db.query(Team).filter(Team.tournament_id == new_id)}
+    copy_tour = db.get(Tournament, new_id)
+    assert set(copy_tour.schedule["seeds"]) == new_teams
+    for team in db.query(Team).filter(Team.tournament_id == new_id):
+        assert team.captain_id is None or db.get(Player, team.captain_id).team_id == team.id
+    for match in db.query(Match).filter(Match.tournament_id == new_id):
+        assert {match.white_team_id, match.black_team_id} <= new_teams
+
+
+def test_imported_tournament_keeps_running(db, admin_client):
+    tournament_id = make_tournament(db, num_teams=4).id
+    body = admin_client.get(f"/api/tournaments/{tournament_id}/export").content
+    new_id = admin_client.post("/api/tournaments/import", content=body).json()["id"]
+
+    _play_round(admin_client, db, new_id, 1)
+    assert db.query(Round).filter(Round.tournament_id == new_id).count() == 2
+    assert db.query(RatingHistory).filter(RatingHistory.tournament_id == new_id).count() == 16
+
+
+def test_import_leaves_the_write_lock_free_while_uploading(db, admin_client, monkeypatch):
+    monkeypatch.setattr(transfer, "BATCH_SIZE", 10)  # so the first half of the upload fills batches
+    tournament_id = make_tournament(db, num_teams=4).id
+    body = admin_client.get(f"/api/tournaments/{tournament_id}/export").content
+    free = []
+    res = post_interrupted("/api/tournaments/import", body, lambda: free.append(write_lock_free()))
+    assert res.status_code == 200
+    assert free == [True]
+
+
+def test_export_covers_every_opened_round(db, admin_client):
+    tour = make_tournament(db, num_teams=6)
+    tournament_id = tour.id
+    while open_round(db, tour) is not None:
+        pass
+    db.commit()
+
+    lines = admin_client.get(f"/api/tournaments/{tournament_id}/export").text.splitlines()
+    tables = [json.loads(line)["table"] for line in lines]
+    assert tables.count("rounds") == 5 and tables.count("games") == 5 * 3 * 4
+
+
+def test_import_rejects_bad_streams(db, admin_client):
+    assert admin_client.post("/api/tournaments/import", content=b"not json\n").status_code == 400
+    assert admin_client.post("/api/tournaments/import", content=b'{"table": "teams", "id": 1}\n').status_code == 400
+    assert admin_client.post("/api/tournaments/import", content=b"\x1f\x8bgarbage").status_code == 400
+    header = {"table": "tournament", "format_version": 99, "id": 1, "name": "Old"}
+    assert admin_client.post("/api/tournaments/import", content=json.dumps(header).encode()).status_code == 400
+    header = {**header, "format_version": transfer.FORMAT_VERSION, "created_at": "not-a-date"}
+    res = admin_client.post("/api/tournaments/import", content=json.dumps(header).encode())
+    assert res.status_code == 400 and res.json()["detail"] == "tournaments.created_at: bad datetime 'not-a-date'"
+    # Nothing half-imported is left behind
+    assert db.query(Tournament).count() == 0
+
+
+def test_export_unknown_tournament(db, admin_client):
+    assert admin_client.get("/api/tournaments/999/export").status_code == 404
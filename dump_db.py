@@ -2,10 +2,22 @@
 #!/usr/bin/env python3
 """
 Dump SQLite DB tables for debugging.
+
+Rows are streamed in fetchmany batches and written out as they are read, so
+even a multi-GB database dumps in bounded memory.
+
+    python dump_db.py                                  # every table, one dict per row
+    python dump_db.py --tables matches games --tournament 3 --format csv -o t3.csv
+    python dump_db.py --format ndjson --limit 100      # first 100 rows of each table
+    python dump_db.py --stats                          # row counts and page usage
 """
 
+import argparse
+import csv
+import json
 import os
 import sqlite3
+import sys
 from pathlib import Path
 from pprint import pprint
 from dotenv import load_dotenv
@@ -13,41 +25,204 @@ from dotenv import load_dotenv
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./chess_tournament.db")
 
-if DATABASE_URL.startswith("sqlite:///") or DATABASE_URL.startswith("sqlite+aiosqlite:///"):
-    db_path = DATABASE_URL.replace("sqlite+aiosqlite:///", "").replace("sqlite:///", "")
-else:
-    raise ValueError("Only sqlite URLs are supported.")
+FORMATS = ("pretty", "csv", "ndjson", "json")
 
-if not Path(db_path).exists():
-    print(f"✖ DB not found at {db_path}")
-    exit(1)
-
-def dump_table(cursor, table_name: str):
-    print(f"\n=== {table_name.upper()} ===")
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    cols = [row[1] for row in cursor.fetchall()]
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
-    if not rows:
-        print("(no rows)")
-    else:
-        for row in rows:
-            record = dict(zip(cols, row))
-            pprint(record)
+# How rows of a table belong to a tournament, for --tournament
+TOURNAMENT_FILTERS = {
+    "tournaments": "id = :tid",
+    "players": "team_id IN (SELECT id FROM teams WHERE tournament_id = :tid)",
+    "games": "match_id IN (SELECT id FROM matches WHERE tournament_id = :tid)",
+}
 
-def main():
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute("""
+def database_path(url: str) -> str:
+    if url.startswith("sqlite:///") or url.startswith("sqlite+aiosqlite:///"):
+        return url.replace("sqlite+aiosqlite:///", "").replace("sqlite:///", "")
+    raise ValueError("Only sqlite URLs are supported.")
+
+def list_tables(cursor) -> list:
+    cursor.execute("""
       SELECT name FROM sqlite_master
        WHERE type='table' AND name NOT LIKE 'sqlite_%'
        ORDER BY name
     """)
-    tables = [r[0] for r in cur.fetchall()]
-    print(f"Dumping {len(tables)} tables from {db_path!r}: {tables}")
+    return [r[0] for r in cursor.fetchall()]
+
+def table_columns(cursor, table_name: str) -> list:
+    cursor.execute(f'PRAGMA table_info("{table_name}")')
+    return [row[1] for row in cursor.fetchall()]
+
+def has_rowid(cursor, table_name: str) -> bool:
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name = ?", (table_name,))
+    row = cursor.fetchone()
+    return not (row and row[0] and "WITHOUT ROWID" in row[0].upper())
+
+def tournament_filter(table_name: str, cols: list):
+    """WHERE clause restricting a table to one tournament, or None if it has no tournament."""
+    if table_name in TOURNAMENT_FILTERS:
+        return TOURNAMENT_FILTERS[table_name]
+    if "tournament_id" in cols:
+        return "tournament_id = :tid"
+    return None
+
+def iter_rows(cursor, table_name: str, where, params: dict, limit, batch_size: int):
+    """Yield the rows of a table batch by batch, in rowid order (key order for WITHOUT ROWID tables)."""
+    sql = f'SELECT * FROM "{table_name}"'
+    if where:
+        sql += f" WHERE {where}"
+    if has_rowid(cursor, table_name):
+        sql += " ORDER BY rowid"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params = {**params, "limit": limit}
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+def _json_value(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+class Writer:
+    """Writes tables in one output format, one batch of rows at a time."""
+
+    def __init__(self, out, fmt: str):
+        self.out = out
+        self.fmt = fmt
+        self.tables = 0
+
+    def begin(self, table_name: str, cols: list):
+        self.cols = cols
+        if self.fmt == "pretty":
+            print(f"\n=== {table_name.upper()} ===", file=self.out)
+        elif self.fmt == "csv":
+            if self.tables:
+                self.out.write("\n")
+            self.out.write(f"# {table_name}\n")
+            self.csv = csv.writer(self.out)
+            self.csv.writerow(cols)
+        elif self.fmt == "json":
+            self.out.write(("{" if not self.tables else ",") + f"\n{json.dumps(table_name)}: [")
+        self.table_name = table_name
+        self.rows = 0
+        self.tables += 1
+
+    def write(self, rows: list):
+        if self.fmt == "pretty":
+            for row in rows:
+                pprint(dict(zip(self.cols, row)), stream=self.out)
+        elif self.fmt == "csv":
+            self.csv.writerows(rows)
+        elif self.fmt == "ndjson":
+            for row in rows:
+                record = {"table": self.table_name, **dict(zip(self.cols, row))}
+                self.out.write(json.dumps(record, default=_json_value) + "\n")
+        else:
+            for i, row in enumerate(rows):
+                sep = ",\n" if self.rows + i else "\n"
+                self.out.write(sep + json.dumps(dict(zip(self.cols, row)), default=_json_value))
+        self.rows += len(rows)
+
+    def end(self):
+        if self.fmt == "pretty" and not self.rows:
+            print("(no rows)", file=self.out)
+        elif self.fmt == "json":
+            self.out.write("\n]")
+
+    def close(self):
+        if self.fmt == "json":
+            self.out.write("\n}\n" if self.tables else "{}\n")
+
+def print_stats(cursor, tables: list):
+    """Row count, pages and bytes on disk per table, its indexes included."""
+    cursor.execute("PRAGMA page_size")
+    page_size = cursor.fetchone()[0]
+    usage = {}
+    try:
+        # dbstat is optional in SQLite builds; without it only row counts are shown
+        cursor.execute("""
+          SELECT coalesce(i.tbl_name, s.name), count(*), sum(s.pgsize)
+            FROM dbstat s LEFT JOIN sqlite_master i ON i.name = s.name
+           GROUP BY 1
+        """)
+        usage = {name: (pages, size) for name, pages, size in cursor.fetchall()}
+    except sqlite3.OperationalError:
+        pass
+
+    print(f"{'table':<24} {'rows':>12} {'pages':>10} {'MB':>10}")
     for tbl in tables:
-        dump_table(cur, tbl)
-    conn.close()
+        cursor.execute(f'SELECT count(*) FROM "{tbl}"')
+        rows = cursor.fetchone()[0]
+        pages, size = usage.get(tbl, (None, None))
+        mb = f"{size / 2 ** 20:.2f}" if size is not None else "-"
+        print(f"{tbl:<24} {rows:>12} {pages if pages is not None else '-':>10} {mb:>10}")
+    cursor.execute("PRAGMA page_count")
+    page_count = cursor.fetchone()[0]
+    cursor.execute("PRAGMA freelist_count")
+    free = cursor.fetchone()[0]
+    print(f"\n{page_count} pages of {page_size} bytes ({page_count * page_size / 2 ** 20:.2f} MB), {free} free")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="SQLite file (default: from DATABASE_URL)")
+    parser.add_argument("--tables", nargs="+", metavar="TABLE", help="tables to dump (default: all)")
+    parser.add_argument("--tournament", type=int, metavar="ID",
+                        help="only rows of this tournament; tables unrelated to tournaments are skipped")
+    parser.add_argument("--format", choices=FORMATS, default="pretty")
+    parser.add_argument("--limit", type=int, help="at most this many rows per table")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--stats", action="store_true", help="print row counts and page usage instead of rows")
+    args = parser.parse_args()
+
+    db_path = args.db or database_path(DATABASE_URL)
+    if not Path(db_path).exists():
+        print(f"✖ DB not found at {db_path}", file=sys.stderr)
+        sys.exit(1)
+
+    # Read-only, so a dump never takes the write lock of a running server
+    conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+    cur = conn.cursor()
+    tables = list_tables(cur)
+    if args.tables:
+        unknown = sorted(set(args.tables) - set(tables))
+        if unknown:
+            parser.error(f"unknown tables: {', '.join(unknown)} (have: {', '.join(tables)})")
+        tables = [t for t in tables if t in args.tables]
+
+    if args.stats:
+        print_stats(cur, tables)
+        conn.close()
+        return
+
+    out = open(args.output, "w", newline="" if args.format == "csv" else None) if args.output else sys.stdout
+    writer = Writer(out, args.format)
+    if args.format == "pretty":
+        print(f"Dumping {len(tables)} tables from {db_path!r}: {tables}", file=out)
+    try:
+        for tbl in tables:
+            cols = table_columns(cur, tbl)
+            where = None
+            if args.tournament is not None:
+                where = tournament_filter(tbl, cols)
+                if where is None:
+                    print(f"Skipping {tbl}: not tied to a tournament", file=sys.stderr)
+                    continue
+            writer.begin(tbl, cols)
+            for rows in iter_rows(cur, tbl, where, {"tid": args.tournament}, args.limit, args.batch_size):
+                writer.write(rows)
+            writer.end()
+        writer.close()
+    except BrokenPipeError:
+        # Output piped into head/less that exited early
+        sys.stdout = None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        conn.close()
 
 if __name__ == "__main__":
     main()
@@ -21,10 +21,11 @@ const MatchResult: React.FC<MatchResultProps> = ({ match, onClose ,players }) =>
 
   const submitResults = async () => {
   try {
-    for (const r of results) {
-      if (r.result !== "pending") {
-        await apiService.submitBoardResult(match.id, r.board, { result: r.result });
-      }
+    const entered = results
+      .filter((r) => r.result !== "pending")
+      .map((r) => ({ board_number: r.board, result: r.result }));
+    if (entered.length > 0) {
+      await apiService.submitMatchResults(match.id, entered);
     }
     onClose();
   } catch (err) {
@@ -7,7 +7,22 @@ const Standings: React.FC = () => {
   const [standings, setStandings] = useState<StandingsEntry[]>([]);
 
   useEffect(() => {
-    apiService.getStandings().then(data => setStandings(data.standings));
+    const load = () => apiService.getStandings().then(data => setStandings(data.standings));
+    load();
+
+    // Reload whenever a result changes the table
+    let source: EventSource | null = null;
+    let closed = false;
+    apiService.getCurrentTournament().then(tournament => {
+      if (closed) return;
+      source = apiService.subscribeToTournament(tournament.id, type => {
+        if (type === 'standings' || type === 'reset') load();
+      });
+    });
+    return () => {
+      closed = true;
+      source?.close();
+    };
   }, []);
 
   return (
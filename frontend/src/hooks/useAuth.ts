@@ -44,6 +44,11 @@ export function useAuth() {
   };
 
   const logout = () => {
+    // Revoke the token server-side; the local logout does not wait for it
+    const token = localStorage.getItem('token');
+    if (token) {
+      apiService.logout(token).catch(() => undefined);
+    }
     localStorage.removeItem('token');
     setUser(null);
     setAdminMode(false);
@@ -2,7 +2,8 @@
 import axios, { AxiosInstance } from 'axios';
 import {
   Tournament, Team, Player, MatchResponse, StandingsResponse, BestPlayersResponse,
-  LoginRequest, AuthResponse , PlayerCreate, PlayerUpdate , SwapPlayersRequest, AvailableSwapsResponse
+  LoginRequest, AuthResponse , PlayerCreate, PlayerUpdate , SwapPlayersRequest, AvailableSwapsResponse,
+  BoardResultUpdate, BatchResultsResponse
 } from '@/types';
 
 class ApiService {
@@ -28,6 +29,9 @@ class ApiService {
     const res = await this.client.post('/auth/login', data);
     return res.data;
   }
+  async logout(token: string): Promise<void> {
+    await this.client.post('/auth/logout', null, { headers: { Authorization: `Bearer ${token}` } });
+  }
 
   // -- Tournaments --
   async getCurrentTournament(): Promise<Tournament> {
@@ -97,6 +101,14 @@ async submitBoardResult(
   await this.client.post(`/matches/${matchId}/board/${boardNumber}/result`, resultPayload);
 }
 
+async submitMatchResults(
+  matchId: number,
+  results: BoardResultUpdate[]
+): Promise<BatchResultsResponse> {
+  const res = await this.client.post(`/matches/${matchId}/results`, { results });
+  return res.data;
+}
+
   // -- Standings & Best Players --
   async getStandings(): Promise<StandingsResponse> {
     const tournament = await this.getCurrentTournament();
@@ -104,6 +116,17 @@ async submitBoardResult(
 
     return res.data;
   }
+  // Live updates: 'board', 'match', 'round', 'standings', 'swap' and 'reset' events
+  subscribeToTournament(
+    tournamentId: number,
+    onEvent: (type: string, data: any) => void
+  ): EventSource {
+    const source = new EventSource(`${this.client.defaults.baseURL}/tournaments/${tournamentId}/events`);
+    for (const type of ['board', 'match', 'round', 'standings', 'swap', 'reset']) {
+      source.addEventListener(type, e => onEvent(type, JSON.parse((e as MessageEvent).data)));
+    }
+    return source;
+  }
   async getBestPlayers(): Promise<BestPlayersResponse> {
     const tournament = await this.getCurrentTournament();
     const res = await this.client.get(`/tournaments/${tournament.id}/best-players`);
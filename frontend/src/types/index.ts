@@ -94,6 +94,24 @@ export interface MatchResponse {
   games: GameResponse[];
 }
 
+export interface BoardResultUpdate {
+  board_number: number;
+  result: string;
+}
+
+export interface BoardResultOutcome {
+  match_id: number;
+  board_number: number;
+  game_id: number;
+  result: string;
+  status: 'recorded' | 'updated' | 'unchanged';
+}
+
+export interface BatchResultsResponse {
+  outcomes: BoardResultOutcome[];
+  completed_match_ids: number[];
+}
+
 export interface StandingsEntry {
   team_id: number;
   team_name: string; 
@@ -104,6 +122,7 @@ export interface StandingsEntry {
   match_points: number;
   game_points: number;
   sonneborn_berger: number;
+  tiebreaks?: Record<string, number>;
 }
 
 export interface StandingsResponse {